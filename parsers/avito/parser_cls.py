@@ -16,6 +16,7 @@ from db_service import SQLiteDBHandler
 from locator import LocatorAvito
 from xlsx_service import XLSXHandler
 from dotenv import load_dotenv
+from cianparser.contacts import extract_phones
 
 load_dotenv()
 
@@ -241,12 +242,14 @@ class AvitoParse:
         name = data.get("name", "-")
         id_ = data.get("id", "-")
         seller_name = data.get("seller_name")
+        phones = data.get("phones")
         full_url = data.get("url")
         short_url = f"https://avito.ru/{id_}"
         # Формируем сообщение для тг
         message = (
                 f"*{price}*\n[{name}]({full_url})\n{short_url}\n"
                 + (f"Продавец: {seller_name}\n" if seller_name else "")
+                + (f"Телефон: {phones}\n" if phones else "")
         )
         try:
             logger.success(message)
@@ -297,6 +300,14 @@ class AvitoParse:
             seller_name = self.driver.find_element(LocatorAvito.SELLER_NAME[1], by="css selector").text
             data["seller_name"] = seller_name
 
+        """Телефоны из описания (продавцы пишут их через пробелы, буквы и эмодзи)"""
+        description = data.get("description", "")
+        if self.driver.find_elements(LocatorAvito.DESCRIPTIONS_FULL_PAGE[1], by="css selector"):
+            description = self.driver.find_element(LocatorAvito.DESCRIPTIONS_FULL_PAGE[1], by="css selector").text
+        phones = extract_phones(f"{data.get('name', '')}\n{description}")
+        if phones:
+            data["phones"] = ", ".join(phones)
+
         return data
 
     def is_viewed(self, ads_id: int, price: int) -> bool:
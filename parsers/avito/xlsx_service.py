@@ -7,6 +7,18 @@ class XLSXHandler:
     """Сохраняет информацию в xlsx"""
     _instance = None
     _lock = Lock()
+    HEADER = [
+        "Название",
+        "Цена",
+        "URL",
+        "Описание",
+        "Просмотров",
+        "Дата публикации",
+        "Продавец",
+        "Адрес",
+        "Ссылка на продавца",
+        "Телефоны",
+    ]
 
     def __new__(cls, file_name):
         with cls._lock:
@@ -20,24 +32,26 @@ class XLSXHandler:
         os.makedirs("result", exist_ok=True)
         if not os.path.exists(self.file_name):
             self._create_file()
+        else:
+            self._update_header()
 
     def _create_file(self):
         workbook = Workbook()
         sheet = workbook.active
         sheet.title = "Data"
-        sheet.append([
-            "Название",
-            "Цена",
-            "URL",
-            "Описание",
-            "Просмотров",
-            "Дата публикации",
-            "Продавец",
-            "Адрес",
-            "Ссылка на продавца",
-        ])
+        sheet.append(self.HEADER)
         workbook.save(self.file_name)
 
+    def _update_header(self):
+        """Дописывает колонки, которых нет в заголовке файла, созданного прошлой версией (например, "Телефоны")"""
+        workbook = load_workbook(self.file_name)
+        sheet = workbook.active
+        header = [cell.value for cell in sheet[1]] if sheet.max_row >= 1 else []
+        if header == self.HEADER[:len(header)] and len(header) < len(self.HEADER):
+            for column, title in enumerate(self.HEADER[len(header):], start=len(header) + 1):
+                sheet.cell(row=1, column=column, value=title)
+            workbook.save(self.file_name)
+
     def append_data(self, data):
         workbook = load_workbook(self.file_name)
         sheet = workbook.active
@@ -51,6 +65,7 @@ class XLSXHandler:
             data.get("seller_name", 'no'),
             data.get("geo", '-'),
             data.get("seller_link", '-'),
+            data.get("phones", '-'),
         ]
         sheet.append(row)
         workbook.save(self.file_name)
@@ -0,0 +1,82 @@
+"""
+Throughput of extraction of phones (cianparser/contacts.py) on pages of offers of the corpus and on descriptions
+in the way of avito sellers (spaces, dashes, letters and emoji instead of digits)
+
+    python benchmarks/contacts_extraction.py [--corpus benchmarks/corpus] [--repeat 5]
+
+Reports MB/s and pages/s of define_phone on *_page of the corpus next to the former search of "+7" with slice of 16 chars,
+and descriptions/s of extract_phones on synthetic descriptions.
+"""
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from cianparser.contacts import define_phone, extract_phones
+
+from corpus_pages import DEFAULT_CORPUS_PATH, load_corpus
+
+OBFUSCATIONS = [
+    lambda digits: f"8 ({digits[1:4]}) {digits[4:7]}-{digits[7:9]}-{digits[9:]}",
+    lambda digits: "+7 " + " ".join(digits[1:]),
+    lambda digits: digits.replace("0", "О"),
+    lambda digits: "".join(f"{digit}️⃣" for digit in digits),
+    lambda digits: "".join("➀➁➂➃➄➅➆➇➈"[int(digit) - 1] if digit != "0" else "⓪" for digit in digits),
+]
+
+
+def define_phone_by_slice(html):
+    """
+    Former extraction of page parsers, kept for comparison
+    """
+
+    if "+7" not in html:
+        return ""
+    return html[html.find("+7"): html.find("+7") + 16].split('"')[0].replace(" ", "").replace("-", "")
+
+
+def build_descriptions(count_of_descriptions=1000, seed=1):
+    randomizer = random.Random(seed)
+    descriptions = []
+    for index in range(count_of_descriptions):
+        digits = "89" + "".join(str(randomizer.randint(0, 9)) for _ in range(9))
+        phone = OBFUSCATIONS[index % len(OBFUSCATIONS)](digits)
+        descriptions.append(f"Продам в отличном состоянии, торг уместен. Звонить {phone}, Иван. Цена 15 000 ₽, 2 года." * 3)
+    return descriptions
+
+
+def measure(run, texts, repeat):
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            run(text)
+    return time.perf_counter() - started_at
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--corpus", type=pathlib.Path, default=DEFAULT_CORPUS_PATH)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    corpus, corpus_hash = load_corpus(args.corpus)
+    pages = [html for kind in ["flat_page", "suburban_page"] for html in corpus[kind].values()]
+    size_of_pages = sum(len(html.encode("utf-8")) for html in pages) * args.repeat / 1024 / 1024
+
+    print(f"corpus {corpus_hash[:12]}, {len(pages)} pages")
+    for name, run in [("define_phone", define_phone), ("former slice of +7", define_phone_by_slice)]:
+        elapsed = measure(run, pages, args.repeat)
+        print(f"{name:>30}: {size_of_pages / elapsed:10.1f} MB/s {len(pages) * args.repeat / elapsed:10.1f} pages/s")
+
+    descriptions = build_descriptions()
+    count_of_found = sum(len(extract_phones(description)) == 1 for description in descriptions)
+    elapsed = measure(extract_phones, descriptions, args.repeat)
+    print(f"{'extract_phones':>30}: {len(descriptions) * args.repeat / elapsed:10.1f} descriptions/s, "
+          f"phone is found in {count_of_found} of {len(descriptions)}")
+
+
+if __name__ == "__main__":
+    main()
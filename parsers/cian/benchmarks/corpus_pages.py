@@ -0,0 +1,112 @@
+"""
+Corpus of saved Cian pages for offline benchmarks
+
+    benchmarks/corpus/<kind>/<name>.html, kind is one of KINDS
+
+The corpus is recorded by benchmarks/record_corpus.py. Kinds without saved pages are filled with synthetic ones,
+so the benchmarks always run, but only numbers on the same corpus (see "corpus" in results) are comparable.
+The corpus is not committed to the repository (pages belong to the site), so until it is recorded locally
+all numbers are measured on synthetic pages.
+"""
+import hashlib
+import pathlib
+
+from html_backend import build_synthetic_page
+
+KINDS = ["flat_list", "suburban_list", "newobject_list", "flat_page", "suburban_page", "newobject_page"]
+DEFAULT_CORPUS_PATH = pathlib.Path(__file__).resolve().parent / "corpus"
+
+FILLER = "Просторная светлая квартира с ремонтом, рядом школа и парк. " * 20
+
+SUBURBAN_CARD_HTML = """
+<article data-name="CardComponent">
+  <div><span>Собственник</span><span>Собственник {index}</span></div>
+  <div data-name="LinkArea">
+    <a href="https://krasnodar.cian.ru/sale/suburban/{offer_id}/">Дом, 120 м²</a>
+    <div data-name="GeneralInfoSectionRowComponent">Дом, 120 м², участок 6 сот.</div>
+    <div data-name="GeneralInfoSectionRowComponent">
+      <a data-name="GeoLabel">Краснодарский край</a><a data-name="GeoLabel">р-н Прикубанский</a>
+      <a data-name="GeoLabel">улица Садовая</a><a data-name="GeoLabel">{index}</a>
+    </div>
+    <div data-name="GeneralInfoSectionRowComponent"><span data-mark="MainPrice"><span>9 {index:03d} 000 ₽</span></span></div>
+    <p>{filler}</p>
+  </div>
+</article>
+"""
+
+NEWOBJECT_CARD_HTML = """
+<div data-mark="GKCard">
+  <a data-mark="Link" href="https://zhk-{index}.cian.ru/"><span data-mark="Text">ЖК «Солнечный {index}»</span></a>
+  <div data-mark="CellAddressBlock">Краснодар, р-н Прикубанский, улица Красная, {index}</div>
+  <p>{filler}</p>
+</div>
+"""
+
+PAGE_LABELS = {
+    "flat_page": ["Тип жилья", "Вторичка", "Тип дома", "Кирпичный", "Отопление", "Центральное", "Отделка", "Без отделки",
+                  "Площадь кухни", "10 м²", "Жилая площадь", "30 м²", "Год постройки", "1999", "Этаж", "5 из 9",
+                  "Санузел", "1 совмещенный", "Балкон/лоджия", "1 балкон", "Вид из окон", "Во двор"],
+    "suburban_page": ["Материал дома", "Кирпич", "Участок", "6 сот.", "Статус участка", "ИЖС", "Газ", "Магистральный",
+                      "Водоснабжение", "Центральное", "Канализация", "Септик", "Санузел", "В доме", "Общая площадь", "120 м²",
+                      "Год постройки", "2010", "Этажей в доме", "2"],
+    "newobject_page": ["Срок сдачи", "2025", "Тип дома", "Монолитный", "Отделка", "Чистовая", "Высота потолков", "3 м",
+                       "Класс", "Комфорт", "Застройщик ООО Ромашка. Проектная декларация на сайте", "Подробнее",
+                       "Парковка", "Подземная", "Этажность", "5-17"],
+}
+
+
+def build_synthetic_list_page(card_html, count_of_offers=28):
+    cards = "".join(card_html.format(index=index, offer_id=300000000 + index, filler=FILLER) for index in range(count_of_offers))
+    return f"<html><head><title>Циан</title></head><body><div data-name='HeaderDefault'>Циан</div>{cards}</body></html>"
+
+
+def build_synthetic_detail_page(kind):
+    """
+    Labels are surrounded by as many spans as the real page has, so the cost of one pass over spans is realistic
+    """
+
+    noise = "".join(f"<div><span>Пункт {index}</span><span>{FILLER[:80]}</span></div>" for index in range(400))
+    labels = "".join(f"<div><span>{text}</span></div>" for text in PAGE_LABELS[kind])
+    return f"<html><body>{noise}{labels}{noise}<a href='tel:+79181234567'>+7 918 123-45-67\"</a></body></html>"
+
+
+def build_synthetic_corpus(kind):
+    if kind == "flat_list":
+        return {"synthetic_flat_list": build_synthetic_page()}
+    if kind == "suburban_list":
+        return {"synthetic_suburban_list": build_synthetic_list_page(SUBURBAN_CARD_HTML)}
+    if kind == "newobject_list":
+        return {"synthetic_newobject_list": build_synthetic_list_page(NEWOBJECT_CARD_HTML, count_of_offers=25)}
+
+    return {f"synthetic_{kind}": build_synthetic_detail_page(kind)}
+
+
+def define_synthetic_kinds(corpus):
+    """
+    Kinds of corpus filled with synthetic pages because there are no saved ones
+    """
+
+    return [kind for kind, pages in corpus.items() if all(name.startswith("synthetic_") for name in pages)]
+
+
+def load_corpus(corpus_path=DEFAULT_CORPUS_PATH):
+    """
+    :return: kind -> {name: html}, sha1 of all pages (the identity of corpus to compare results)
+    """
+
+    corpus = dict()
+    corpus_hash = hashlib.sha1()
+    for kind in KINDS:
+        kind_path = pathlib.Path(corpus_path) / kind
+        paths = sorted(kind_path.glob("*.html")) if kind_path.is_dir() else []
+        pages = {path.stem: path.read_text(encoding="utf-8") for path in paths}
+        if len(pages) == 0:
+            pages = build_synthetic_corpus(kind)
+
+        for name, html in pages.items():
+            corpus_hash.update(kind.encode("utf-8"))
+            corpus_hash.update(name.encode("utf-8"))
+            corpus_hash.update(html.encode("utf-8"))
+        corpus[kind] = pages
+
+    return corpus, corpus_hash.hexdigest()
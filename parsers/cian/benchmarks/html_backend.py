@@ -0,0 +1,94 @@
+"""
+Throughput of tree builders of bs4 on pages with list of offers. html.parser is the default one, the line "lxml /
+html.parser" shows how lxml compares to it (above 1.00x it is faster)
+
+    python benchmarks/html_backend.py [saved_page.html ...] [--repeat 20]
+
+Without saved pages a synthetic page with 28 offer cards is used.
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from cianparser import html_backend
+from cianparser.helpers import define_author, define_location_data, define_price_data, define_specification_data
+
+CARD_HTML = """
+<article data-name="CardComponent">
+  <div><span>Агентство недвижимости</span><span>Агентство {index}</span></div>
+  <div data-name="LinkArea">
+    <a href="https://www.cian.ru/sale/flat/{offer_id}/">2-комн. кв., 54,3 м², 5/9 этаж</a>
+    <div data-name="GeneralInfoSectionRowComponent">2-комн. кв., 54,3 м², 5/9 этаж</div>
+    <div data-name="GeneralInfoSectionRowComponent">ЖК «Солнечный»</div>
+    <div data-name="GeneralInfoSectionRowComponent">Краснодар, р-н Прикубанский, улица Красная, {index}</div>
+    <div data-name="GeneralInfoSectionRowComponent"><span data-mark="MainPrice"><span>5 {index:03d} 000 ₽</span></span></div>
+    <p>{filler}</p>
+  </div>
+</article>
+"""
+
+
+def build_synthetic_page(count_of_offers=28):
+    filler = "Просторная светлая квартира с ремонтом, рядом школа и парк. " * 20
+    cards = "".join(CARD_HTML.format(index=index, offer_id=300000000 + index, filler=filler)
+                    for index in range(count_of_offers))
+    return f"<html><head><title>Циан</title></head><body><div data-name='HeaderDefault'>Купить квартиру</div>{cards}</body></html>"
+
+
+def parse_list_page(html):
+    html_backend.is_captcha(html)
+    soup = html_backend.make_soup(html)
+    offers = soup.select("article[data-name='CardComponent']")
+    for offer in offers:
+        define_author(block=offer)
+        define_location_data(block=offer, is_sale=True)
+        define_price_data(block=offer)
+        define_specification_data(block=offer)
+
+    return len(offers)
+
+
+def measure(backend, pages, repeat):
+    html_backend.set_backend(backend)
+
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            html_backend.make_soup(html)
+    build_elapsed = time.perf_counter() - started_at
+
+    count_of_offers = 0
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            count_of_offers += parse_list_page(html)
+    parse_elapsed = time.perf_counter() - started_at
+
+    return len(pages) * repeat / build_elapsed, len(pages) * repeat / parse_elapsed, count_of_offers / parse_elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("pages", nargs="*", type=pathlib.Path, help="saved pages with list of offers")
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    pages = [path.read_text(encoding="utf-8") for path in args.pages] or [build_synthetic_page()]
+
+    results = {}
+    for backend in html_backend.available_backends():
+        results[backend] = measure(backend, pages, args.repeat)
+        print(f"{backend:>12}: tree {results[backend][0]:8.1f} pages/s | "
+              f"full parse {results[backend][1]:8.1f} pages/s {results[backend][2]:10.1f} offers/s")
+
+    if len(results) > 1:
+        lxml_result, html_parser_result = results[html_backend.LXML_BACKEND], results[html_backend.HTML_PARSER_BACKEND]
+        print(f"{'lxml / html.parser':>12}: tree {lxml_result[0] / html_parser_result[0]:8.2f}x       | "
+              f"full parse {lxml_result[1] / html_parser_result[1]:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
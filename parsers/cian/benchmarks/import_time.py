@@ -0,0 +1,68 @@
+"""
+Cold start of the package: every statement is run in a fresh interpreter, so nothing is cached in sys.modules
+
+    python benchmarks/import_time.py [--repeat 10] [--max-ms 50]
+
+Reports median milliseconds of every statement and which heavy dependencies it has loaded. Exits with code 1 if
+"import cianparser", "from cianparser import CianParser" or lookup of locations loads a heavy dependency or takes
+more than --max-ms (asyncio and the async fetcher are loaded only by the async-fetch path).
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+PACKAGE_PATH = pathlib.Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ["cloudscraper", "requests", "bs4", "transliterate", "urllib.request", "asyncio", "cianparser.fetcher"]
+
+# (statement, is guarded by --max-ms and by absence of heavy modules)
+STATEMENTS = [
+    ("import cianparser", True),
+    ("import cianparser; cianparser.list_locations()", True),
+    ("from cianparser.url_builder import URLBuilder", True),
+    ("from cianparser import CianParser", True),
+    ("import cianparser; cianparser.CianParser(location='Москва')", False),
+]
+
+MEASURE_CODE = """
+import json, sys, time
+started_at = time.perf_counter()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - started_at
+print(json.dumps({"ms": elapsed * 1000, "modules": [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+
+def measure(statement, repeat):
+    timings, modules = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", MEASURE_CODE, statement] + HEAVY_MODULES, cwd=PACKAGE_PATH,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["ms"])
+        modules = result["modules"]
+    return statistics.median(timings), modules
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    arg_parser.add_argument("--max-ms", type=float, default=50)
+    args = arg_parser.parse_args()
+
+    is_failed = False
+    for statement, is_guarded in STATEMENTS:
+        elapsed, modules = measure(statement, args.repeat)
+        print(f"{statement:>60}: {elapsed:8.1f} ms, loaded: {', '.join(modules) or '-'}")
+        if is_guarded and (elapsed > args.max_ms or len(modules) != 0):
+            print(f"{'':>60}  ^ cold start is over {args.max_ms} ms or loads heavy dependencies")
+            is_failed = True
+
+    sys.exit(1 if is_failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Offline throughput of cianparser parsers on the corpus of saved pages (see benchmarks/corpus_pages.py)
+
+    python benchmarks/parsing.py [--corpus benchmarks/corpus] [--repeat 5] [--output results.json] [--compare baseline.json]
+
+Reports pages/s and offers/s of parse_list_offers_page of every list parser (without loading pages of offers),
+us per call of the define_* helpers and pages/s of every *PageParser, each with peak memory.
+Kinds of pages without recorded corpus are measured on synthetic pages, it is printed and saved in "synthetic" of meta. With --compare the ratio to the baseline results is printed,
+the ratio is meaningful only if both runs used the same corpus and html backend.
+"""
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from cianparser import html_backend
+from cianparser.helpers import define_author, define_location_data, parse_location_data, define_price_data, \
+    define_specification_data, define_card_data
+from cianparser.flat.list import FlatListPageParser
+from cianparser.suburban.list import SuburbanListPageParser
+from cianparser.newobject.list import NewObjectListParser
+from cianparser.flat.page import FlatPageParser
+from cianparser.suburban.page import SuburbanPageParser
+from cianparser.newobject.page import NewObjectPageParser
+
+from corpus_pages import DEFAULT_CORPUS_PATH, load_corpus, define_synthetic_kinds
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+        self.ok = True
+        self.headers = dict()
+
+    def raise_for_status(self):
+        pass
+
+
+class ListOnlyEnricher:
+    """
+    Stands in for DetailEnricher of list parsers: offers are merged with empty extra data at once, so only pages
+    with list of offers are parsed and no page of offer is loaded
+    """
+
+    def submit(self, url, merge, fingerprint=None):
+        merge(dict())
+
+    def join(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+class CorpusSession:
+    """
+    Answers every request with the saved pages in turn, nothing goes to the network
+    """
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.__index__ = 0
+
+    def get(self, url, **kwargs):
+        html = self.pages[self.__index__ % len(self.pages)]
+        self.__index__ += 1
+        return Response(html)
+
+
+def measure(run, repeat):
+    """
+    :param run: function which does one unit of work and returns the count of (pages, offers, calls) done
+    :return: elapsed seconds of repeat runs and total counts, peak memory in kb of one separate run
+    """
+
+    totals = [0, 0, 0]
+    elapsed = 0.0
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        counts = run()
+        elapsed += time.perf_counter() - started_at
+        totals = [total + count for total, count in zip(totals, counts)]
+
+    tracemalloc.start()
+    run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, totals, peak_memory / 1024
+
+
+def define_list_parser(kind):
+    if kind == "flat_list":
+        return FlatListPageParser(session=None, accommodation_type="flat", deal_type="sale", rent_period_type=None,
+                                  location_name="Краснодар")
+    if kind == "suburban_list":
+        return SuburbanListPageParser(session=None, accommodation_type="suburban", deal_type="sale", rent_period_type=None,
+                                      location_name="Краснодар", object_type="house")
+
+    parser = NewObjectListParser(session=None, location_name="Краснодар")
+    parser.detail_enricher.close()
+    parser.detail_enricher = ListOnlyEnricher()
+    return parser
+
+
+def bench_list_pages(corpus, repeat):
+    results = dict()
+    for kind, page_parser_class in [("flat_list", FlatListPageParser), ("suburban_list", SuburbanListPageParser),
+                                    ("newobject_list", NewObjectListParser)]:
+        pages = list(corpus[kind].values())
+
+        def run():
+            count_of_offers = 0
+            for html in pages:
+                parser = define_list_parser(kind)
+                parser.parse_list_offers_page(html=html, page_number=1, count_of_pages=1, attempt_number=1)
+                count_of_offers += parser.count_parsed_offers
+                parser.close()
+            return len(pages), count_of_offers, len(pages)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, (count_of_pages, count_of_offers, _), peak_memory = measure(run, repeat)
+
+        results[f"{page_parser_class.__name__}.parse_list_offers_page"] = {
+            "pages_per_s": count_of_pages / elapsed,
+            "offers_per_s": count_of_offers / elapsed,
+            "peak_memory_kb": peak_memory,
+        }
+
+    return results
+
+
+def bench_helpers(corpus, repeat):
+    helpers = {
+        "flat_list": [
+            ("define_author", lambda card: define_author(block=card)),
+            ("define_location_data", lambda card: define_location_data(block=card, is_sale=True)),
+            ("define_price_data", lambda card: define_price_data(block=card)),
+            ("define_specification_data", lambda card: define_specification_data(block=card)),
+            ("define_card_data", lambda card: define_card_data(block=card, is_sale=True)),
+        ],
+        "suburban_list": [
+            ("parse_location_data", lambda card: parse_location_data(block=card)),
+            ("define_card_data[suburban]", lambda card: define_card_data(block=card, is_sale=True, with_geo_labels=True, with_specification=False)),
+        ],
+    }
+
+    results = dict()
+    for kind, kind_helpers in helpers.items():
+        cards = [card for html in corpus[kind].values()
+                 for card in html_backend.make_soup(html).select("article[data-name='CardComponent']")]
+        if len(cards) == 0:
+            continue
+
+        for name, helper in kind_helpers:
+            def run():
+                for card in cards:
+                    helper(card)
+                return 0, 0, len(cards)
+
+            elapsed, (_, _, count_of_calls), peak_memory = measure(run, repeat)
+            results[name] = {
+                "us_per_call": elapsed * 1e6 / count_of_calls,
+                "peak_memory_kb": peak_memory,
+            }
+
+    return results
+
+
+def bench_pages(corpus, repeat):
+    results = dict()
+    for kind, page_parser_class, kwargs in [("flat_page", FlatPageParser, {"with_json_state": True}),
+                                            ("suburban_page", SuburbanPageParser, {"with_json_state": True}),
+                                            ("newobject_page", NewObjectPageParser, {})]:
+        pages = list(corpus[kind].values())
+
+        def run():
+            session = CorpusSession(pages)
+            for _ in pages:
+                page_parser_class(session=session, url="https://cian.ru/", **kwargs).parse_page()
+            return len(pages), 0, len(pages)
+
+        elapsed, (count_of_pages, _, _), peak_memory = measure(run, repeat)
+        results[f"{page_parser_class.__name__}.parse_page"] = {
+            "pages_per_s": count_of_pages / elapsed,
+            "peak_memory_kb": peak_memory,
+        }
+
+    return results
+
+
+def print_results(results, baseline=None):
+    baseline_results = dict() if baseline is None else baseline["results"]
+    for name, metrics in results.items():
+        line = f"{name:>45}:"
+        for metric, value in metrics.items():
+            line += f" {metric} {value:10.1f}"
+            baseline_value = baseline_results.get(name, dict()).get(metric)
+            if baseline_value:
+                line += f" ({value / baseline_value:5.2f}x)"
+        print(line)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--corpus", type=pathlib.Path, default=DEFAULT_CORPUS_PATH)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--backend", default=None, help=f"one of {', '.join(html_backend.available_backends())}")
+    arg_parser.add_argument("--output", type=pathlib.Path, default=None, help="save results as json")
+    arg_parser.add_argument("--compare", type=pathlib.Path, default=None, help="json with results of the baseline run")
+    args = arg_parser.parse_args()
+
+    if args.backend is not None:
+        html_backend.set_backend(args.backend)
+
+    corpus, corpus_hash = load_corpus(args.corpus)
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": html_backend.get_backend(),
+        "corpus": corpus_hash,
+        "pages": {kind: len(pages) for kind, pages in corpus.items()},
+        "synthetic": define_synthetic_kinds(corpus),
+        "repeat": args.repeat,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    results = dict()
+    results.update(bench_list_pages(corpus, args.repeat))
+    results.update(bench_helpers(corpus, args.repeat))
+    results.update(bench_pages(corpus, args.repeat))
+
+    baseline = None
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for key in ["corpus", "backend"]:
+            if baseline["meta"].get(key) != meta[key]:
+                print(f"warning: {key} differs from the baseline, results are not comparable")
+
+    print(f"backend {meta['backend']}, corpus {meta['corpus'][:12]} {meta['pages']}")
+    if len(meta["synthetic"]) != 0:
+        print(f"warning: synthetic pages are used for {', '.join(meta['synthetic'])}, record the corpus with "
+              f"benchmarks/record_corpus.py to measure real pages")
+    print_results(results, baseline)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Record the corpus of Cian pages for offline benchmarks (benchmarks/parsing.py)
+
+    python benchmarks/record_corpus.py [--location Краснодар] [--offers 30] [--corpus benchmarks/corpus]
+
+Runs the usual crawl with with_extra_data and saves every answered page: pages with list of offers
+as <kind>_list, pages of separate offers as <kind>_page.
+"""
+import argparse
+import hashlib
+import itertools
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import cianparser
+
+from corpus_pages import DEFAULT_CORPUS_PATH
+
+
+class RecordingSession:
+    def __init__(self, session, corpus_path):
+        self.session = session
+        self.corpus_path = pathlib.Path(corpus_path)
+        self.kind = None
+        self.count_of_pages = 0
+
+    def get(self, url, **kwargs):
+        res = self.session.get(url, **kwargs)
+        if res.status_code == 200:
+            is_list = "cat.php" in url or "newobjects/list" in url
+            kind_path = self.corpus_path / f"{self.kind}_{'list' if is_list else 'page'}"
+            kind_path.mkdir(parents=True, exist_ok=True)
+            (kind_path / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html").write_text(res.text, encoding="utf-8")
+            self.count_of_pages += 1
+
+        return res
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--location", default="Краснодар")
+    arg_parser.add_argument("--offers", type=int, default=30, help="how many offers of every kind are recorded")
+    arg_parser.add_argument("--corpus", type=pathlib.Path, default=DEFAULT_CORPUS_PATH)
+    args = arg_parser.parse_args()
+
+    parser = cianparser.CianParser(location=args.location)
+    scheduler = parser.__scheduler__
+    recording_session = RecordingSession(scheduler.session, args.corpus)
+    scheduler.session = recording_session
+
+    crawls = [
+        ("flat", lambda: parser.iter_flats(deal_type="sale", rooms="all", with_extra_data=True, with_json_state=True,
+                                           additional_settings={"start_page": 1, "end_page": 2})),
+        ("suburban", lambda: parser.iter_suburban(suburban_type="house", deal_type="sale", with_extra_data=True, with_json_state=True,
+                                                  additional_settings={"start_page": 1, "end_page": 2})),
+        ("newobject", lambda: parser.iter_newobjects()),
+    ]
+    for kind, crawl in crawls:
+        recording_session.kind = kind
+        offers = crawl()
+        for _ in itertools.islice(offers, args.offers):
+            pass
+        offers.close()
+
+    print(f"\n{recording_session.count_of_pages} pages are saved to {args.corpus}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,32 @@
-from .cianparser import CianParser, list_locations, list_metro_stations
+import importlib
+import importlib.util
 
 __author__ = "lenarsaitov"
 __mail__ = "lenarsaitov1@yandex.ru"
+
+# public names -> modules, a module is imported on first access to its name, so "import cianparser" stays cheap.
+# Submodules (e.g. cianparser.html_backend) are imported on first access too
+__lazy_names__ = {
+    "CianParser": "cianparser.cianparser",
+    "BatchParser": "cianparser.batch",
+    "list_locations": "cianparser.lookup",
+    "list_metro_stations": "cianparser.lookup",
+}
+
+__all__ = list(__lazy_names__.keys())
+
+
+def __getattr__(name):
+    if name in __lazy_names__:
+        value = getattr(importlib.import_module(__lazy_names__[name]), name)
+        globals()[name] = value
+        return value
+
+    if not name.startswith("__") and importlib.util.find_spec(f"{__name__}.{name}") is not None:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(__all__))
@@ -1,15 +1,25 @@
 import math
-import csv
 
 from cianparser.constants import SPECIFIC_FIELDS_FOR_RENT_LONG, SPECIFIC_FIELDS_FOR_RENT_SHORT, SPECIFIC_FIELDS_FOR_SALE
+from cianparser.enrichment import DetailEnricher
+from cianparser.writers import CsvResultWriter, ArrowResultWriter
+from cianparser.seen_store import define_seen_key
+from cianparser.detail_cache import define_card_fingerprint
+from cianparser.helpers import define_deal_url_id
+from cianparser.records import OfferRecord, OfferColumns
 
 
 class BaseListPageParser:
+    page_parser_class = None
+
     def __init__(self,
                  session,
                  accommodation_type: str, deal_type: str, rent_period_type, location_name: str,
                  with_saving_csv=False, with_extra_data=False,
-                 object_type=None, additional_settings=None):
+                 object_type=None, additional_settings=None,
+                 detail_workers=4, with_json_state=False, watermark=None, seen_store=None, detail_cache=None,
+                 return_format="dicts", with_saving_parquet=False, parquet_path="cian_dataset", parquet_format="parquet",
+                 market_stats=None, photo_pipeline=None):
         self.accommodation_type = accommodation_type
         self.session = session
         self.deal_type = deal_type
@@ -19,14 +29,36 @@ class BaseListPageParser:
         self.with_extra_data = with_extra_data
         self.additional_settings = additional_settings
         self.object_type = object_type
-
-        self.result = []
+        self.with_json_state = with_json_state
+        self.watermark = watermark
+        self.seen_store = seen_store
+        self.return_format = return_format
+        self.market_stats = market_stats
+        self.photo_pipeline = photo_pipeline
+
+        self.result = OfferColumns() if return_format == "columns" else []
+        self.keep_results = True
+        self.pending_offers = []
         self.result_set = set()
         self.average_price = 0
         self.count_parsed_offers = 0
+        self.count_fresh_offers_on_page = 0
+        self.newest_offer_id = -1
+        self.newest_published_at = ""
         self.start_page = 1 if (additional_settings is None or "start_page" not in additional_settings.keys()) else additional_settings["start_page"]
         self.end_page = 100 if (additional_settings is None or "end_page" not in additional_settings.keys()) else additional_settings["end_page"]
         self.file_path = self.build_file_path()
+        self.unnecessary_fields = self.define_unnecessary_fields()
+        self.csv_writer = CsvResultWriter(self.file_path) if with_saving_csv else None
+        self.parquet_writer = None
+        if with_saving_parquet:
+            self.parquet_writer = ArrowResultWriter(parquet_path, file_format=parquet_format, exclude_fields=self.unnecessary_fields)
+        self.detail_enricher = None
+        if with_extra_data:
+            self.detail_enricher = DetailEnricher(session=session, page_parser_class=self.page_parser_class,
+                                                  max_workers=detail_workers,
+                                                  page_parser_kwargs={"with_json_state": with_json_state},
+                                                  detail_cache=detail_cache)
 
     def is_sale(self):
         return self.deal_type == "sale"
@@ -37,14 +69,30 @@ class BaseListPageParser:
     def is_rent_short(self):
         return self.deal_type == "rent" and self.rent_period_type == 2
 
+    def define_query_deal_type(self):
+        """
+        Deal type as it is given to CianParser: "sale", "rent_long" or "rent_short"
+        """
+
+        if self.is_rent_long():
+            return "rent_long"
+        if self.is_rent_short():
+            return "rent_short"
+
+        return self.deal_type
+
     def build_file_path(self):
         pass
 
     def define_average_price(self, price_data):
+        """
+        Running mean of prices, it is called after count_parsed_offers is incremented for the offer
+        """
+
         if "price" in price_data:
-            self.average_price = (self.average_price * self.count_parsed_offers + price_data["price"]) / self.count_parsed_offers
+            self.average_price += (price_data["price"] - self.average_price) / self.count_parsed_offers
         elif "price_per_month" in price_data:
-            self.average_price = (self.average_price * self.count_parsed_offers + price_data["price_per_month"]) / self.count_parsed_offers
+            self.average_price += (price_data["price_per_month"] - self.average_price) / self.count_parsed_offers
 
     def print_parse_progress(self, page_number, count_of_pages, offers, ind):
         total_planed_offers = len(offers) * count_of_pages
@@ -55,41 +103,138 @@ class BaseListPageParser:
               f" Average price: {'{:,}'.format(int(self.average_price)).replace(',', ' ')} rub",
               end="\r", flush=True)
 
-    def remove_unnecessary_fields(self):
-        if self.is_sale():
-            for not_need_field in SPECIFIC_FIELDS_FOR_RENT_LONG:
-                if not_need_field in self.result[-1]:
-                    del self.result[-1][not_need_field]
+    def check_freshness(self, url, published_at=""):
+        """
+        Count the offer as fresh if it is newer than the watermark of the previous incremental crawl
+        :return: False if the offer is at or below the watermark, so it was collected by the previous crawl
+        """
 
-            for not_need_field in SPECIFIC_FIELDS_FOR_RENT_SHORT:
-                if not_need_field in self.result[-1]:
-                    del self.result[-1][not_need_field]
+        offer_id = define_deal_url_id(url)
+        if not offer_id.isdigit():
+            return True
 
-        if self.is_rent_long():
-            for not_need_field in SPECIFIC_FIELDS_FOR_RENT_SHORT:
-                if not_need_field in self.result[-1]:
-                    del self.result[-1][not_need_field]
+        is_known = offer_id in self.result_set
+        offer_id = int(offer_id)
+        self.newest_offer_id = max(self.newest_offer_id, offer_id)
+        self.newest_published_at = max(self.newest_published_at, published_at)
 
-            for not_need_field in SPECIFIC_FIELDS_FOR_SALE:
-                if not_need_field in self.result[-1]:
-                    del self.result[-1][not_need_field]
+        if self.watermark is None or is_known:
+            return True
 
-        if self.is_rent_short():
-            for not_need_field in SPECIFIC_FIELDS_FOR_RENT_LONG:
-                if not_need_field in self.result[-1]:
-                    del self.result[-1][not_need_field]
+        if offer_id > self.watermark.get("offer_id", -1) or published_at > self.watermark.get("published_at", published_at):
+            self.count_fresh_offers_on_page += 1
+            return True
+
+        return False
+
+    def is_watermark_reached(self, count_of_offers):
+        """
+        In incremental crawl the page with only older or already known offers means that the rest pages are already seen
+        """
+
+        count_fresh_offers, self.count_fresh_offers_on_page = self.count_fresh_offers_on_page, 0
+        return self.watermark is not None and "offer_id" in self.watermark and count_of_offers != 0 and count_fresh_offers == 0
+
+    def define_watermark(self):
+        watermark = dict() if self.watermark is None else dict(self.watermark)
+        if self.newest_offer_id > watermark.get("offer_id", -1):
+            watermark["offer_id"] = self.newest_offer_id
+        if self.newest_published_at > watermark.get("published_at", ""):
+            watermark["published_at"] = self.newest_published_at
+
+        return watermark
+
+    def check_seen_offer(self, url, price_data):
+        """
+        Offer with the same id and price collected by one of the previous runs is skipped. The offer is remembered
+        only when it is emitted (see __append_offer__), so offers lost by a failure or a stop are collected next time
+        """
+
+        if self.seen_store is None:
+            return False
+
+        return self.seen_store.is_seen(define_seen_key(url, price_data))
+
+    def append_offer(self, url, build_offer, card_dicts=()):
+        """
+        build_offer(page_data) makes the final offer, with_extra_data page_data is collected by the pool of workers
+        and offers are appended to result in order after join of the page. card_dicts are the fields of the card,
+        page of offer is taken from detail cache while they are the same
+        """
+
+        if self.detail_enricher is None:
+            self.__append_offer__(build_offer(dict()))
+        else:
+            fingerprint = define_card_fingerprint(*card_dicts) if len(card_dicts) != 0 else None
+            self.detail_enricher.submit(url, lambda page_data: self.__append_offer__(build_offer(page_data)), fingerprint=fingerprint)
 
-            for not_need_field in SPECIFIC_FIELDS_FOR_SALE:
-                if not_need_field in self.result[-1]:
-                    del self.result[-1][not_need_field]
+    def __append_offer__(self, offer):
+        if self.csv_writer is not None:
+            self.csv_writer.write(self.remove_unnecessary_fields(offer))
+
+        if self.parquet_writer is not None:
+            self.parquet_writer.write(offer)
+
+        if self.market_stats is not None:
+            self.market_stats.add(offer, deal_type=self.define_query_deal_type())
+
+        if self.photo_pipeline is not None:
+            self.photo_pipeline.submit(offer)
+
+        if self.keep_results:
+            self.result.append(OfferRecord(offer) if self.return_format == "records" else offer)
+        else:
+            self.pending_offers.append(offer)
+
+        if self.seen_store is not None:
+            self.seen_store.add(define_seen_key(offer.get("url", ""), offer))
+
+    def finish_page(self):
+        if self.detail_enricher is not None:
+            self.detail_enricher.join()
+
+        if self.csv_writer is not None:
+            self.csv_writer.flush()
+
+        if self.parquet_writer is not None:
+            self.parquet_writer.flush()
+
+    def pop_offers(self):
+        """
+        Offers collected since the previous call, used when keep_results is False
+        """
+
+        offers, self.pending_offers = self.pending_offers, []
+        return offers
+
+    def close(self):
+        if self.detail_enricher is not None:
+            self.detail_enricher.close()
+
+        if self.csv_writer is not None:
+            self.csv_writer.close()
+
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+        if self.seen_store is not None:
+            self.seen_store.flush()
+
+    def define_unnecessary_fields(self):
+        if self.is_sale():
+            return SPECIFIC_FIELDS_FOR_RENT_LONG | SPECIFIC_FIELDS_FOR_RENT_SHORT
+
+        if self.is_rent_long():
+            return SPECIFIC_FIELDS_FOR_RENT_SHORT | SPECIFIC_FIELDS_FOR_SALE
+
+        if self.is_rent_short():
+            return SPECIFIC_FIELDS_FOR_RENT_LONG | SPECIFIC_FIELDS_FOR_SALE
 
-        return self.result
+        return set()
 
-    def save_results(self):
-        self.remove_unnecessary_fields()
-        keys = self.result[0].keys()
+    def remove_unnecessary_fields(self, offer):
+        """
+        Copy of offer without fields of other deal types, offer itself is left as it is
+        """
 
-        with open(self.file_path, 'w', newline='', encoding='utf-8') as output_file:
-            dict_writer = csv.DictWriter(output_file, keys, delimiter=';')
-            dict_writer.writeheader()
-            dict_writer.writerows(self.result)
\ No newline at end of file
+        return {key: value for key, value in offer.items() if key not in self.unnecessary_fields}
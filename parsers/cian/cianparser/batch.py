@@ -0,0 +1,140 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cianparser.cianparser import CianParser
+from cianparser.constants import OFFERS_QUEUE_SIZE
+from cianparser.helpers import define_deal_url_id
+from cianparser.proxy_pool import ProxyPool
+from cianparser.scheduler import RequestScheduler
+from cianparser.session_store import SessionManager
+from cianparser.throttle import HostThrottle
+
+ACCOMMODATION_TYPES = {"flat", "suburban"}
+
+__query_done__ = object()
+
+
+class BatchParser:
+    def __init__(self, proxies=None, max_concurrent_queries=4, host_delay=1.0, request_timeout=15, session_manager=None, **parser_kwargs):
+        """
+        Run several queries at the same time over one session and one rate budget, offers are deduplicated
+        across queries by id and delivered as one stream
+        Examples:
+            >>> batch_parser = cianparser.BatchParser(max_concurrent_queries=4)
+            >>> data = batch_parser.get_offers([
+            ...     {"location": "Краснодар", "deal_type": "sale", "rooms": (1, 2)},
+            ...     {"location": "Сочи", "deal_type": "sale", "rooms": "all"},
+            ...     {"location": "Краснодар", "accommodation_type": "suburban", "suburban_type": "house", "deal_type": "sale"},
+            ... ])
+        :param proxies: proxies for executing requests (https scheme), shared by all queries, default None
+        :param max_concurrent_queries: how many queries may be running at the same time, default 4
+        :param host_delay: initial interval in seconds between two requests to the same host for all queries together, default 1.0
+        :param request_timeout: timeout in seconds of one attempt of request, default 15
+        :param session_manager: cianparser.session_store.SessionManager whose session is used by all queries, default None (own one without store)
+        :param parser_kwargs: other arguments of CianParser (detail_workers, with_async_fetch, seen_store and others)
+        """
+
+        session_manager = SessionManager() if session_manager is None else session_manager
+        session = session_manager.get_session()
+
+        self.max_concurrent_queries = max_concurrent_queries
+        self.parser_kwargs = parser_kwargs
+        self.__scheduler__ = RequestScheduler(session=session, throttle=HostThrottle(min_interval=host_delay), timeout=request_timeout)
+        self.__proxy_pool__ = ProxyPool(proxies=proxies)
+
+    def __define_parser__(self, query, scheduler):
+        accommodation_type = query.get("accommodation_type", "flat")
+        if accommodation_type not in ACCOMMODATION_TYPES:
+            raise ValueError(f'You entered accommodation_type={accommodation_type}, which is not valid value. '
+                             f'Try entering one of these values: "flat", "suburban".')
+
+        return CianParser(location=query["location"], proxies=self.__proxy_pool__, scheduler=scheduler, **self.parser_kwargs)
+
+    @staticmethod
+    def __iter_query_offers__(parser, query):
+        kwargs = {
+            "deal_type": query["deal_type"],
+            "with_extra_data": query.get("with_extra_data", False),
+            "additional_settings": query.get("additional_settings"),
+            "with_json_state": query.get("with_json_state", False),
+            "with_incremental": query.get("with_incremental", False),
+        }
+
+        if query.get("accommodation_type", "flat") == "suburban":
+            return parser.iter_suburban(suburban_type=query["suburban_type"], **kwargs)
+
+        return parser.iter_flats(rooms=query.get("rooms", "all"), **kwargs)
+
+    def iter_offers(self, queries):
+        """
+        Yield offers of all queries as soon as they are collected
+        :param queries: list of dicts with keys location, deal_type and optional accommodation_type ("flat" or "suburban",
+            default "flat"), rooms (flat, default "all"), suburban_type (suburban), additional_settings, with_extra_data,
+            with_json_state, with_incremental. Their meaning is the same as in get_flats and get_suburban
+        """
+
+        stopped = threading.Event()
+        # the same session and rate budget, but requests of these queries are interrupted once the stream is stopped
+        scheduler = RequestScheduler(session=self.__scheduler__.session, throttle=self.__scheduler__.throttle,
+                                     timeout=self.__scheduler__.timeout, stop_event=stopped)
+        parsers = [self.__define_parser__(query, scheduler) for query in queries]
+        offers = queue.Queue(maxsize=OFFERS_QUEUE_SIZE)
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    offers.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def run_query(parser, query):
+            if stopped.is_set():
+                put(__query_done__)
+                return
+
+            query_offers = self.__iter_query_offers__(parser, query)
+            try:
+                for offer in query_offers:
+                    if stopped.is_set():
+                        break
+                    put(offer)
+            except Exception as e:
+                put(e)
+            finally:
+                query_offers.close()
+                put(__query_done__)
+
+        seen_offer_ids = set()
+        count_of_running_queries = len(queries)
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_concurrent_queries))
+        try:
+            for parser, query in zip(parsers, queries):
+                executor.submit(run_query, parser, query)
+
+            while count_of_running_queries > 0:
+                item = offers.get()
+                if item is __query_done__:
+                    count_of_running_queries -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                offer_id = define_deal_url_id(item.get("url", ""))
+                if offer_id in seen_offer_ids:
+                    continue
+                seen_offer_ids.add(offer_id)
+                yield item
+        finally:
+            # when the consumer stops early, queries which have not started are cancelled and running ones are stopped
+            # by the scheduler at their next request or wait, they finish in background, the consumer does not wait
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_offers(self, queries):
+        """
+        Same as iter_offers, but returns all offers at once
+        """
+
+        return list(self.iter_offers(queries))
@@ -1,76 +1,205 @@
-import cloudscraper
+import queue
+import threading
 import time
 
-from cianparser.constants import CITIES, METRO_STATIONS, DEAL_TYPES, OBJECT_SUBURBAN_TYPES
+from cianparser.constants import DEAL_TYPES, OBJECT_SUBURBAN_TYPES, OFFERS_QUEUE_SIZE, \
+    IS_SORT_BY_CREATION_DATA_FROM_NEWER_TO_OLDER_PATH, RETURN_FORMATS
 from cianparser.url_builder import URLBuilder
+from cianparser.lookup import define_location, list_locations, list_metro_stations
 from cianparser.proxy_pool import ProxyPool
-from cianparser.flat.list import FlatListPageParser
-from cianparser.suburban.list import SuburbanListPageParser
-from cianparser.newobject.list import NewObjectListParser
-
-
-def list_locations():
-    return CITIES
-
-
-def list_metro_stations():
-    return METRO_STATIONS
+from cianparser.throttle import HostThrottle
+from cianparser.scheduler import RequestScheduler, is_captcha_response
+from cianparser.watermark import WatermarkStore, define_query_key
+from cianparser.partition import define_count_of_offers, split_price_bands, crawl_price_bands
+from cianparser.market_stats import MarketStats
+from cianparser.session_store import SessionManager
 
 
 class CianParser:
-    def __init__(self, location: str, proxies=None):
+    def __init__(self, location: str, proxies=None, with_async_fetch=False, max_concurrent_pages=4, host_delay=1.0,
+                 detail_workers=4, watermark_path="cian_watermarks.json", seen_store=None, request_timeout=15,
+                 detail_cache=None, scheduler=None, parquet_path="cian_dataset", parquet_format="parquet", market_stats=None,
+                 photo_pipeline=None, session_manager=None):
         """
         Initialize the Cian website parser
         Examples:
             >>> moscow_parser = cianparser.CianParser(location="Москва")
+            >>> krasnodar_parser = cianparser.CianParser(location="Краснодар", with_async_fetch=True, max_concurrent_pages=4)
         :param str location: location. e.g. "Москва", for see all correct values use cianparser.list_locations()
-        :param proxies: proxies for executing requests (https scheme), default None
+        :param proxies: proxies for executing requests (https scheme) or ProxyPool shared with other parsers, default None
+        :param with_async_fetch: is it necessary to load pages with list of offers concurrently, default False
+        :param max_concurrent_pages: how many pages with list of offers may be loading at the same time (with_async_fetch only), default 4
+        :param host_delay: initial interval in seconds between two requests to the same host, it shrinks while the site answers and grows on 429 or captcha, default 1.0
+        :param detail_workers: how many pages of separate offers may be loading at the same time, default 4
+        :param watermark_path: path of the file with watermarks of incremental crawls (with_incremental), default "cian_watermarks.json"
+        :param seen_store: persistent store of already collected offers (cianparser.seen_store.SQLiteSeenStore or RedisSeenStore), offers with unchanged price from it are skipped without loading their pages, default None
+        :param request_timeout: timeout in seconds of one attempt of request, default 15
+        :param detail_cache: persistent cache of pages of separate offers (cianparser.detail_cache.DetailCache), the page is loaded again only when the card of offer has changed or the entry has expired (with_extra_data), default None
+        :param scheduler: RequestScheduler shared with other parsers, its session and rate budget are used instead of own ones (host_delay and request_timeout are ignored), default None
+        :param parquet_path: directory of the dataset written with with_saving_parquet, partitioned by date of collection and location, default "cian_dataset"
+        :param parquet_format: format of files of the dataset, "parquet" or "arrow" (Arrow IPC), default "parquet"
+        :param market_stats: cianparser.market_stats.MarketStats shared with other parsers, if None own one is created, default None
+        :param photo_pipeline: cianparser.photos.PhotoPipeline which stores first photos of every collected offer in the background, default None
+        :param session_manager: cianparser.session_store.SessionManager shared with other parsers, its session with saved cookies of the solved challenge and pooled connections is used, if None own one without store is created (ignored with scheduler), default None
         """
 
-        location_id = __validation_init__(location)
+        location_name, location_id = __validation_init__(location)
 
         self.__parser__ = None
-        self.__session__ = cloudscraper.create_scraper()
-        self.__session__.headers = {'Accept-Language': 'en'}
-        self.__proxy_pool__ = ProxyPool(proxies=proxies)
-        self.__location_name__ = location
+        if scheduler is None:
+            self.__session_manager__ = SessionManager() if session_manager is None else session_manager
+            self.__session__ = self.__session_manager__.get_session()
+            self.__throttle__ = HostThrottle(min_interval=host_delay)
+            self.__scheduler__ = RequestScheduler(session=self.__session__, throttle=self.__throttle__, timeout=request_timeout)
+        else:
+            self.__session_manager__ = session_manager
+            self.__session__ = scheduler.session
+            self.__throttle__ = scheduler.throttle
+            self.__scheduler__ = scheduler
+        self.__proxy_pool__ = proxies if isinstance(proxies, ProxyPool) else ProxyPool(proxies=proxies)
+        self.__location_name__ = location_name
         self.__location_id__ = location_id
+        self.__fetcher__ = None
+        if with_async_fetch:
+            from cianparser.fetcher import AsyncListPageFetcher
+
+            self.__fetcher__ = AsyncListPageFetcher(max_concurrent_pages=max_concurrent_pages)
+        self.__detail_workers__ = detail_workers
+        self.__watermark_store__ = WatermarkStore(file_path=watermark_path)
+        self.__watermark_key__ = None
+        self.__count_of_failed_pages__ = 0
+        self.__seen_store__ = seen_store
+        self.__detail_cache__ = detail_cache
+        self.__parquet_path__ = parquet_path
+        self.__parquet_format__ = parquet_format
+        self.__market_stats__ = MarketStats() if market_stats is None else market_stats
+        self.__photo_pipeline__ = photo_pipeline
+        self.__worker_kwargs__ = {
+            "location": location_name,
+            "proxies": list(self.__proxy_pool__.get_stats().keys()),
+            "host_delay": host_delay,
+            "detail_workers": detail_workers,
+            "request_timeout": request_timeout,
+            "session_manager": self.__session_manager__,
+        }
 
     def __set_proxy__(self, url_list):
         if self.__proxy_pool__.is_empty():
-            return
+            return None
         available_proxy = self.__proxy_pool__.get_available_proxy(url_list)
         if available_proxy is not None:
             self.__session__.proxies = {"https": available_proxy}
+        return available_proxy
 
     def __load_list_page__(self, url_list_format, page_number, attempt_number_exception):
         url_list = url_list_format.format(page_number)
-        self.__set_proxy__(url_list)
+        proxy = self.__set_proxy__(url_list)
 
         if page_number == self.__parser__.start_page and attempt_number_exception == 0:
             print(f"The page from which the collection of information begins: \n {url_list}")
 
-        res = self.__session__.get(url=url_list)
-        if res.status_code == 429:
-            time.sleep(10)
+        start_time = time.monotonic()
+        try:
+            res = self.__scheduler__.get(url_list)
+        except Exception:
+            self.__proxy_pool__.report(proxy, is_success=False)
+            raise
+
+        self.__proxy_pool__.report(proxy, is_success=res.ok, latency=time.monotonic() - start_time, is_captcha=is_captcha_response(res))
         res.raise_for_status()
 
         return res.text
 
-    def __run__(self, url_list_format: str):
+    def __load_count_of_offers__(self, url_list_format):
+        url_list = url_list_format.format(1)
+        proxy = self.__set_proxy__(url_list)
+
+        start_time = time.monotonic()
+        try:
+            res = self.__scheduler__.get(url_list)
+        except Exception:
+            self.__proxy_pool__.report(proxy, is_success=False)
+            raise
+
+        self.__proxy_pool__.report(proxy, is_success=res.ok, latency=time.monotonic() - start_time, is_captcha=is_captcha_response(res))
+        res.raise_for_status()
+
+        return define_count_of_offers(res.text)
+
+    def __crawl_by_price_bands__(self, build_url_list, method_name, method_kwargs, additional_settings, max_workers):
+        if self.__seen_store__ is not None or self.__detail_cache__ is not None or self.__photo_pipeline__ is not None:
+            raise ValueError('seen_store, detail_cache and photo_pipeline can not be used with collection by price bands, '
+                             'bands are collected in separate processes which do not share them. Use get_flats or get_suburban instead.')
+
+        additional_settings = dict(additional_settings or dict())
+
+        def probe_count(min_price, max_price):
+            band_settings = dict(additional_settings, min_price=min_price)
+            band_settings.pop("max_price", None)
+            if max_price is not None:
+                band_settings["max_price"] = max_price
+            return self.__load_count_of_offers__(build_url_list(band_settings))
+
+        bands = split_price_bands(probe_count, min_price=additional_settings.get("min_price", 0),
+                                  max_price=additional_settings.get("max_price"))
+        bands_description = ", ".join(f"{band[0]}-{'' if band[1] is None else band[1]}" for band in bands)
+        print(f"\nThe query is split into {len(bands)} price bands: {bands_description}")
+
+        parser_kwargs = dict(self.__worker_kwargs__, host_delay=self.__worker_kwargs__["host_delay"] * max_workers)
+        result = crawl_price_bands(parser_kwargs=parser_kwargs, method_name=method_name,
+                                   method_kwargs=dict(method_kwargs, additional_settings=additional_settings),
+                                   bands=bands, max_workers=max_workers)
+
+        for offer in result:
+            self.__market_stats__.add(offer, deal_type=method_kwargs["deal_type"])
+
+        print(f"\n\nThe collection of information from all price bands is completed")
+        print(f"Total number of parsed offers: {len(result)}. ", end="\n")
+        return result
+
+    def __handle_list_page__(self, html, page_number, attempt_number):
+        (page_parsed, _, end_all_parsing) = self.__parser__.parse_list_offers_page(
+            html=html,
+            page_number=page_number,
+            count_of_pages=self.__parser__.end_page + 1 - self.__parser__.start_page,
+            attempt_number=attempt_number)
+        return page_parsed, end_all_parsing
+
+    def __print_start__(self):
         print(f"\n{' ' * 30}Preparing to collect information from pages..")
 
         if self.__parser__.with_saving_csv:
             print(f"The absolute path to the file: \n{self.__parser__.file_path} \n")
 
+    def __print_end__(self):
+        print(f"\n\nThe collection of information from the pages with list of offers is completed")
+        print(f"Total number of parsed offers: {self.__parser__.count_parsed_offers}. ", end="\n")
+
+    def __run__(self, url_list_format: str):
+        self.__count_of_failed_pages__ = 0
+        self.__print_start__()
+
+        try:
+            if self.__fetcher__ is not None:
+                self.__run_async__(url_list_format)
+            else:
+                for _ in self.__iter_pages__(url_list_format):
+                    pass
+        finally:
+            self.__parser__.close()
+
+        self.__save_watermark__()
+        self.__print_end__()
+
+    def __iter_pages__(self, url_list_format: str):
         page_number = self.__parser__.start_page - 1
         end_all_parsing = False
-        while page_number < self.__parser__.end_page and not end_all_parsing:
+        while page_number < self.__parser__.end_page and not end_all_parsing and not self.__scheduler__.is_stopped():
             page_parsed = False
             page_number += 1
             attempt_number_exception = 0
 
-            while attempt_number_exception < 3 and not page_parsed:
+            while attempt_number_exception < 3 and not page_parsed and not self.__scheduler__.is_stopped():
                 try:
                     (page_parsed, attempt_number, end_all_parsing) = self.__parser__.parse_list_offers_page(
                         html=self.__load_list_page__(url_list_format=url_list_format, page_number=page_number, attempt_number_exception=attempt_number_exception),
@@ -78,36 +207,180 @@ class CianParser:
                         count_of_pages=self.__parser__.end_page + 1 - self.__parser__.start_page,
                         attempt_number=attempt_number_exception)
 
+                    if not page_parsed:
+                        attempt_number_exception = attempt_number
+                        time.sleep(self.__scheduler__.define_backoff(attempt_number_exception))
+
                 except Exception as e:
                     attempt_number_exception += 1
                     if attempt_number_exception < 3:
+                        time.sleep(self.__scheduler__.define_backoff(attempt_number_exception))
                         continue
                     print(f"\n\nException: {e}")
                     print(f"The collection of information from the pages with ending parse on {page_number} page...\n")
                     break
 
-        print(f"\n\nThe collection of information from the pages with list of offers is completed")
-        print(f"Total number of parsed offers: {self.__parser__.count_parsed_offers}. ", end="\n")
+            if not page_parsed:
+                self.__count_of_failed_pages__ += 1
+
+            yield page_number
+
+    def __run_async__(self, url_list_format: str, handle_page=None):
+        def load_page(page_number, attempt_number):
+            return self.__load_list_page__(url_list_format=url_list_format, page_number=page_number, attempt_number_exception=attempt_number)
 
-    def get_flats(self, deal_type: str, rooms, with_saving_csv=False, with_extra_data=False, additional_settings=None):
+        failed_pages = self.__fetcher__.run(
+            load_page=load_page,
+            handle_page=self.__handle_list_page__ if handle_page is None else handle_page,
+            page_numbers=range(self.__parser__.start_page, self.__parser__.end_page + 1))
+        self.__count_of_failed_pages__ += len(failed_pages)
+
+    def __iter_offers__(self, url_list_format: str):
         """
-        Parse information of flats from cian website
-        Examples:
-            >>> moscow_parser = cianparser.CianParser(location="Москва")
-            >>> data = moscow_parser.get_flats(deal_type="rent_long", rooms=1)
-            >>> data = moscow_parser.get_flats(deal_type="rent_short", rooms=(1,3,"studio"), with_saving_csv=True)
-            >>> data = moscow_parser.get_flats(deal_type="sale", additional_settings={"start_page": 1, "end_page": 1, "sort_by":"price_from_min_to_max"})
-        :param deal_type: type of deal, e.g. "rent_long", "rent_short", "sale"
-        :param rooms: how many rooms in accommodation, default "all". Example 1, (1,3, "studio"), "studio, "all"
-        :param with_saving_csv: is it necessary to save data in csv, default False
-        :param with_extra_data:  is it necessary to collect additional data (but with increasing time duration), default False
-        :param additional_settings:  additional settings such as min_price, sort_by and others, default None
+        Offers are yielded page by page, the next page is requested only when the consumer has taken the previous ones
+        """
+
+        self.__parser__.keep_results = False
+        self.__count_of_failed_pages__ = 0
+        self.__print_start__()
+
+        try:
+            if self.__fetcher__ is not None:
+                yield from self.__iter_offers_async__(url_list_format)
+            else:
+                for _ in self.__iter_pages__(url_list_format):
+                    yield from self.__parser__.pop_offers()
+        finally:
+            self.__parser__.close()
+
+        yield from self.__parser__.pop_offers()
+        self.__save_watermark__()
+        self.__print_end__()
+
+    def __iter_offers_async__(self, url_list_format: str):
+        offers = queue.Queue(maxsize=OFFERS_QUEUE_SIZE)
+        stopped = threading.Event()
+        errors = []
+
+        def handle_page(html, page_number, attempt_number):
+            page_parsed, end_all_parsing = self.__handle_list_page__(html, page_number, attempt_number)
+            for offer in self.__parser__.pop_offers():
+                while not stopped.is_set():
+                    try:
+                        offers.put(offer, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+            return page_parsed, end_all_parsing or stopped.is_set()
+
+        def crawl():
+            try:
+                self.__run_async__(url_list_format, handle_page=handle_page)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                stopped.set()
+
+        crawler = threading.Thread(target=crawl, daemon=True)
+        crawler.start()
+        try:
+            while not stopped.is_set() or not offers.empty():
+                try:
+                    yield offers.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+        finally:
+            stopped.set()
+            crawler.join()
+
+        if len(errors) != 0:
+            raise errors[0]
+
+    async def __aiter_offers__(self, url_list_format: str):
+        import asyncio
+        from cianparser.fetcher import AsyncListPageFetcher
+
+        self.__parser__.keep_results = False
+        self.__count_of_failed_pages__ = 0
+        self.__print_start__()
+
+        fetcher = self.__fetcher__ if self.__fetcher__ is not None else AsyncListPageFetcher(max_concurrent_pages=1)
+        offers = asyncio.Queue(maxsize=OFFERS_QUEUE_SIZE)
+
+        def load_page(page_number, attempt_number):
+            return self.__load_list_page__(url_list_format=url_list_format, page_number=page_number, attempt_number_exception=attempt_number)
+
+        async def handle_page(html, page_number, attempt_number):
+            page_parsed, end_all_parsing = self.__handle_list_page__(html, page_number, attempt_number)
+            for offer in self.__parser__.pop_offers():
+                await offers.put(offer)
+            return page_parsed, end_all_parsing
+
+        crawler = asyncio.ensure_future(fetcher.crawl(
+            load_page=load_page,
+            handle_page=handle_page,
+            page_numbers=range(self.__parser__.start_page, self.__parser__.end_page + 1)))
+        try:
+            while True:
+                next_offer = asyncio.ensure_future(offers.get())
+                await asyncio.wait({next_offer, crawler}, return_when=asyncio.FIRST_COMPLETED)
+                if next_offer.done():
+                    yield next_offer.result()
+                    continue
+
+                next_offer.cancel()
+                while not offers.empty():
+                    yield offers.get_nowait()
+                self.__count_of_failed_pages__ += len(crawler.result())
+                break
+        finally:
+            if not crawler.done():
+                crawler.cancel()
+            await asyncio.get_running_loop().run_in_executor(None, self.__parser__.close)
+
+        for offer in self.__parser__.pop_offers():
+            yield offer
+        self.__save_watermark__()
+        self.__print_end__()
+
+    def __define_watermark__(self, url_list_format, with_incremental):
+        if not with_incremental:
+            self.__watermark_key__ = None
+            return None
+
+        self.__watermark_key__ = define_query_key(url_list_format)
+        watermark = self.__watermark_store__.get(self.__watermark_key__)
+        return dict() if watermark is None else watermark
+
+    def __save_watermark__(self):
+        """
+        The watermark is not moved if some pages have not been collected, so the next incremental crawl repeats them
         """
 
+        if self.__watermark_key__ is None:
+            return
+
+        if self.__count_of_failed_pages__ != 0:
+            print(f"\n{self.__count_of_failed_pages__} pages have not been collected... the watermark is not moved")
+            return
+
+        self.__watermark_store__.set(self.__watermark_key__, self.__parser__.define_watermark())
+
+    def __prepare_flats__(self, deal_type, rooms, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                          return_format="dicts", with_saving_parquet=False):
         __validation_get_flats__(deal_type, rooms)
+        __validation_return_format__(return_format)
         deal_type, rent_period_type = __define_deal_type__(deal_type)
+        if with_incremental:
+            additional_settings = dict(additional_settings or dict(), sort_by=IS_SORT_BY_CREATION_DATA_FROM_NEWER_TO_OLDER_PATH)
+
+        url_list_format = __build_url_list__(location_id=self.__location_id__, deal_type=deal_type, accommodation_type="flat",
+                                             rooms=rooms, rent_period_type=rent_period_type,
+                                             additional_settings=additional_settings)
+        from cianparser.flat.list import FlatListPageParser
+
         self.__parser__ = FlatListPageParser(
-            session=self.__session__,
+            session=self.__scheduler__,
             accommodation_type="flat",
             deal_type=deal_type,
             rent_period_type=rent_period_type,
@@ -115,14 +388,157 @@ class CianParser:
             with_saving_csv=with_saving_csv,
             with_extra_data=with_extra_data,
             additional_settings=additional_settings,
+            detail_workers=self.__detail_workers__,
+            with_json_state=with_json_state,
+            watermark=self.__define_watermark__(url_list_format, with_incremental),
+            seen_store=self.__seen_store__,
+            detail_cache=self.__detail_cache__,
+            return_format=return_format,
+            with_saving_parquet=with_saving_parquet,
+            parquet_path=self.__parquet_path__,
+            parquet_format=self.__parquet_format__,
+            market_stats=self.__market_stats__,
+            photo_pipeline=self.__photo_pipeline__,
+        )
+        return url_list_format
+
+    def __prepare_suburban__(self, suburban_type, deal_type, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                             return_format="dicts", with_saving_parquet=False):
+        __validation_get_suburban__(suburban_type=suburban_type, deal_type=deal_type)
+        __validation_return_format__(return_format)
+        deal_type, rent_period_type = __define_deal_type__(deal_type)
+        if with_incremental:
+            additional_settings = dict(additional_settings or dict(), sort_by=IS_SORT_BY_CREATION_DATA_FROM_NEWER_TO_OLDER_PATH)
+
+        url_list_format = __build_url_list__(location_id=self.__location_id__, deal_type=deal_type, accommodation_type="suburban",
+                                             rooms=None, rent_period_type=rent_period_type, suburban_type=suburban_type,
+                                             additional_settings=additional_settings)
+        from cianparser.suburban.list import SuburbanListPageParser
+
+        self.__parser__ = SuburbanListPageParser(
+            session=self.__scheduler__,
+            accommodation_type="suburban",
+            deal_type=deal_type,
+            rent_period_type=rent_period_type,
+            location_name=self.__location_name__,
+            with_saving_csv=with_saving_csv,
+            with_extra_data=with_extra_data,
+            additional_settings=additional_settings,
+            object_type=suburban_type,
+            detail_workers=self.__detail_workers__,
+            with_json_state=with_json_state,
+            watermark=self.__define_watermark__(url_list_format, with_incremental),
+            seen_store=self.__seen_store__,
+            detail_cache=self.__detail_cache__,
+            return_format=return_format,
+            with_saving_parquet=with_saving_parquet,
+            parquet_path=self.__parquet_path__,
+            parquet_format=self.__parquet_format__,
+            market_stats=self.__market_stats__,
+            photo_pipeline=self.__photo_pipeline__,
+        )
+        return url_list_format
+
+    def __prepare_newobjects__(self, with_saving_csv):
+        from cianparser.newobject.list import NewObjectListParser
+
+        self.__watermark_key__ = None
+        self.__parser__ = NewObjectListParser(
+            session=self.__scheduler__,
+            location_name=self.__location_name__,
+            with_saving_csv=with_saving_csv,
+            detail_workers=self.__detail_workers__,
         )
-        self.__run__(
-            __build_url_list__(location_id=self.__location_id__, deal_type=deal_type, accommodation_type="flat",
-                               rooms=rooms, rent_period_type=rent_period_type,
-                               additional_settings=additional_settings))
+        return __build_url_list__(location_id=self.__location_id__, deal_type="sale", accommodation_type="newobject")
+
+    def get_market_stats(self):
+        """
+        Streaming statistics of prices of all offers collected by this parser by deal type, district and count of rooms,
+        it may be read during the crawl
+        Examples:
+            >>> moscow_parser.get_market_stats().get_summary(deal_type="sale", rooms_count=2)
+        """
+
+        return self.__market_stats__
+
+    def get_flats(self, deal_type: str, rooms, with_saving_csv=False, with_extra_data=False, additional_settings=None,
+                  with_json_state=False, with_incremental=False, return_format="dicts", with_saving_parquet=False):
+        """
+        Parse information of flats from cian website
+        Examples:
+            >>> moscow_parser = cianparser.CianParser(location="Москва")
+            >>> data = moscow_parser.get_flats(deal_type="rent_long", rooms=1)
+            >>> data = moscow_parser.get_flats(deal_type="rent_short", rooms=(1,3,"studio"), with_saving_csv=True)
+            >>> data = moscow_parser.get_flats(deal_type="sale", additional_settings={"start_page": 1, "end_page": 1, "sort_by":"price_from_min_to_max"})
+            >>> data = moscow_parser.get_flats(deal_type="sale", rooms="all", return_format="columns")
+        :param deal_type: type of deal, e.g. "rent_long", "rent_short", "sale"
+        :param rooms: how many rooms in accommodation, default "all". Example 1, (1,3, "studio"), "studio, "all"
+        :param with_saving_csv: is it necessary to save data in csv, default False
+        :param with_saving_parquet: is it necessary to save data in typed dataset (see parquet_path of CianParser, requires pyarrow), default False
+        :param with_extra_data:  is it necessary to collect additional data (but with increasing time duration), default False
+        :param additional_settings:  additional settings such as min_price, sort_by and others, default None
+        :param with_json_state: is it necessary to take offers from the state embedded in pages (DOM is used as fallback), default False
+        :param with_incremental: is it necessary to collect only offers newer than the ones seen by the previous incremental crawl
+            of the same query (sort_by is forced to creation_data_from_newer_to_older), default False
+        :param return_format: "dicts" - list of dicts, "records" - list of cianparser.records.OfferRecord (read like dicts, less memory),
+            "columns" - cianparser.records.OfferColumns with one list per field, default "dicts"
+        """
+
+        self.__run__(self.__prepare_flats__(deal_type, rooms, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                                            return_format, with_saving_parquet))
         return self.__parser__.result
 
-    def get_suburban(self, suburban_type: str, deal_type: str, with_saving_csv=False, with_extra_data=False, additional_settings=None):
+    def iter_flats(self, deal_type: str, rooms, with_saving_csv=False, with_extra_data=False, additional_settings=None,
+                   with_json_state=False, with_incremental=False, with_saving_parquet=False):
+        """
+        Same as get_flats, but yields offers while collecting them instead of keeping all of them in memory
+        Examples:
+            >>> for offer in moscow_parser.iter_flats(deal_type="sale", rooms=1):
+            ...     save(offer)
+        """
+
+        yield from self.__iter_offers__(self.__prepare_flats__(deal_type, rooms, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                                                               with_saving_parquet=with_saving_parquet))
+
+    async def aiter_flats(self, deal_type: str, rooms, with_saving_csv=False, with_extra_data=False, additional_settings=None,
+                          with_json_state=False, with_incremental=False, with_saving_parquet=False):
+        """
+        Asynchronous version of iter_flats
+        Examples:
+            >>> async for offer in moscow_parser.aiter_flats(deal_type="sale", rooms=1):
+            ...     await save(offer)
+        """
+
+        async for offer in self.__aiter_offers__(self.__prepare_flats__(deal_type, rooms, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                                                                        with_saving_parquet=with_saving_parquet)):
+            yield offer
+
+    def get_flats_by_price_bands(self, deal_type: str, rooms, with_extra_data=False, additional_settings=None, with_json_state=False,
+                                 max_workers=4):
+        """
+        Same as get_flats, but the query is split into price bands (min_price/max_price) small enough for the site to show
+        all of their offers, the bands are collected in parallel processes
+        Examples:
+            >>> data = moscow_parser.get_flats_by_price_bands(deal_type="sale", rooms=1, max_workers=4)
+        :param max_workers: how many bands may be collecting at the same time, host_delay of every process is multiplied
+            by it to keep the same rate of requests to the site, default 4
+        Offers of all bands are added to market stats of the parser. seen_store, detail_cache and photo_pipeline of the parser
+        are not supported (ValueError), a band which has failed is skipped with a message
+        """
+
+        __validation_get_flats__(deal_type, rooms)
+        deal_type_name, rent_period_type = __define_deal_type__(deal_type)
+
+        def build_url_list(band_settings):
+            return __build_url_list__(location_id=self.__location_id__, deal_type=deal_type_name, accommodation_type="flat",
+                                      rooms=rooms, rent_period_type=rent_period_type, additional_settings=band_settings)
+
+        return self.__crawl_by_price_bands__(build_url_list, "get_flats", {
+            "deal_type": deal_type, "rooms": rooms, "with_extra_data": with_extra_data, "with_json_state": with_json_state,
+        }, additional_settings, max_workers)
+
+    def get_suburban(self, suburban_type: str, deal_type: str, with_saving_csv=False, with_extra_data=False, additional_settings=None,
+                     with_json_state=False, with_incremental=False, return_format="dicts", with_saving_parquet=False):
         """
         Parse information of suburbans from cian website
         Examples:
@@ -133,29 +549,56 @@ class CianParser:
         :param suburban_type: type of suburban building, e.g. "house", "house-part", "land-plot", "townhouse"
         :param deal_type: type of deal, e.g. "rent_long", "rent_short", "sale"
         :param with_saving_csv: is it necessary to save data in csv, default False
+        :param with_saving_parquet: is it necessary to save data in typed dataset (see parquet_path of CianParser, requires pyarrow), default False
         :param with_extra_data:  is it necessary to collect additional data (but with increasing time duration), default False
         :param additional_settings:  additional settings such as min_price, sort_by and others, default None
+        :param with_json_state: is it necessary to take offers from the state embedded in pages (DOM is used as fallback), default False
+        :param with_incremental: is it necessary to collect only offers newer than the ones seen by the previous incremental crawl
+            of the same query (sort_by is forced to creation_data_from_newer_to_older), default False
+        :param return_format: "dicts", "records" or "columns", see get_flats, default "dicts"
         """
 
-        __validation_get_suburban__(suburban_type=suburban_type, deal_type=deal_type)
-        deal_type, rent_period_type = __define_deal_type__(deal_type)
-        self.__parser__ = SuburbanListPageParser(
-            session=self.__session__,
-            accommodation_type="suburban",
-            deal_type=deal_type,
-            rent_period_type=rent_period_type,
-            location_name=self.__location_name__,
-            with_saving_csv=with_saving_csv,
-            with_extra_data=with_extra_data,
-            additional_settings=additional_settings,
-            object_type=suburban_type,
-        )
-        self.__run__(
-            __build_url_list__(location_id=self.__location_id__, deal_type=deal_type, accommodation_type="suburban",
-                               rooms=None, rent_period_type=rent_period_type, suburban_type=suburban_type,
-                               additional_settings=additional_settings))
+        self.__run__(self.__prepare_suburban__(suburban_type, deal_type, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                                               return_format, with_saving_parquet))
         return self.__parser__.result
 
+    def iter_suburban(self, suburban_type: str, deal_type: str, with_saving_csv=False, with_extra_data=False, additional_settings=None,
+                      with_json_state=False, with_incremental=False, with_saving_parquet=False):
+        """
+        Same as get_suburban, but yields offers while collecting them instead of keeping all of them in memory
+        """
+
+        yield from self.__iter_offers__(self.__prepare_suburban__(suburban_type, deal_type, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                                                                  with_saving_parquet=with_saving_parquet))
+
+    async def aiter_suburban(self, suburban_type: str, deal_type: str, with_saving_csv=False, with_extra_data=False, additional_settings=None,
+                             with_json_state=False, with_incremental=False, with_saving_parquet=False):
+        """
+        Asynchronous version of iter_suburban
+        """
+
+        async for offer in self.__aiter_offers__(self.__prepare_suburban__(suburban_type, deal_type, with_saving_csv, with_extra_data, additional_settings, with_json_state, with_incremental,
+                                                                           with_saving_parquet=with_saving_parquet)):
+            yield offer
+
+    def get_suburban_by_price_bands(self, suburban_type: str, deal_type: str, with_extra_data=False, additional_settings=None,
+                                    with_json_state=False, max_workers=4):
+        """
+        Same as get_suburban, but the query is split into price bands, see get_flats_by_price_bands
+        """
+
+        __validation_get_suburban__(suburban_type=suburban_type, deal_type=deal_type)
+        deal_type_name, rent_period_type = __define_deal_type__(deal_type)
+
+        def build_url_list(band_settings):
+            return __build_url_list__(location_id=self.__location_id__, deal_type=deal_type_name, accommodation_type="suburban",
+                                      rooms=None, rent_period_type=rent_period_type, suburban_type=suburban_type,
+                                      additional_settings=band_settings)
+
+        return self.__crawl_by_price_bands__(build_url_list, "get_suburban", {
+            "suburban_type": suburban_type, "deal_type": deal_type, "with_extra_data": with_extra_data, "with_json_state": with_json_state,
+        }, additional_settings, max_workers)
+
     def get_newobjects(self, with_saving_csv=False):
         """
         Parse information of newobjects from cian website
@@ -165,27 +608,32 @@ class CianParser:
         :param with_saving_csv: is it necessary to save data in csv, default False
         """
 
-        self.__parser__ = NewObjectListParser(
-            session=self.__session__,
-            location_name=self.__location_name__,
-            with_saving_csv=with_saving_csv,
-        )
-        self.__run__(
-            __build_url_list__(location_id=self.__location_id__, deal_type="sale", accommodation_type="newobject"))
+        self.__run__(self.__prepare_newobjects__(with_saving_csv))
         return self.__parser__.result
 
+    def iter_newobjects(self, with_saving_csv=False):
+        """
+        Same as get_newobjects, but yields offers while collecting them instead of keeping all of them in memory
+        """
+
+        yield from self.__iter_offers__(self.__prepare_newobjects__(with_saving_csv))
 
-def __validation_init__(location):
-    location_id = None
-    for location_info in list_locations():
-        if location_info[0] == location:
-            location_id = location_info[1]
+    async def aiter_newobjects(self, with_saving_csv=False):
+        """
+        Asynchronous version of iter_newobjects
+        """
 
-    if location_id is None:
-        ValueError(f'You entered {location}, which is not exists in base.'
-                   f' See all available values of location in cianparser.list_locations()')
+        async for offer in self.__aiter_offers__(self.__prepare_newobjects__(with_saving_csv)):
+            yield offer
 
-    return location_id
+
+def __validation_init__(location):
+    found_location = define_location(location)
+    if found_location is None:
+        raise ValueError(f'You entered {location}, which is not exists in base.'
+                         f' See all available values of location in cianparser.list_locations()')
+
+    return found_location
 
 
 def __validation_get_flats__(deal_type, rooms):
@@ -229,6 +677,12 @@ def __validation_get_suburban__(suburban_type, deal_type):
                          f'Try entering one of these values: "rent_long", "sale".')
 
 
+def __validation_return_format__(return_format):
+    if return_format not in RETURN_FORMATS:
+        raise ValueError(f'You entered return_format={return_format}, which is not valid value. '
+                         f'Try entering one of these values: "dicts", "records", "columns".')
+
+
 def __build_url_list__(location_id, deal_type, accommodation_type, rooms=None, rent_period_type=None,
                        suburban_type=None, additional_settings=None):
     url_builder = URLBuilder(accommodation_type == "newobject")
@@ -0,0 +1,90 @@
+"""
+Extraction of phones from pages and descriptions of offers with normalisation to E.164 (+7XXXXXXXXXX).
+Only standard library is used, so the module is shared with the avito parser (parsers/avito/parser_cls.py), it is
+installed there with pip install --no-deps and copied alone to its docker image
+"""
+import re
+import unicodedata
+
+
+# digits written in other ways: circled, dingbats (other decimal digits, e.g. fullwidth, are matched by \d)
+__other_digits__ = "⓪①②③④⑤⑥⑦⑧⑨⓿❶❷❸❹❺❻❼❽❾➀➁➂➃➄➅➆➇➈➊➋➌➍➎➏➐➑➒"
+__digits_table__ = {ord(char): str(unicodedata.digit(char, 0)) for char in __other_digits__}
+__digits_table__.update({ord("O"): "0", ord("o"): "0", ord("О"): "0", ord("о"): "0"})
+
+__digit_class__ = "\\dOoОо" + __other_digits__
+# separators inside of number, including modifiers of emoji keycaps (e.g. 9️⃣)
+__separator_class__ = "\\s\\-–—().\ufe0f\u20e3"
+
+# one pass over the text: every alternative is tried at the same position, the first matched one wins
+__contacts_pattern__ = re.compile(
+    r'href="tel:(?P<tel>[+\d\s\-()]{10,20})"'
+    r'|"countryCode":\s*"(?P<country_code>\d{1,3})",\s*"number":\s*"(?P<number>\d{10})"'
+    rf'|(?P<text>(?<![\w+])\+?[{__digit_class__}][{__digit_class__}{__separator_class__}]{{8,40}}[{__digit_class__}](?!\w))'
+)
+
+
+def normalize_phone(phone):
+    """
+    :return: phone in E.164, e.g. "+79181234567", or None if it is not russian phone number
+    """
+
+    digits = "".join(str(unicodedata.digit(char)) for char in phone.translate(__digits_table__) if char.isdigit())
+    if len(digits) == 11 and digits[0] in "78":
+        return "+7" + digits[1:]
+    if len(digits) == 10 and digits[0] in "3489":
+        return "+7" + digits
+
+    return None
+
+
+def __iter_phones__(text):
+    """
+    (kind of match, phone) in order of appearance, kind is "number" (state of page), "tel" (link) or "text"
+    """
+
+    for match in __contacts_pattern__.finditer(text):
+        if match.group("number") is not None:
+            phone = normalize_phone(match.group("country_code") + match.group("number"))
+            kind = "number"
+        else:
+            kind = "tel" if match.group("tel") is not None else "text"
+            candidate = match.group(kind)
+            if sum(char.isdigit() for char in candidate) < 6:
+                continue
+            phone = normalize_phone(candidate)
+
+        if phone is not None:
+            yield kind, phone
+
+
+def extract_phones(text, limit=None):
+    """
+    Phones in order of appearance without duplicates. Runs in linear time of the length of text
+    :param text: html of page or text of description
+    :param limit: maximal count of returned phones, default None (all)
+    """
+
+    phones = []
+    for _, phone in __iter_phones__(text):
+        if phone not in phones:
+            phones.append(phone)
+            if limit is not None and len(phones) >= limit:
+                break
+
+    return phones
+
+
+def define_phone(text):
+    """
+    Phone of the offer, empty string if there is no phone. Phone of the state of page is preferred to tel links,
+    links are preferred to numbers in text (the site shows own phones in text too)
+    """
+
+    first_phones = dict()
+    for kind, phone in __iter_phones__(text):
+        if kind == "number":
+            return phone
+        first_phones.setdefault(kind, phone)
+
+    return first_phones.get("tel") or first_phones.get("text") or ""
@@ -1,38 +1,30 @@
-import time
-import requests
-from bs4 import BeautifulSoup
-import pymorphy2
-import collections
-import csv
-import cloudscraper
-
-ParseCityNames = collections.namedtuple(
-    'ParseResults',
-    {
-        'location_name',
-        'city_id',
-    }
-)
+from cianparser.html_backend import make_soup
+from cianparser.definers.discovery import DiscoveryRunner, define_morph_analyzer
 
 
 class Client:
-    def __init__(self, start_location_id=1, end_location_id=20):
-        self.session = cloudscraper.create_scraper()
-        self.session.headers = {'Accept-Language': 'en'}
+    def __init__(self, start_location_id=1, end_location_id=20, max_workers=4, min_interval=0.5, checkpoint_path=None):
+        """
+        :param max_workers: how many ids may be probing at the same time, default 4
+        :param min_interval: initial interval in seconds between two requests, default 0.5
+        :param checkpoint_path: file with already probed ids, the sweep with the same file continues from where it stopped,
+            default "cities_<start>_<end>.csv.checkpoint"
+        """
 
         self.cities = []
-        self.cities_set = set()
 
         self.start_location_id = start_location_id
         self.end_location_id = end_location_id
+        self.runner = DiscoveryRunner(output_path=f"cities_{start_location_id}_{end_location_id}.csv", checkpoint_path=checkpoint_path,
+                                      max_workers=max_workers, min_interval=min_interval)
 
     def define_city(self, html, location_id: int):
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         offers = soup.select("div[data-name='HeaderDefault']")
 
         if len(offers) == 0:
             print("_" + "  " + "***")
-            return self.cities
+            return None
 
         title = offers[0].text
         city = title.lower()[title.lower().find("снять квартиру в ") + len("снять квартиру в "):title.lower().find(
@@ -48,47 +40,26 @@ class Client:
                  "чувашии" in city)
         ):
             print("_" + "  " + str(location_id))
-            return self.cities
+            return None
 
-        morph = pymorphy2.MorphAnalyzer()
-        city = morph.parse(city)[0].normal_form.title()
+        city = define_morph_analyzer().parse(city)[0].normal_form.title()
         print(city + " " + str(location_id))
 
-        if city not in self.cities_set:
-            self.cities_set.add(city)
-            self.cities.append((city, location_id))
-            self.save_results()
-
-        return self.cities
+        return city, location_id
 
     def define_all_cities(self):
-        for location_id in range(self.start_location_id, self.end_location_id+1):
-            path = f'https://www.cian.ru/cat.php?deal_type=rent&engine_version=2&offer_type=flat&p=1&region={location_id}&type=4'
-            response = requests.get(path)
-            html = response.text
-            self.define_city(html, location_id)
-            time.sleep(2)
+        """
+        Found cities are appended to csv at once, of cities with the same name the one with the lowest id is kept
+        """
 
-        self.cities = sorted(self.cities, key=lambda x: x[0])
+        cities = self.runner.run(
+            ids=range(self.start_location_id, self.end_location_id + 1),
+            build_url=lambda location_id: f'https://www.cian.ru/cat.php?deal_type=rent&engine_version=2&offer_type=flat&p=1&region={location_id}&type=4',
+            define_row=self.define_city,
+            define_key=lambda city: city[0])
 
-    def save_results(self):
-        cities_result = []
-        cities_result.append(ParseCityNames(
-            location_name='location_name',
-            city_id='city_id',
-        ))
-
-        for city_couple in self.cities:
-            cities_result.append(ParseCityNames(
-                location_name=city_couple[0],
-                city_id=city_couple[1],
-            ))
-
-        path = f"cities_{self.start_location_id}_{self.end_location_id}.csv"
-        with open(path, "w") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-            for item in self.cities:
-                writer.writerow(item)
+        self.cities = sorted(cities, key=lambda x: x[0])
+        return self.cities
 
 
 if __name__ == '__main__':
@@ -1,38 +1,30 @@
-import time
-import requests
-from bs4 import BeautifulSoup
-import collections
-import csv
-import cloudscraper
-
-ParseMetroNames = collections.namedtuple(
-    'ParseResults',
-    {
-        'city',
-        'metro_name',
-        'metro_id',
-    }
-)
+from cianparser.html_backend import make_soup
+from cianparser.definers.discovery import DiscoveryRunner
 
 
 class Client:
-    def __init__(self, start_metro_id=1, end_metro_id=20):
-        self.session = cloudscraper.create_scraper()
-        self.session.headers = {'Accept-Language': 'en'}
+    def __init__(self, start_metro_id=1, end_metro_id=20, max_workers=4, min_interval=0.5, checkpoint_path=None):
+        """
+        :param max_workers: how many ids may be probing at the same time, default 4
+        :param min_interval: initial interval in seconds between two requests, default 0.5
+        :param checkpoint_path: file with already probed ids, the sweep with the same file continues from where it stopped,
+            default "metro_stations_<start>_<end>.csv.checkpoint"
+        """
 
         self.metro_stations = []
-        self.metro_set = set()
 
         self.start_metro_id = start_metro_id
         self.end_metro_id = end_metro_id
+        self.runner = DiscoveryRunner(output_path=f"metro_stations_{start_metro_id}_{end_metro_id}.csv", checkpoint_path=checkpoint_path,
+                                      max_workers=max_workers, min_interval=min_interval)
 
     def define_metro(self, html, metro_id: int):
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         offers = soup.select("div[data-name='GeneralInfoSectionRowComponent']")
 
         if len(offers) == 0:
             print("_" + "  " + "***")
-            return self.metro_stations
+            return None
 
         address = offers[1].text
 
@@ -63,42 +55,21 @@ class Client:
         metro = address[address.find(", м.") + len(", м. "):].split(", ")[0]
         print(f"{city}, {metro}, {str(metro_id)}")
 
-        if metro not in self.metro_set:
-            self.metro_set.add(metro)
-            self.metro_stations.append((city, metro, metro_id))
-            self.save_results()
-
-        return self.metro_stations
+        return city, metro, metro_id
 
     def define_all_metro_stations(self):
-        for metro_id in range(self.start_metro_id, self.end_metro_id+1):
-            path = f'https://www.cian.ru/cat.php?deal_type=rent&engine_version=2&offer_type=flat&p=1&region=1&type=4&metro[0]={metro_id}'
-            response = requests.get(path)
-            html = response.text
-            self.define_metro(html, metro_id)
-            time.sleep(2)
-
-        self.metro_stations = sorted(self.metro_stations, key=lambda x: x[0])
-
-    def save_results(self):
-        metro_stations_result = [ParseMetroNames(
-            city='city',
-            metro_name='metro_name',
-            metro_id='metro_id',
-        )]
-
-        for metro_couple in self.metro_stations:
-            metro_stations_result.append(ParseMetroNames(
-                city=metro_couple[0],
-                metro_name=metro_couple[1],
-                metro_id=metro_couple[2],
-            ))
-
-        path = f"metro_stations_{self.start_metro_id}_{self.end_metro_id}.csv"
-        with open(path, "w") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-            for item in self.metro_stations:
-                writer.writerow(item)
+        """
+        Found stations are appended to csv at once, of stations with the same name the one with the lowest id is kept
+        """
+
+        metro_stations = self.runner.run(
+            ids=range(self.start_metro_id, self.end_metro_id + 1),
+            build_url=lambda metro_id: f'https://www.cian.ru/cat.php?deal_type=rent&engine_version=2&offer_type=flat&p=1&region=1&type=4&metro[0]={metro_id}',
+            define_row=self.define_metro,
+            define_key=lambda metro_station: metro_station[1])
+
+        self.metro_stations = sorted(metro_stations, key=lambda x: x[0])
+        return self.metro_stations
 
 
 if __name__ == '__main__':
@@ -0,0 +1,132 @@
+import csv
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cloudscraper
+
+from cianparser.scheduler import RequestScheduler, is_captcha_response
+from cianparser.throttle import HostThrottle
+
+__morph_analyzer__ = None
+__morph_analyzer_lock__ = threading.Lock()
+
+
+def define_morph_analyzer():
+    """
+    One pymorphy2.MorphAnalyzer per process, its dictionaries are loaded once
+    """
+
+    global __morph_analyzer__
+    with __morph_analyzer_lock__:
+        if __morph_analyzer__ is None:
+            import pymorphy2
+            __morph_analyzer__ = pymorphy2.MorphAnalyzer()
+
+    return __morph_analyzer__
+
+
+class DiscoveryRunner:
+    def __init__(self, output_path, checkpoint_path=None, max_workers=4, min_interval=0.5, timeout=15):
+        """
+        Concurrent sweep over ids: pages are loaded by pool of workers under the common rate limit of the host,
+        found rows are appended to csv at once, every done id is appended to checkpoint, so interrupted sweep
+        continues from where it stopped. At the end of sweep csv is rewritten without duplicates in order of ids
+        :param output_path: path of csv with found rows, the last column of row is its id
+        :param checkpoint_path: path of file with done ids, default output_path + ".checkpoint"
+        :param int max_workers: how many pages may be loading at the same time, default 4
+        :param min_interval: initial interval in seconds between two requests, it adapts as in HostThrottle, default 0.5
+        :param timeout: timeout in seconds of one attempt of request, default 15
+        """
+
+        self.output_path = output_path
+        self.checkpoint_path = f"{output_path}.checkpoint" if checkpoint_path is None else checkpoint_path
+        self.max_workers = max_workers
+
+        session = cloudscraper.create_scraper()
+        session.headers = {'Accept-Language': 'en'}
+        self.scheduler = RequestScheduler(session=session, throttle=HostThrottle(min_interval=min_interval), timeout=timeout)
+
+        self.__lock__ = threading.Lock()
+        self.__done_ids__ = self.__load_done_ids__()
+        self.__rows__ = self.__load_rows__()
+
+    def __load_done_ids__(self):
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+
+        with open(self.checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+            return {int(line) for line in checkpoint_file if line.strip() != ""}
+
+    def __load_rows__(self):
+        if not os.path.exists(self.output_path):
+            return []
+
+        with open(self.output_path, "r", newline="", encoding="utf-8") as output_file:
+            return [tuple(row[:-1]) + (int(row[-1]),) for row in csv.reader(output_file) if len(row) != 0]
+
+    def get_rows(self):
+        with self.__lock__:
+            return list(self.__rows__)
+
+    def __append__(self, row, item_id):
+        with self.__lock__:
+            if row is not None:
+                self.__rows__.append(row)
+                with open(self.output_path, "a", newline="", encoding="utf-8") as output_file:
+                    csv.writer(output_file, quoting=csv.QUOTE_MINIMAL).writerow(row)
+
+            self.__done_ids__.add(item_id)
+            with open(self.checkpoint_path, "a", encoding="utf-8") as checkpoint_file:
+                checkpoint_file.write(f"{item_id}\n")
+
+    def __remove_duplicates__(self, define_key):
+        """
+        Of rows with the same key the one with the lowest id is kept, so the result does not depend on the order
+        in which workers have finished
+        """
+
+        with self.__lock__:
+            rows = dict()
+            for row in sorted(self.__rows__, key=lambda row: row[-1]):
+                rows.setdefault(define_key(row), row)
+            self.__rows__ = list(rows.values())
+
+            tmp_path = f"{self.output_path}.tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as output_file:
+                csv.writer(output_file, quoting=csv.QUOTE_MINIMAL).writerows(self.__rows__)
+            os.replace(tmp_path, self.output_path)
+
+    def run(self, ids, build_url, define_row, define_key=None):
+        """
+        :param ids: ids to sweep, ids from checkpoint are skipped
+        :param build_url: build_url(id) -> url of page to probe
+        :param define_row: define_row(html, id) -> tuple of row ending with id or None if nothing is found, pages with
+            CAPTCHA are not passed to it and their ids are left for the next run
+        :param define_key: define_key(row) -> key of row, of rows with the same key only the one with the lowest id is kept,
+            default the whole row
+        :return: all rows of output including ones found by previous runs, in order of ids
+        """
+
+        define_key = (lambda row: row) if define_key is None else define_key
+
+        def probe(item_id):
+            try:
+                url = build_url(item_id)
+                res = self.scheduler.get(url)
+                res.raise_for_status()
+                if is_captcha_response(res):
+                    raise ValueError(f"there is CAPTCHA on {url}")
+                row = define_row(res.text, item_id)
+            except Exception as e:
+                print(f"{item_id}: {e}... it is left for the next run")
+                return
+            self.__append__(row, item_id)
+
+        pending_ids = [item_id for item_id in ids if item_id not in self.__done_ids__]
+        print(f"{len(pending_ids)} ids to probe, {len(self.__done_ids__)} are already done")
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            list(executor.map(probe, pending_ids))
+
+        self.__remove_duplicates__(define_key)
+        return self.get_rows()
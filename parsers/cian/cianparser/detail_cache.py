@@ -0,0 +1,80 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+def define_card_fingerprint(*card_dicts):
+    """
+    Hash of the fields shown in the card of list, if it is the same the page of offer most likely has not changed
+    """
+
+    card_data = dict()
+    for card_dict in card_dicts:
+        card_data.update(card_dict)
+
+    return hashlib.sha1(json.dumps(card_data, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+class DetailCache:
+    def __init__(self, file_path="cian_detail_cache.sqlite", ttl=7 * 24 * 3600, max_entries=100000, evict_every=100):
+        """
+        Persistent cache of parsed pages of separate offers, the entry is valid while the card of the offer is the same
+        Examples:
+            >>> parser = cianparser.CianParser(location="Краснодар", detail_cache=DetailCache("details.sqlite", ttl=3 * 24 * 3600))
+        :param file_path: path of the sqlite database, default "cian_detail_cache.sqlite"
+        :param ttl: lifetime of the entry in seconds, default 7 days
+        :param int max_entries: the least recently used entries above this count are evicted, default 100000
+        :param int evict_every: how many writes are done between two evictions, default 100
+        """
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.count_of_hits = 0
+        self.count_of_misses = 0
+
+        self.__lock__ = threading.Lock()
+        self.__count_of_writes__ = 0
+        self.__connection__ = sqlite3.connect(str(file_path), check_same_thread=False)
+        self.__connection__.execute("CREATE TABLE IF NOT EXISTS details ("
+                                    "offer_id TEXT PRIMARY KEY, fingerprint TEXT, page_data TEXT, created_at REAL, accessed_at REAL)")
+        self.__connection__.execute("CREATE INDEX IF NOT EXISTS details_accessed_at ON details (accessed_at)")
+        self.__connection__.commit()
+
+    def get(self, offer_id, fingerprint):
+        now = time.time()
+        with self.__lock__:
+            row = self.__connection__.execute("SELECT fingerprint, page_data, created_at FROM details WHERE offer_id = ?", (offer_id,)).fetchone()
+            if row is None or row[0] != fingerprint or now - row[2] > self.ttl:
+                self.count_of_misses += 1
+                return None
+
+            self.__connection__.execute("UPDATE details SET accessed_at = ? WHERE offer_id = ?", (now, offer_id))
+            self.count_of_hits += 1
+            return json.loads(row[1])
+
+    def set(self, offer_id, fingerprint, page_data):
+        now = time.time()
+        with self.__lock__:
+            self.__connection__.execute("INSERT OR REPLACE INTO details (offer_id, fingerprint, page_data, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                                        (offer_id, fingerprint, json.dumps(page_data, ensure_ascii=False, default=str), now, now))
+            self.__count_of_writes__ += 1
+            if self.__count_of_writes__ >= self.evict_every:
+                self.__evict__(now)
+
+    def __evict__(self, now):
+        self.__connection__.execute("DELETE FROM details WHERE created_at < ?", (now - self.ttl,))
+        self.__connection__.execute("DELETE FROM details WHERE offer_id IN ("
+                                    "SELECT offer_id FROM details ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+        self.__connection__.commit()
+        self.__count_of_writes__ = 0
+
+    def flush(self):
+        with self.__lock__:
+            self.__evict__(time.time())
+
+    def close(self):
+        self.flush()
+        self.__connection__.close()
@@ -0,0 +1,67 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from cianparser.helpers import define_deal_url_id
+
+
+class DetailEnricher:
+    def __init__(self, session, page_parser_class, max_workers=4, page_parser_kwargs=None, detail_cache=None):
+        """
+        Load and parse pages of separate offers in a bounded pool of worker threads
+        :param session: RequestScheduler of the list parser, shared by all workers, so pages of offers are loaded
+        within the same rate budget of the host as pages with list of offers
+        :param page_parser_class: FlatPageParser, SuburbanPageParser or NewObjectPageParser
+        :param int max_workers: how many pages of offers may be loading at the same time
+        :param dict page_parser_kwargs: additional arguments of page_parser_class, default None
+        :param detail_cache: DetailCache, pages of offers with unchanged card are taken from it instead of loading, default None
+        """
+
+        self.session = session
+        self.page_parser_class = page_parser_class
+        self.page_parser_kwargs = dict() if page_parser_kwargs is None else page_parser_kwargs
+        self.detail_cache = detail_cache
+        self.__cache_suffix__ = json.dumps([page_parser_class.__name__, self.page_parser_kwargs], sort_keys=True)
+        self.__executor__ = ThreadPoolExecutor(max_workers=max_workers)
+        self.__pending__ = []
+
+    def __load_page_data__(self, url, fingerprint):
+        """
+        Page parsers raise on captcha and on failed load, so only really parsed pages get into detail cache
+        """
+
+        if self.detail_cache is None or fingerprint is None:
+            return self.page_parser_class(session=self.session, url=url, **self.page_parser_kwargs).parse_page()
+
+        offer_id, fingerprint = define_deal_url_id(url), f"{fingerprint}:{self.__cache_suffix__}"
+        page_data = self.detail_cache.get(offer_id, fingerprint)
+        if page_data is None:
+            page_data = self.page_parser_class(session=self.session, url=url, **self.page_parser_kwargs).parse_page()
+            self.detail_cache.set(offer_id, fingerprint, page_data)
+
+        return page_data
+
+    def submit(self, url, merge, fingerprint=None):
+        """
+        Queue the page of offer, merge(page_data) is called from join() in order of submission
+        :param fingerprint: hash of the card of offer, the page is cached by it (with detail_cache), default None
+        """
+
+        self.__pending__.append((url, merge, self.__executor__.submit(self.__load_page_data__, url, fingerprint)))
+
+    def join(self):
+        pending, self.__pending__ = self.__pending__, []
+        for url, merge, future in pending:
+            try:
+                page_data = future.result()
+            except Exception as e:
+                print(f"\nFailed to collect extra data from {url}: {e}")
+                page_data = dict()
+            merge(page_data)
+
+        return len(pending)
+
+    def close(self):
+        self.join()
+        self.__executor__.shutdown(wait=True)
+        if self.detail_cache is not None:
+            self.detail_cache.flush()
@@ -0,0 +1,110 @@
+import asyncio
+import collections
+import inspect
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncListPageFetcher:
+    def __init__(self, max_concurrent_pages=4, max_attempts=3):
+        """
+        Fetch pages with list of offers concurrently and hand them to the parser in order of page numbers
+        :param int max_concurrent_pages: how many pages may be loading at the same time
+        :param int max_attempts: how many times a page is requested before it is skipped
+        """
+
+        self.max_concurrent_pages = max_concurrent_pages
+        self.max_attempts = max_attempts
+
+    def run(self, load_page, handle_page, page_numbers):
+        """
+        Blocking entry point, see crawl(). It starts own event loop, so it can not be called from a coroutine
+        (e.g. in jupyter or in async application), await crawl() there instead
+        """
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.crawl(load_page=load_page, handle_page=handle_page, page_numbers=page_numbers))
+
+        raise RuntimeError("AsyncListPageFetcher.run() is called inside of running event loop, await crawl() instead")
+
+    async def crawl(self, load_page, handle_page, page_numbers):
+        """
+        Up to max_concurrent_pages pages are loading at the same time, but they are handed to the parser in order
+        of page numbers, so when handle_page stops the crawl (captcha, watermark of incremental crawl) all previous
+        pages have been parsed and no later page has been
+        :param load_page: blocking callable (page_number, attempt_number) -> html, executed in worker threads
+        :param handle_page: callable or coroutine function (html, page_number, attempt_number) -> (page_parsed, end_all_parsing),
+            executed in the event loop thread, so pages are parsed one by one
+        :param page_numbers: iterable of page numbers to crawl
+        :return: numbers of pages which have not been parsed: skipped after max_attempts or the page which stopped the crawl
+        """
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_pages)
+
+        async def fetch(page_number, attempt_number):
+            try:
+                html = await loop.run_in_executor(executor, load_page, page_number, attempt_number)
+            except Exception as e:
+                return page_number, attempt_number, None, e
+            return page_number, attempt_number, html, None
+
+        pages = iter(page_numbers)
+        order = collections.deque()
+        pending = set()
+        for page_number in itertools.islice(pages, self.max_concurrent_pages):
+            order.append(page_number)
+            pending.add(asyncio.ensure_future(fetch(page_number, 0)))
+
+        loaded = dict()
+        failed_pages = []
+        end_all_parsing = False
+        try:
+            while pending and not end_all_parsing:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page_number, attempt_number, html, exception = task.result()
+                    loaded[page_number] = (attempt_number, html, exception)
+
+                # the first page in order which is not finished yet holds later loaded pages
+                while order and order[0] in loaded and not end_all_parsing:
+                    page_number = order[0]
+                    attempt_number, html, exception = loaded.pop(page_number)
+                    page_parsed = False
+                    if exception is None:
+                        try:
+                            handled = handle_page(html, page_number, attempt_number)
+                            if inspect.isawaitable(handled):
+                                handled = await handled
+                            page_parsed, end_all_parsing = handled
+                        except Exception as e:
+                            exception = e
+
+                    if end_all_parsing:
+                        if not page_parsed:
+                            failed_pages.append(page_number)
+                        break
+
+                    if page_parsed or attempt_number + 1 >= self.max_attempts:
+                        if not page_parsed:
+                            failed_pages.append(page_number)
+                        if not page_parsed and exception is not None:
+                            print(f"\n\nException: {exception}")
+                            print(f"The collection of information from {page_number} page is skipped...\n")
+                        order.popleft()
+                        next_page_number = next(pages, None)
+                        if next_page_number is not None:
+                            order.append(next_page_number)
+                            pending.add(asyncio.ensure_future(fetch(next_page_number, 0)))
+                    else:
+                        pending.add(asyncio.ensure_future(fetch(page_number, attempt_number + 1)))
+        finally:
+            # queued loads are cancelled, running ones can not be interrupted in their threads, so they are drained:
+            # no request of the crawl is left running in the background after it returns
+            executor.shutdown(wait=False, cancel_futures=True)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return failed_pages
@@ -1,33 +1,43 @@
-import bs4
-import time
 import pathlib
 from datetime import datetime
-from transliterate import translit
 
+from cianparser.html_backend import make_soup, is_captcha
+from cianparser.json_state import define_list_offers_state, define_json_url, define_json_author, define_json_location_data, define_json_price_data, define_json_specification_data, define_json_extra_data
 from cianparser.constants import FILE_NAME_FLAT_FORMAT
-from cianparser.helpers import union_dicts, define_author, define_location_data, define_specification_data, define_deal_url_id, define_price_data
+from cianparser.helpers import union_dicts, define_card_data, define_deal_url_id
+from cianparser.photos import define_card_photos
 from cianparser.flat.page import FlatPageParser
 from cianparser.base_list import BaseListPageParser
 
 
 class FlatListPageParser(BaseListPageParser):
+    page_parser_class = FlatPageParser
+
     def build_file_path(self):
         now_time = datetime.now().strftime("%d_%b_%Y_%H_%M_%S_%f")
+        from transliterate import translit
+
         file_name = FILE_NAME_FLAT_FORMAT.format(self.accommodation_type, self.deal_type, self.start_page, self.end_page, translit(self.location_name.lower(), reversed=True), now_time)
         return pathlib.Path(pathlib.Path.cwd(), file_name.replace("'", ""))
 
     def parse_list_offers_page(self, html, page_number: int, count_of_pages: int, attempt_number: int):
-        list_soup = bs4.BeautifulSoup(html, 'html.parser')
+        offers = define_list_offers_state(html) if self.with_json_state else None
+        parse_offer = self.parse_json_offer
+
+        if offers is None:
+            if is_captcha(html):
+                print(f"\r{page_number} page: there is CAPTCHA... failed to parse page...")
+                return False, attempt_number + 1, True
 
-        if list_soup.text.find("Captcha") > 0:
-            print(f"\r{page_number} page: there is CAPTCHA... failed to parse page...")
-            return False, attempt_number + 1, True
+            list_soup = make_soup(html)
 
-        header = list_soup.select("div[data-name='HeaderDefault']")
-        if len(header) == 0:
-            return False, attempt_number + 1, False
+            header = list_soup.select("div[data-name='HeaderDefault']")
+            if len(header) == 0:
+                return False, attempt_number + 1, False
+
+            offers = list_soup.select("article[data-name='CardComponent']")
+            parse_offer = self.parse_offer
 
-        offers = list_soup.select("article[data-name='CardComponent']")
         print("")
         print(f"\r {page_number} page: {len(offers)} offers", end="\r", flush=True)
 
@@ -35,38 +45,64 @@ class FlatListPageParser(BaseListPageParser):
             print(f"Collecting information from pages with list of offers", end="\n")
 
         for ind, offer in enumerate(offers):
-            self.parse_offer(offer=offer)
+            parse_offer(offer=offer)
             self.print_parse_progress(page_number=page_number, count_of_pages=count_of_pages, offers=offers, ind=ind)
 
-        time.sleep(2)
+        self.finish_page()
+
+        if self.is_watermark_reached(count_of_offers=len(offers)):
+            print(f"\n{page_number} page: there are only already seen offers... stop collecting...")
+            return True, 0, True
 
         return True, 0, False
 
     def parse_offer(self, offer):
+        url, author_data, location_data, price_data, specification_data = define_card_data(block=offer, is_sale=self.is_sale())
+
         common_data = dict()
-        common_data["url"] = offer.select("div[data-name='LinkArea']")[0].select("a")[0].get('href')
+        common_data["url"] = url
         common_data["location"] = self.location_name
         common_data["deal_type"] = self.deal_type
         common_data["accommodation_type"] = self.accommodation_type
+        is_fresh = self.check_freshness(url=common_data["url"])
 
-        author_data = define_author(block=offer)
-        location_data = define_location_data(block=offer, is_sale=self.is_sale())
-        price_data = define_price_data(block=offer)
-        specification_data = define_specification_data(block=offer)
-
-        if define_deal_url_id(common_data["url"]) in self.result_set:
+        if not is_fresh or define_deal_url_id(common_data["url"]) in self.result_set or self.check_seen_offer(common_data["url"], price_data):
             return
 
-        page_data = dict()
-        if self.with_extra_data:
-            flat_parser = FlatPageParser(session=self.session, url=common_data["url"])
-            page_data = flat_parser.parse_page()
-            time.sleep(4)
+        if self.photo_pipeline is not None:
+            common_data["photos"] = define_card_photos(offer)
 
         self.count_parsed_offers += 1
         self.define_average_price(price_data=price_data)
         self.result_set.add(define_deal_url_id(common_data["url"]))
-        self.result.append(union_dicts(author_data, common_data, specification_data, price_data, page_data, location_data))
+        self.append_offer(
+            url=common_data["url"],
+            build_offer=lambda page_data: union_dicts(author_data, common_data, specification_data, price_data, page_data, location_data),
+            card_dicts=(author_data, specification_data, price_data, location_data))
 
-        if self.with_saving_csv:
-            self.save_results()
+    def parse_json_offer(self, offer):
+        common_data = dict()
+        common_data["url"] = define_json_url(offer, deal_type=self.deal_type, accommodation_type=self.accommodation_type)
+        if common_data["url"] == "":
+            return
+        common_data["location"] = self.location_name
+        common_data["deal_type"] = self.deal_type
+        common_data["accommodation_type"] = self.accommodation_type
+
+        author_data = define_json_author(offer)
+        location_data = define_json_location_data(offer, is_sale=self.is_sale())
+        price_data = define_json_price_data(offer)
+        specification_data = define_json_specification_data(offer)
+        extra_data = define_json_extra_data(offer)
+        is_fresh = self.check_freshness(url=common_data["url"], published_at=extra_data["published_at"])
+
+        if not is_fresh or define_deal_url_id(common_data["url"]) in self.result_set or self.check_seen_offer(common_data["url"], price_data):
+            return
+
+        self.count_parsed_offers += 1
+        self.define_average_price(price_data=price_data)
+        self.result_set.add(define_deal_url_id(common_data["url"]))
+        self.append_offer(
+            url=common_data["url"],
+            build_offer=lambda page_data: union_dicts(author_data, common_data, specification_data, price_data, page_data, location_data, extra_data),
+            card_dicts=(author_data, specification_data, price_data, location_data))
@@ -1,6 +1,7 @@
 import re
 import itertools
-from cianparser.constants import STREET_TYPES, NOT_STREET_ADDRESS_ELEMENTS, FLOATS_NUMBERS_REG_EXPRESSION
+
+from cianparser.constants import STREET_TYPES, NOT_STREET_ADDRESS_ELEMENTS, FLOATS_NUMBERS_REG_EXPRESSION, AUTHOR_TYPES
 
 
 def union_dicts(*dicts):
@@ -28,67 +29,71 @@ def define_deal_url_id(url: str):
     url_path_elements = url.split("/")
     if len(url_path_elements[-1]) > 3:
         return url_path_elements[-1]
-    if len(url_path_elements[-2]) > 3:
+    if len(url_path_elements) > 1 and len(url_path_elements[-2]) > 3:
         return url_path_elements[-2]
 
     return "-1"
 
 
-def define_author(block):
-    spans = block.select("div")[0].select("span")
+def define_card_blocks(block):
+    """
+    Sub-blocks of the card of offer which are needed by define_* helpers, they are located once per card
+    """
+
+    link_area = block.select_one("div[data-name='LinkArea']")
+    return {
+        "author_spans": block.select_one("div").select("span"),
+        "link_area": link_area,
+        "rows": link_area.select("div[data-name='GeneralInfoSectionRowComponent']"),
+    }
+
+
+def define_author(block, spans=None):
+    """
+    One pass over spans: the label of author is a direct text of span, it is looked up in AUTHOR_TYPES,
+    the type with the highest priority wins as if the types were searched one by one
+    """
+
+    from bs4.element import NavigableString
+
+    if spans is None:
+        spans = block.select("div")[0].select("span")
 
     author_data = {
         "author": "",
         "author_type": "",
     }
 
+    best_priority, best_index, best_author_type, id_index = len(AUTHOR_TYPES), -1, "", -1
     for index, span in enumerate(spans):
-        if "Агентство недвижимости" in span:
-            author_data["author"] = spans[index + 1].text.replace(",", ".").strip()
-            author_data["author_type"] = "real_estate_agent"
-            return author_data
-
-    for index, span in enumerate(spans):
-        if "Собственник" in span:
-            author_data["author"] = spans[index + 1].text
-            author_data["author_type"] = "homeowner"
-            return author_data
-
-    for index, span in enumerate(spans):
-        if "Риелтор" in span:
-            author_data["author"] = spans[index + 1].text
-            author_data["author_type"] = "realtor"
-            return author_data
+        for child in span.contents:
+            if isinstance(child, NavigableString) and child in AUTHOR_TYPES:
+                priority, author_type = AUTHOR_TYPES[child]
+                if priority < best_priority:
+                    best_priority, best_index, best_author_type = priority, index, author_type
 
-    for index, span in enumerate(spans):
-        if "Ук・оф.Представитель" in span:
-            author_data["author"] = spans[index + 1].text
-            author_data["author_type"] = "official_representative"
-            return author_data
+        if best_priority == 0:
+            break
 
-    for index, span in enumerate(spans):
-        if "Представитель застройщика" in span:
-            author_data["author"] = spans[index + 1].text
-            author_data["author_type"] = "representative_developer"
-            return author_data
+        if id_index == -1 and "ID" in span.text:
+            id_index = index
 
-    for index, span in enumerate(spans):
-        if "Застройщик" in span:
-            author_data["author"] = spans[index + 1].text
-            author_data["author_type"] = "developer"
-            return author_data
+    if best_index != -1:
+        author_data["author"] = spans[best_index + 1].text
+        author_data["author_type"] = best_author_type
+        if best_author_type == "real_estate_agent":
+            author_data["author"] = author_data["author"].replace(",", ".").strip()
+        return author_data
 
-    for index, span in enumerate(spans):
-        if "ID" in span.text:
-            author_data["author"] = span.text
-            author_data["author_type"] = "unknown"
-            return author_data
+    if id_index != -1:
+        author_data["author"] = spans[id_index].text
+        author_data["author_type"] = "unknown"
 
     return author_data
 
 
-def parse_location_data(block):
-    general_info_sections = block.select_one("div[data-name='LinkArea']").select("div[data-name='GeneralInfoSectionRowComponent']")
+def parse_location_data(block, rows=None):
+    general_info_sections = block.select_one("div[data-name='LinkArea']").select("div[data-name='GeneralInfoSectionRowComponent']") if rows is None else rows
 
     location_data = dict()
     location_data["district"] = ""
@@ -118,8 +123,10 @@ def parse_location_data(block):
     return location_data
 
 
-def define_location_data(block, is_sale):
-    elements = block.select_one("div[data-name='LinkArea']").select("div[data-name='GeneralInfoSectionRowComponent']")
+def define_location_data(block, is_sale, rows=None):
+    if rows is None:
+        rows = block.select_one("div[data-name='LinkArea']").select("div[data-name='GeneralInfoSectionRowComponent']")
+    elements = [row.text for row in rows]
 
     location_data = dict()
     location_data["district"] = ""
@@ -131,19 +138,19 @@ def define_location_data(block, is_sale):
         location_data["residential_complex"] = ""
 
     for index, element in enumerate(elements):
-        if ("ЖК" in element.text) and ("«" in element.text) and ("»" in element.text):
-            location_data["residential_complex"] = element.text.split("«")[1].split("»")[0]
+        if ("ЖК" in element) and ("«" in element) and ("»" in element):
+            location_data["residential_complex"] = element.split("«")[1].split("»")[0]
 
-        if "р-н" in element.text and len(element.text) < 250:
-            address_elements = element.text.split(",")
+        if "р-н" in element and len(element) < 250:
+            address_elements = element.split(",")
             if len(address_elements) < 2:
                 continue
 
             if "ЖК" in address_elements[0] and "«" in address_elements[0] and "»" in address_elements[0]:
                 location_data["residential_complex"] = address_elements[0].split("«")[1].split("»")[0]
 
-            if ", м. " in element.text:
-                location_data["underground"] = element.text.split(", м. ")[1]
+            if ", м. " in element:
+                location_data["underground"] = element.split(", м. ")[1]
                 if "," in location_data["underground"]:
                     location_data["underground"] = location_data["underground"].split(",")[0]
 
@@ -194,12 +201,12 @@ def define_location_data(block, is_sale):
 
     if location_data["district"] == "":
         for index, element in enumerate(elements):
-            if ", м. " in element.text and len(element.text) < 250:
-                location_data["underground"] = element.text.split(", м. ")[1]
+            if ", м. " in element and len(element) < 250:
+                location_data["underground"] = element.split(", м. ")[1]
                 if "," in location_data["underground"]:
                     location_data["underground"] = location_data["underground"].split(",")[0]
 
-                address_elements = element.text.split(",")
+                address_elements = element.split(",")
 
                 if len(address_elements) < 2:
                     continue
@@ -231,8 +238,8 @@ def define_location_data(block, is_sale):
                         return location_data
 
             for street_type in STREET_TYPES:
-                if (", " + street_type + " " in element.text) or (" " + street_type + ", " in element.text):
-                    address_elements = element.text.split(",")
+                if (", " + street_type + " " in element) or (" " + street_type + ", " in element):
+                    address_elements = element.split(",")
 
                     if len(address_elements) < 3:
                         continue
@@ -265,9 +272,10 @@ def define_location_data(block, is_sale):
     return location_data
 
 
-def define_price_data(block):
-    elements = block.select("div[data-name='LinkArea']")[0]. \
-        select("span[data-mark='MainPrice']")
+def define_price_data(block, link_area=None):
+    if link_area is None:
+        link_area = block.select("div[data-name='LinkArea']")[0]
+    elements = link_area.select("span[data-mark='MainPrice']")
 
     price_data = {
         "price_per_month": -1,
@@ -295,18 +303,18 @@ def define_price_data(block):
     return price_data
 
 
-def define_specification_data(block):
+def define_specification_data(block, rows=None):
     specification_data = dict()
     specification_data["floor"] = -1
     specification_data["floors_count"] = -1
     specification_data["rooms_count"] = -1
     specification_data["total_meters"] = -1
 
-    title = block.select("div[data-name='LinkArea']")[0].select("div[data-name='GeneralInfoSectionRowComponent']")[
-        0].text
+    if rows is None:
+        rows = block.select("div[data-name='LinkArea']")[0].select("div[data-name='GeneralInfoSectionRowComponent']")
 
-    common_properties = block.select("div[data-name='LinkArea']")[0]. \
-        select("div[data-name='GeneralInfoSectionRowComponent']")[0].text
+    title = rows[0].text
+    common_properties = title
 
     if common_properties.find("м²") is not None:
         total_meters = title[: common_properties.find("м²")].replace(",", ".")
@@ -330,3 +338,24 @@ def define_specification_data(block):
     specification_data["rooms_count"] = define_rooms_count(common_properties)
 
     return specification_data
+
+
+def define_card_data(block, is_sale, with_geo_labels=False, with_specification=True):
+    """
+    All fields of the card of list in one traversal: sub-blocks are located once and shared by the helpers
+    :param with_geo_labels: location is taken from geo labels (suburban) instead of the address row (flat), default False
+    :param with_specification: is it necessary to define floor, rooms and meters, default True
+    :return: url, author_data, location_data, price_data, specification_data (None without with_specification)
+    """
+
+    blocks = define_card_blocks(block)
+    url = blocks["link_area"].select_one("a").get('href')
+    author_data = define_author(block, spans=blocks["author_spans"])
+    if with_geo_labels:
+        location_data = parse_location_data(block, rows=blocks["rows"])
+    else:
+        location_data = define_location_data(block, is_sale=is_sale, rows=blocks["rows"])
+    price_data = define_price_data(block, link_area=blocks["link_area"])
+    specification_data = define_specification_data(block, rows=blocks["rows"]) if with_specification else None
+
+    return url, author_data, location_data, price_data, specification_data
@@ -0,0 +1,56 @@
+LXML_BACKEND = "lxml"
+HTML_PARSER_BACKEND = "html.parser"
+
+__backend__ = None
+
+
+def available_backends():
+    backends = [HTML_PARSER_BACKEND]
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return backends
+
+    return backends + [LXML_BACKEND]
+
+
+def get_backend():
+    global __backend__
+    if __backend__ is None:
+        __backend__ = available_backends()[0]
+
+    return __backend__
+
+
+def set_backend(backend):
+    """
+    Choose the tree builder of bs4 used by all parsers of pages. Trees are selected by bs4 in both cases,
+    so whether lxml speeds up parsing depends on pages, measure it by benchmarks/html_backend.py
+    Examples:
+        >>> cianparser.html_backend.set_backend("lxml")
+    :param str backend: "html.parser" (default) or "lxml" (when it is installed)
+    """
+
+    global __backend__
+    if backend not in available_backends():
+        raise ValueError(f'You entered backend={backend}, which is not available. '
+                         f'Try entering one of these values: {", ".join(available_backends())}.')
+
+    __backend__ = backend
+
+
+def make_soup(html):
+    import bs4
+
+    return bs4.BeautifulSoup(html, get_backend())
+
+
+def is_captcha(html):
+    """
+    Search of CAPTCHA in raw page, so no tree is built for it
+    :param html: str or bytes of page
+    """
+
+    if isinstance(html, bytes):
+        return html.find(b"Captcha") > 0
+    return html.find("Captcha") > 0
@@ -0,0 +1,213 @@
+import json
+from datetime import datetime, timezone
+
+SERP_APP_NAME = "frontend-serp"
+OFFER_CARD_APP_NAME = "frontend-offer-card"
+CONFIG_MARKER = "window._cianConfig['{}']"
+
+__decoder__ = json.JSONDecoder()
+
+
+def extract_config_state(html: str, app_name: str):
+    """
+    Decode the state which the page ships in window._cianConfig[app_name] = (...).concat([{"key": ..., "value": ...}])
+    :return: dict of key -> value or None if the page has no such state
+    """
+
+    marker = CONFIG_MARKER.format(app_name)
+    state = dict()
+    position = html.find(marker)
+    while position != -1:
+        concat_position = html.find(".concat(", position)
+        next_position = html.find(marker, position + len(marker))
+        if concat_position == -1:
+            break
+
+        if next_position == -1 or concat_position < next_position:
+            try:
+                items, _ = __decoder__.raw_decode(html, concat_position + len(".concat("))
+            except ValueError:
+                items = []
+
+            for item in items:
+                if isinstance(item, dict) and "key" in item:
+                    state[item["key"]] = item.get("value")
+
+        position = next_position
+
+    return state if len(state) != 0 else None
+
+
+def define_list_offers_state(html: str):
+    state = extract_config_state(html, SERP_APP_NAME)
+    if state is None:
+        return None
+
+    results = (state.get("initialState") or dict()).get("results") or dict()
+    offers = results.get("offers")
+    return offers if isinstance(offers, list) and len(offers) != 0 else None
+
+
+def define_list_offers_count(html: str):
+    state = extract_config_state(html, SERP_APP_NAME)
+    if state is None:
+        return None
+
+    results = (state.get("initialState") or dict()).get("results") or dict()
+    for key in ["aggregatedOffers", "totalOffers", "offersCount"]:
+        if isinstance(results.get(key), int):
+            return results[key]
+
+    return None
+
+
+def define_offer_card_state(html: str):
+    state = extract_config_state(html, OFFER_CARD_APP_NAME)
+    if state is None:
+        return None
+
+    offer_data = (state.get("defaultState") or dict()).get("offerData") or dict()
+    return offer_data.get("offer")
+
+
+def define_json_url(offer, deal_type, accommodation_type):
+    """
+    Link of offer, it is built from cianId (or id) when the state has no fullUrl, empty string if there is neither
+    """
+
+    if offer.get("fullUrl"):
+        return offer["fullUrl"]
+
+    offer_id = offer.get("cianId") or offer.get("id")
+    if offer_id is None:
+        return ""
+
+    return f"https://www.cian.ru/{deal_type}/{accommodation_type}/{offer_id}/"
+
+
+def define_json_author(offer):
+    user = offer.get("user") or dict()
+
+    author_data = {
+        "author": user.get("agencyName") or user.get("companyName") or "",
+        "author_type": "unknown",
+    }
+
+    if offer.get("isByHomeowner"):
+        author_data["author_type"] = "homeowner"
+    elif offer.get("isFromBuilder") or offer.get("isFromDeveloper"):
+        author_data["author_type"] = "developer"
+    elif user.get("isAgent"):
+        author_data["author_type"] = "real_estate_agent" if user.get("agencyName") else "realtor"
+
+    if author_data["author"] == "" and offer.get("cianUserId") is not None:
+        author_data["author"] = f"ID {offer['cianUserId']}"
+
+    return author_data
+
+
+def define_json_location_data(offer, is_sale):
+    geo = offer.get("geo") or dict()
+
+    location_data = dict()
+    location_data["district"] = ""
+    location_data["street"] = ""
+    location_data["house_number"] = ""
+    location_data["underground"] = ""
+
+    if is_sale:
+        location_data["residential_complex"] = ""
+
+    for address_element in geo.get("address") or []:
+        element_type = address_element.get("type")
+        if element_type == "raion" and location_data["district"] == "":
+            location_data["district"] = address_element.get("name") or ""
+        elif element_type == "street":
+            location_data["street"] = (address_element.get("fullName") or address_element.get("name") or "").replace("улица", "").strip()
+        elif element_type == "house":
+            location_data["house_number"] = address_element.get("name") or ""
+
+    undergrounds = geo.get("undergrounds") or []
+    if len(undergrounds) != 0:
+        location_data["underground"] = undergrounds[0].get("name") or ""
+
+    jk = geo.get("jk") or dict()
+    if is_sale and jk:
+        display_name = jk.get("displayName") or ""
+        if "«" in display_name and "»" in display_name:
+            location_data["residential_complex"] = display_name.split("«")[1].split("»")[0]
+        else:
+            location_data["residential_complex"] = jk.get("name") or display_name
+
+    return location_data
+
+
+def define_json_price_data(offer):
+    bargain_terms = offer.get("bargainTerms") or dict()
+    price = bargain_terms.get("priceRur", bargain_terms.get("price"))
+
+    price_data = {
+        "price_per_month": -1,
+        "commissions": 0,
+    }
+
+    if price is None:
+        return price_data
+
+    if offer.get("dealType") == "rent":
+        price_data["price_per_month"] = int(price)
+        if bargain_terms.get("agentFee") is not None:
+            price_data["commissions"] = int(bargain_terms["agentFee"])
+    else:
+        price_data["price"] = int(price)
+
+    return price_data
+
+
+def define_json_specification_data(offer):
+    specification_data = dict()
+    specification_data["floor"] = -1
+    specification_data["floors_count"] = -1
+    specification_data["rooms_count"] = -1
+    specification_data["total_meters"] = -1
+
+    building = offer.get("building") or dict()
+    if offer.get("floorNumber") is not None:
+        specification_data["floor"] = int(offer["floorNumber"])
+    if building.get("floorsCount") is not None:
+        specification_data["floors_count"] = int(building["floorsCount"])
+
+    if offer.get("roomsCount") is not None:
+        specification_data["rooms_count"] = int(offer["roomsCount"])
+    elif offer.get("flatType") == "studio":
+        specification_data["rooms_count"] = 1
+
+    if offer.get("totalArea") is not None:
+        specification_data["total_meters"] = float(str(offer["totalArea"]).replace(",", "."))
+
+    return specification_data
+
+
+def define_json_extra_data(offer):
+    """
+    Exact fields which are not available (or only approximately) in the rendered card
+    """
+
+    extra_data = {
+        "published_at": "",
+        "photos": [],
+    }
+
+    if offer.get("addedTimestamp") is not None:
+        extra_data["published_at"] = datetime.fromtimestamp(int(offer["addedTimestamp"]), tz=timezone.utc).isoformat()
+
+    for photo in offer.get("photos") or []:
+        if photo.get("fullUrl"):
+            extra_data["photos"].append(photo["fullUrl"])
+
+    for phone in offer.get("phones") or []:
+        if phone.get("number"):
+            extra_data["phone"] = f"+{phone.get('countryCode') or '7'}{phone['number']}"
+            break
+
+    return extra_data
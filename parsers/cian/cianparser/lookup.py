@@ -0,0 +1,96 @@
+"""
+Resolution of names of locations and metro stations to ids of cian.ru by hash indexes. Indexes (and the tables of
+cianparser/locations_data.py) are built on first lookup, names are compared case-insensitively and with ё equal to е
+"""
+import threading
+
+__indexes__ = dict()
+__indexes_lock__ = threading.Lock()
+
+
+def list_locations():
+    from cianparser.locations_data import CITIES
+
+    return CITIES
+
+
+def list_metro_stations():
+    from cianparser.locations_data import METRO_STATIONS
+
+    return METRO_STATIONS
+
+
+def normalize_name(name):
+    """
+    Key of name in indexes, e.g. " Щёлково " -> "щелково"
+    """
+
+    return " ".join(str(name).casefold().replace("ё", "е").split())
+
+
+def __build_locations_index__():
+    from cianparser.locations_data import CITIES
+
+    return {normalize_name(location): (location, location_id) for location, location_id in CITIES}
+
+
+def __build_metro_index__():
+    from cianparser.locations_data import METRO_STATIONS
+
+    return {normalize_name(metro): {normalize_name(metro_station): metro_id for metro_station, metro_id in metro_stations}
+            for metro, metro_stations in METRO_STATIONS.items()}
+
+
+def __define_index__(name, build_index):
+    index = __indexes__.get(name)
+    if index is None:
+        with __indexes_lock__:
+            index = __indexes__.get(name)
+            if index is None:
+                index = __indexes__[name] = build_index()
+
+    return index
+
+
+def define_location(location):
+    """
+    :return: name of location as in cianparser.list_locations() and its id, e.g. " москва " -> ("Москва", "1"),
+        or None if location is not in it
+    """
+
+    return __define_index__("locations", __build_locations_index__).get(normalize_name(location))
+
+
+def define_location_id(location):
+    """
+    :return: id of location, e.g. "Москва" -> "1", or None if location is not in cianparser.list_locations()
+    """
+
+    found_location = define_location(location)
+    return None if found_location is None else found_location[1]
+
+
+def define_location_ids(locations):
+    """
+    Ids of several locations in the same order, None for unknown ones
+    """
+
+    index = __define_index__("locations", __build_locations_index__)
+    return [index.get(normalize_name(location), (None, None))[1] for location in locations]
+
+
+def define_metro_id(metro, metro_station):
+    """
+    :return: id of station of metro, e.g. ("Московский", "ВДНХ") -> "27", or None if it is not in cianparser.list_metro_stations()
+    """
+
+    return define_metro_ids(metro, [metro_station])[0]
+
+
+def define_metro_ids(metro, metro_stations):
+    """
+    Ids of several stations of the same metro in the same order, None for unknown ones
+    """
+
+    metro_index = __define_index__("metro", __build_metro_index__).get(normalize_name(metro), dict())
+    return [metro_index.get(normalize_name(metro_station)) for metro_station in metro_stations]
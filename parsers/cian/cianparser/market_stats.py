@@ -0,0 +1,201 @@
+import math
+import threading
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01, max_bins=2048):
+        """
+        Streaming quantiles of positive values with bounded relative error (DDSketch): value goes to logarithmic bin,
+        memory is limited by max_bins whatever the count of values is, the lowest bins are collapsed when it is reached
+        :param float relative_accuracy: relative error of quantile, default 0.01
+        :param int max_bins: maximal count of bins, default 2048
+        """
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.count = 0
+        self.count_of_zeros = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        self.__gamma__ = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma__ = math.log(self.__gamma__)
+        self.__bins__ = dict()
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value <= 0:
+            self.count_of_zeros += 1
+            return
+
+        index = math.ceil(math.log(value) / self.__log_gamma__)
+        self.__bins__[index] = self.__bins__.get(index, 0) + 1
+        if len(self.__bins__) > self.max_bins:
+            self.__collapse__()
+
+    def __collapse__(self):
+        indexes = sorted(self.__bins__.keys())
+        count_of_collapsed = sum(self.__bins__.pop(index) for index in indexes[:len(indexes) - self.max_bins + 1])
+        lowest_index = indexes[len(indexes) - self.max_bins]
+        self.__bins__[lowest_index] = self.__bins__.get(lowest_index, 0) + count_of_collapsed
+
+    def merge(self, other):
+        self.count += other.count
+        self.count_of_zeros += other.count_of_zeros
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for index, count in other.__bins__.items():
+            self.__bins__[index] = self.__bins__.get(index, 0) + count
+        while len(self.__bins__) > self.max_bins:
+            self.__collapse__()
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        if rank < self.count_of_zeros:
+            return 0
+
+        count_of_values = self.count_of_zeros
+        for index in sorted(self.__bins__.keys()):
+            count_of_values += self.__bins__[index]
+            if count_of_values > rank:
+                return min(max(2 * self.__gamma__ ** index / (self.__gamma__ + 1), self.min), self.max)
+
+        return self.max
+
+    def mean(self):
+        return self.sum / self.count if self.count != 0 else None
+
+
+class MarketStats:
+    def __init__(self, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95), relative_accuracy=0.01, max_bins=2048):
+        """
+        Statistics of prices and prices per m² grouped by deal type ("sale", "rent_long" or "rent_short"), district and count
+        of rooms. It is updated per parsed offer in constant memory (see QuantileSketch) and may be read during the crawl
+        from other thread
+        Examples:
+            >>> market_stats = moscow_parser.get_market_stats()
+            >>> market_stats.get_summary(district="Пресненский", rooms_count=1)
+            >>> market_stats.is_bait_price(offer)
+        :param quantiles: quantiles of summaries, default (0.05, 0.25, 0.5, 0.75, 0.95)
+        :param float relative_accuracy: relative error of quantiles, default 0.01
+        :param int max_bins: maximal count of bins in sketch of one group, default 2048
+        """
+
+        self.quantiles = tuple(quantiles)
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+
+        self.__groups__ = dict()
+        self.__lock__ = threading.Lock()
+
+    @staticmethod
+    def define_price(offer):
+        for price_field in ["price", "price_per_month", "price_per_day"]:
+            price = offer.get(price_field, -1)
+            if isinstance(price, (int, float)) and price > 0:
+                return price
+
+        return None
+
+    @staticmethod
+    def define_group_key(offer, deal_type=None):
+        return offer.get("deal_type", "") if deal_type is None else deal_type, offer.get("district", ""), offer.get("rooms_count", -1)
+
+    def add(self, offer, deal_type=None):
+        """
+        :param deal_type: deal type of the query, offers of both kinds of rent have only "rent", so parsers pass
+            "rent_long" or "rent_short" here, default deal type of offer
+        """
+
+        price = self.define_price(offer)
+        if price is None:
+            return
+
+        total_meters = offer.get("total_meters", -1)
+        group_key = self.define_group_key(offer, deal_type)
+        with self.__lock__:
+            sketches = self.__groups__.get(group_key)
+            if sketches is None:
+                sketches = self.__groups__[group_key] = {
+                    "price": QuantileSketch(self.relative_accuracy, self.max_bins),
+                    "price_per_meter": QuantileSketch(self.relative_accuracy, self.max_bins),
+                }
+
+            sketches["price"].add(price)
+            if isinstance(total_meters, (int, float)) and total_meters > 0:
+                sketches["price_per_meter"].add(price / total_meters)
+
+    def list_groups(self):
+        with self.__lock__:
+            return list(self.__groups__.keys())
+
+    def __merge_groups__(self, deal_type, district, rooms_count):
+        merged = {
+            "price": QuantileSketch(self.relative_accuracy, self.max_bins),
+            "price_per_meter": QuantileSketch(self.relative_accuracy, self.max_bins),
+        }
+        with self.__lock__:
+            for (group_deal_type, group_district, group_rooms_count), sketches in self.__groups__.items():
+                if deal_type is not None and group_deal_type != deal_type and not group_deal_type.startswith(f"{deal_type}_"):
+                    continue
+                if district is not None and group_district != district:
+                    continue
+                if rooms_count is not None and group_rooms_count != rooms_count:
+                    continue
+                for name, sketch in sketches.items():
+                    merged[name].merge(sketch)
+
+        return merged
+
+    def get_summary(self, deal_type=None, district=None, rooms_count=None):
+        """
+        Count, mean and quantiles of prices and prices per m² of offers of the group, None means any value,
+        deal_type "rent" means both "rent_long" and "rent_short"
+        :return: {"price": {"count": ..., "mean": ..., "q50": ...}, "price_per_meter": {...}}
+        """
+
+        summary = dict()
+        for name, sketch in self.__merge_groups__(deal_type, district, rooms_count).items():
+            summary[name] = {"count": sketch.count, "mean": sketch.mean()}
+            for q in self.quantiles:
+                summary[name][f"q{round(q * 100):02d}"] = sketch.quantile(q)
+
+        return summary
+
+    def get_summaries(self):
+        """
+        Summaries of all groups of deal type, district and count of rooms
+        """
+
+        return {group_key: self.get_summary(*group_key) for group_key in self.list_groups()}
+
+    def is_bait_price(self, offer, quantile=0.05, min_count=20, deal_type=None):
+        """
+        Price (per m² if the area is known) of the offer is lower than the quantile of its group, groups with less than
+        min_count offers are not judged
+        :param deal_type: "rent_long" or "rent_short" for offers of rent, otherwise they are compared with both kinds
+            of rent, default deal type of offer
+        """
+
+        price = self.define_price(offer)
+        if price is None:
+            return False
+
+        sketches = self.__merge_groups__(*self.define_group_key(offer, deal_type))
+        total_meters = offer.get("total_meters", -1)
+        if isinstance(total_meters, (int, float)) and total_meters > 0 and sketches["price_per_meter"].count >= min_count:
+            return price / total_meters < sketches["price_per_meter"].quantile(quantile)
+
+        if sketches["price"].count >= min_count:
+            return price < sketches["price"].quantile(quantile)
+
+        return False
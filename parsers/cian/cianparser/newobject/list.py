@@ -1,19 +1,18 @@
-import bs4
-import time
 import math
-import csv
 import pathlib
 from datetime import datetime
-from transliterate import translit
 import urllib.parse
 
+from cianparser.html_backend import make_soup, is_captcha
 from cianparser.constants import FILE_NAME_NEWOBJECT_FORMAT
 from cianparser.helpers import union_dicts
 from cianparser.newobject.page import NewObjectPageParser
+from cianparser.enrichment import DetailEnricher
+from cianparser.writers import CsvResultWriter
 
 
 class NewObjectListParser:
-    def __init__(self, session, location_name: str, with_saving_csv=False):
+    def __init__(self, session, location_name: str, with_saving_csv=False, detail_workers=4):
         self.accommodation_type = "newobject"
         self.deal_type = "sale"
         self.session = session
@@ -21,15 +20,22 @@ class NewObjectListParser:
         self.with_saving_csv = with_saving_csv
 
         self.result = []
+        self.keep_results = True
+        self.pending_offers = []
         self.result_set = set()
         self.average_price = 0
         self.count_parsed_offers = 0
         self.start_page = 1
         self.end_page = 50
         self.file_path = self.build_file_path()
+        self.csv_writer = CsvResultWriter(self.file_path) if with_saving_csv else None
+        self.detail_enricher = DetailEnricher(session=session, page_parser_class=NewObjectPageParser,
+                                              max_workers=detail_workers)
 
     def build_file_path(self):
         now_time = datetime.now().strftime("%d_%b_%Y_%H_%M_%S_%f")
+        from transliterate import translit
+
         file_name = FILE_NAME_NEWOBJECT_FORMAT.format(self.accommodation_type, translit(self.location_name.lower(), reversed=True), now_time)
         return pathlib.Path(pathlib.Path.cwd(), file_name.replace("'", ""))
 
@@ -42,12 +48,12 @@ class NewObjectListParser:
               end="\r", flush=True)
 
     def parse_list_offers_page(self, html, page_number: int, count_of_pages: int, attempt_number: int):
-        list_soup = bs4.BeautifulSoup(html, 'html.parser')
-
-        if list_soup.text.find("Captcha") > 0:
+        if is_captcha(html):
             print(f"\r{page_number} page: there is CAPTCHA... failed to parse page...")
             return False, attempt_number + 1, True
 
+        list_soup = make_soup(html)
+
         offers = list_soup.select("div[data-mark='GKCard']")
         print("")
         print(f"\r {page_number} page: {len(offers)} offers", end="\r", flush=True)
@@ -59,7 +65,7 @@ class NewObjectListParser:
             self.parse_offer(offer=offer)
             self.print_parse_progress(page_number=page_number, count_of_pages=count_of_pages, offers=offers, ind=ind)
 
-        time.sleep(2)
+        self.finish_page()
 
         return True, 0, False
 
@@ -74,21 +80,35 @@ class NewObjectListParser:
         if common_data["url"] in self.result_set:
             return
 
-        flat_parser = NewObjectPageParser(session=self.session, url=common_data["url"])
-        page_data = flat_parser.parse_page()
-        time.sleep(4)
-
         self.count_parsed_offers += 1
         self.result_set.add(common_data["url"])
-        self.result.append(union_dicts(common_data, page_data))
+        self.detail_enricher.submit(common_data["url"], lambda page_data: self.__append_offer__(union_dicts(common_data, page_data)))
+
+    def __append_offer__(self, offer):
+        if self.keep_results:
+            self.result.append(offer)
+        else:
+            self.pending_offers.append(offer)
+
+        if self.csv_writer is not None:
+            self.csv_writer.write(offer)
+
+    def finish_page(self):
+        self.detail_enricher.join()
+
+        if self.csv_writer is not None:
+            self.csv_writer.flush()
+
+    def pop_offers(self):
+        """
+        Offers collected since the previous call, used when keep_results is False
+        """
 
-        if self.with_saving_csv:
-            self.save_results()
+        offers, self.pending_offers = self.pending_offers, []
+        return offers
 
-    def save_results(self):
-        keys = self.result[0].keys()
+    def close(self):
+        self.detail_enricher.close()
 
-        with open(self.file_path, 'w', newline='', encoding='utf-8') as output_file:
-            dict_writer = csv.DictWriter(output_file, keys, delimiter=';')
-            dict_writer.writeheader()
-            dict_writer.writerows(self.result)
+        if self.csv_writer is not None:
+            self.csv_writer.close()
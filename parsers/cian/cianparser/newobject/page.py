@@ -1,6 +1,6 @@
-import bs4
-import re
-import time
+from cianparser.html_backend import make_soup
+from cianparser.scheduler import is_captcha_response
+from cianparser.page_fields import NEWOBJECT_PAGE_FIELDS
 
 
 class NewObjectPageParser:
@@ -10,11 +10,11 @@ class NewObjectPageParser:
 
     def __load_page__(self):
         res = self.session.get(self.url)
-        if res.status_code == 429:
-            time.sleep(10)
         res.raise_for_status()
+        if is_captcha_response(res):
+            raise ValueError(f"there is CAPTCHA on {self.url}")
         self.offer_page_html = res.text
-        self.offer_page_soup = bs4.BeautifulSoup(self.offer_page_html, 'html.parser')
+        self.offer_page_soup = make_soup(self.offer_page_html)
 
     def parse_page(self):
         self.__load_page__()
@@ -30,37 +30,7 @@ class NewObjectPageParser:
             "floors_to": -1,
         }
 
-        spans = self.offer_page_soup.select("span")
-        for index, span in enumerate(spans):
-            if "Срок сдачи" in span.text:
-                page_data["year_of_construction"] = spans[index + 1].text
-
-            if "Тип дома" == span.text:
-                page_data["house_material_type"] = spans[index + 1].text
-
-            if "Отделка" == span.text:
-                page_data["finish_type"] = spans[index + 1].text
-
-            if "Высота потолков" == span.text:
-                page_data["ceiling_height"] = spans[index + 1].text
-
-            if "Класс" == span.text:
-                page_data["class"] = spans[index + 1].text
-
-            if "Застройщик" in span.text and "Проектная декларация" in span.text:
-                page_data["builder"] = span.text.split(".")[0]
-
-            if "Парковка" == span.text:
-                page_data["parking_type"] = spans[index + 1].text
-
-            if "Этажность" == span.text:
-                ints = re.findall(r'\d+', spans[index + 1].text)
-                if len(ints) == 2:
-                    page_data["floors_from"] = int(ints[0])
-                    page_data["floors_to"] = int(ints[1])
-                if len(ints) == 1:
-                    page_data["floors_from"] = int(ints[0])
-                    page_data["floors_to"] = int(ints[0])
+        NEWOBJECT_PAGE_FIELDS.parse(self.offer_page_soup, page_data)
 
         return page_data
 
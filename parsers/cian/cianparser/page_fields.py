@@ -0,0 +1,148 @@
+import re
+
+__ints_pattern__ = re.compile(r'\d+')
+
+
+def as_text(text):
+    return text
+
+
+def as_floor_and_count(text):
+    ints = __ints_pattern__.findall(text)
+    if len(ints) == 2:
+        return int(ints[0]), int(ints[1])
+
+    return None
+
+
+def as_floors_range(text):
+    ints = __ints_pattern__.findall(text)
+    if len(ints) == 2:
+        return int(ints[0]), int(ints[1])
+    if len(ints) == 1:
+        return int(ints[0]), int(ints[0])
+
+    return None
+
+
+def as_builder(text):
+    return text.split(".")[0] if "Застройщик" in text else None
+
+
+class PageFields:
+    def __init__(self, exact=None, contains=None, own=None):
+        """
+        Spec of the fields on page of offer, label of span -> (field, converter). Converter gets the text of the span
+        after the label and returns the value (tuple of values if field is tuple of names) or None to skip it
+        :param dict exact: labels equal to the text of span
+        :param dict contains: labels contained in the text of span
+        :param dict own: labels contained in the text of span, converter gets the text of the span itself
+        """
+
+        self.exact = dict() if exact is None else exact
+        self.contains = dict() if contains is None else contains
+        self.own = dict() if own is None else own
+        self.__contains_pattern__ = self.__compile__(self.contains)
+        self.__own_pattern__ = self.__compile__(self.own)
+
+    @staticmethod
+    def __compile__(labels):
+        if len(labels) == 0:
+            return None
+
+        return re.compile("|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True)))
+
+    @staticmethod
+    def __set_field__(page_data, field, converter, text):
+        value = converter(text)
+        if value is None:
+            return
+
+        if isinstance(field, tuple):
+            page_data.update(zip(field, value))
+        else:
+            page_data[field] = value
+
+    def parse(self, soup, page_data):
+        """
+        One pass over spans of page: text of every span is taken once and matched by dict lookup,
+        the rest labels by one compiled pattern
+        """
+
+        texts = [span.text for span in soup.select("span")]
+        count_of_texts = len(texts)
+        for index, text in enumerate(texts):
+            next_text = texts[index + 1] if index + 1 < count_of_texts else ""
+
+            spec = self.exact.get(text)
+            if spec is not None:
+                self.__set_field__(page_data, spec[0], spec[1], next_text)
+
+            if self.__contains_pattern__ is not None:
+                for label in set(self.__contains_pattern__.findall(text)):
+                    spec = self.contains[label]
+                    self.__set_field__(page_data, spec[0], spec[1], next_text)
+
+            if self.__own_pattern__ is not None:
+                for label in set(self.__own_pattern__.findall(text)):
+                    spec = self.own[label]
+                    self.__set_field__(page_data, spec[0], spec[1], text)
+
+        return page_data
+
+
+FLAT_PAGE_FIELDS = PageFields(
+    exact={
+        "Тип жилья": ("object_type", as_text),
+        "Тип дома": ("house_material_type", as_text),
+        "Отопление": ("heating_type", as_text),
+        "Отделка": ("finish_type", as_text),
+        "Площадь кухни": ("kitchen_meters", as_text),
+        "Жилая площадь": ("living_meters", as_text),
+        "Этаж": (("floor", "floors_count"), as_floor_and_count),
+        "Санузел": ("bathroom", as_text),
+        "Балкон/лоджия": ("balcony", as_text),
+        "Вид из окон": ("window_view", as_text),
+    },
+    contains={
+        "Год постройки": ("year_of_construction", as_text),
+        "Год сдачи": ("year_of_construction", as_text),
+    },
+)
+
+SUBURBAN_PAGE_FIELDS = PageFields(
+    exact={
+        "Материал дома": ("house_material_type", as_text),
+        "Участок": ("land_plot", as_text),
+        "Статус участка": ("land_plot_status", as_text),
+        "Отопление": ("heating_type", as_text),
+        "Газ": ("gas_type", as_text),
+        "Водоснабжение": ("water_supply_type", as_text),
+        "Канализация": ("sewage_system", as_text),
+        "Санузел": ("bathroom", as_text),
+        "Площадь кухни": ("kitchen_meters", as_text),
+        "Общая площадь": ("living_meters", as_text),
+        "Этажей в доме": ("floors_count", as_text),
+    },
+    contains={
+        "Год постройки": ("year_of_construction", as_text),
+        "Год сдачи": ("year_of_construction", as_text),
+    },
+)
+
+NEWOBJECT_PAGE_FIELDS = PageFields(
+    exact={
+        "Тип дома": ("house_material_type", as_text),
+        "Отделка": ("finish_type", as_text),
+        "Высота потолков": ("ceiling_height", as_text),
+        "Класс": ("class", as_text),
+        "Парковка": ("parking_type", as_text),
+        "Этажность": (("floors_from", "floors_to"), as_floors_range),
+    },
+    contains={
+        "Срок сдачи": ("year_of_construction", as_text),
+    },
+    own={
+        "Проектная декларация": ("builder", as_builder),
+    },
+)
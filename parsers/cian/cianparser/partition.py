@@ -0,0 +1,140 @@
+import math
+import re
+
+from cianparser.constants import COUNT_OF_OFFERS_ON_LIST_PAGE, MAX_COUNT_OF_OFFERS_IN_QUERY
+from cianparser.json_state import define_list_offers_count
+from cianparser.helpers import define_deal_url_id
+
+__count_of_offers_pattern__ = re.compile(r"Найдено\s*([\d\s ]+?)\s*(?:объявлени|предложени)")
+
+
+def define_count_of_offers(html):
+    """
+    Count of offers found by the query, from the state embedded in page or from the summary header
+    """
+
+    count_of_offers = define_list_offers_count(html)
+    if count_of_offers is not None:
+        return count_of_offers
+
+    match = __count_of_offers_pattern__.search(html)
+    if match is None:
+        return None
+
+    digits = re.sub(r"\D", "", match.group(1))
+    return int(digits) if digits != "" else None
+
+
+def probe_band(probe_count, min_price, max_price, max_attempts=3):
+    """
+    Count of offers in the band, the probe is repeated while the count is not found on the page (e.g. captcha)
+    """
+
+    for attempt_number in range(max_attempts):
+        try:
+            count_of_offers = probe_count(min_price, max_price)
+        except Exception as e:
+            print(f"\nprice band {min_price}-{'' if max_price is None else max_price}: {e}")
+            count_of_offers = None
+
+        if count_of_offers is not None:
+            return count_of_offers
+
+    raise ValueError(f'Failed to define count of offers in price band {min_price}-{"" if max_price is None else max_price} '
+                     f'after {max_attempts} attempts, the query is not split')
+
+
+def split_price_bands(probe_count, min_price=0, max_price=None, max_count_of_offers=MAX_COUNT_OF_OFFERS_IN_QUERY, price_pivot=10000000,
+                      max_probe_attempts=3):
+    """
+    Split the range of prices into bands which fit under the cap of the site, bands are narrowed by bisection
+    :param probe_count: probe_count(min_price, max_price) -> count of offers in the band (max_price None is open band)
+    :param price_pivot: the first split of open band, it doubles while the rest of open band is over the cap, default 10000000
+    :param int max_probe_attempts: how many times the count of one band is requested before ValueError, default 3
+    :return: list of (min_price, max_price, count_of_offers)
+    """
+
+    bands = []
+    pending = [(min_price, max_price)]
+    while len(pending) != 0:
+        band_min_price, band_max_price = pending.pop()
+        count_of_offers = probe_band(probe_count, band_min_price, band_max_price, max_attempts=max_probe_attempts)
+
+        if count_of_offers == 0:
+            continue
+
+        if count_of_offers <= max_count_of_offers or (band_max_price is not None and band_max_price - band_min_price <= 1):
+            if count_of_offers > max_count_of_offers:
+                print(f"\nprice band {band_min_price}-{band_max_price}: {count_of_offers} offers can not be split further...")
+            bands.append((band_min_price, band_max_price, count_of_offers))
+            continue
+
+        if band_max_price is None:
+            middle_price = max(price_pivot, band_min_price * 2)
+        else:
+            middle_price = (band_min_price + band_max_price) // 2
+
+        pending.append((middle_price + 1, band_max_price))
+        pending.append((band_min_price, middle_price))
+
+    return sorted(bands, key=lambda band: band[0])
+
+
+def define_band_settings(additional_settings, band):
+    band_min_price, band_max_price, count_of_offers = band
+    band_settings = dict(additional_settings or dict(), min_price=band_min_price, start_page=1,
+                         end_page=max(1, math.ceil(count_of_offers / COUNT_OF_OFFERS_ON_LIST_PAGE)))
+    band_settings.pop("max_price", None)
+    if band_max_price is not None:
+        band_settings["max_price"] = band_max_price
+
+    return band_settings
+
+
+def __crawl_band__(parser_kwargs, method_name, method_kwargs):
+    """
+    Worker of process pool: the parser is created inside of process, only arguments and offers cross the boundary
+    """
+
+    from cianparser.cianparser import CianParser
+
+    parser = CianParser(**parser_kwargs)
+    return getattr(parser, method_name)(**method_kwargs)
+
+
+def crawl_price_bands(parser_kwargs, method_name, method_kwargs, bands, max_workers=4):
+    """
+    Crawl bands in parallel processes, offers found in several bands are returned once. A failed band is reported
+    and skipped, offers of the other bands are returned
+    :param parser_kwargs: arguments of CianParser in every process
+    :param method_name: "get_flats" or "get_suburban"
+    :param method_kwargs: arguments of the method, additional_settings are completed by band
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    result, seen_offer_ids, failed_bands = [], set(), []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(__crawl_band__, parser_kwargs, method_name,
+                                   dict(method_kwargs, additional_settings=define_band_settings(method_kwargs.get("additional_settings"), band)))
+                   for band in bands]
+
+        for band, future in zip(bands, futures):
+            try:
+                offers = future.result()
+            except Exception as e:
+                print(f"\nprice band {band[0]}-{'' if band[1] is None else band[1]}: {e}... it is skipped")
+                failed_bands.append(band)
+                continue
+
+            for offer in offers:
+                offer_id = define_deal_url_id(offer.get("url", ""))
+                if offer_id in seen_offer_ids:
+                    continue
+                seen_offer_ids.add(offer_id)
+                result.append(offer)
+
+    if len(failed_bands) != 0:
+        print(f"\n{len(failed_bands)} of {len(bands)} price bands have not been collected")
+
+    return result
@@ -0,0 +1,257 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from cianparser.helpers import define_deal_url_id
+
+
+def define_card_photos(block):
+    """
+    Links of photos in the gallery of the card of offer with list of offers, images out of it (avatars of agents,
+    logos of agencies) are not photos of offer
+    """
+
+    photos = []
+    for img in block.select("[data-name^='Gallery'] img[src]"):
+        src = img.get("src")
+        if src.startswith("http") and src not in photos:
+            photos.append(src)
+
+    return photos
+
+
+def resize_photo(content, size, quality, preview_size):
+    """
+    Executed in process pool: photo of medium quality (jpeg) and base64 jpeg preview (requires Pillow package)
+    """
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(content)) as image:
+        image = image.convert("RGB")
+
+        photo = image.copy()
+        photo.thumbnail(size)
+        photo_buffer = io.BytesIO()
+        photo.save(photo_buffer, format="JPEG", quality=quality, optimize=True)
+
+        image.thumbnail(preview_size)
+        preview_buffer = io.BytesIO()
+        image.save(preview_buffer, format="JPEG", quality=50)
+
+    return photo_buffer.getvalue(), base64.b64encode(preview_buffer.getvalue()).decode("ascii")
+
+
+class PhotoPipeline:
+    def __init__(self, storage_path="cian_photos", max_photos=5, max_concurrent_downloads=8, queue_size=1000,
+                 size=(800, 600), quality=75, preview_size=(64, 48), resize_workers=2, timeout=30):
+        """
+        Download of photos of offers in the background (requires aiohttp and Pillow packages): the crawl only puts offers
+        into own queue of pipeline, photos are loaded concurrently by one pooled client in own event loop thread, resized
+        in process pool and saved once per content (sha1), so relisted offers do not load and store the same photos again
+        Examples:
+            >>> photo_pipeline = PhotoPipeline(storage_path="cian_photos")
+            >>> parser = cianparser.CianParser(location="Краснодар", photo_pipeline=photo_pipeline)
+            >>> data = parser.get_flats(deal_type="sale", rooms=1)
+            >>> photo_pipeline.close()
+            >>> photos = photo_pipeline.get_photos(data[0]["url"])
+        :param storage_path: directory of photos and index.jsonl with records of photos of offers, default "cian_photos"
+        :param int max_photos: how many first photos of every offer are stored, default 5
+        :param int max_concurrent_downloads: how many photos may be loading at the same time, default 8
+        :param int queue_size: how many photos may wait in the queue, photos over it are dropped (see count_of_dropped), default 1000
+        :param size: maximal size of stored photo, default (800, 600)
+        :param int quality: quality of stored jpeg, default 75
+        :param preview_size: maximal size of base64 preview, default (64, 48)
+        :param int resize_workers: how many processes resize photos, default 2
+        :param timeout: timeout in seconds of loading of one photo, default 30
+        """
+
+        import aiohttp
+
+        self.storage_path = storage_path
+        self.max_photos = max_photos
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.size = tuple(size)
+        self.quality = quality
+        self.preview_size = tuple(preview_size)
+        self.timeout = timeout
+
+        self.count_of_downloads = 0
+        self.count_of_duplicates = 0
+        self.count_of_failures = 0
+        self.count_of_dropped = 0
+
+        os.makedirs(storage_path, exist_ok=True)
+        self.__aiohttp__ = aiohttp
+        self.__index_path__ = os.path.join(storage_path, "index.jsonl")
+        self.__photos__ = dict()
+        self.__contents__ = dict()
+        self.__offers__ = dict()
+        self.__loadings__ = dict()
+        self.__lock__ = threading.Lock()
+        self.__closed__ = False
+        self.__load_index__()
+
+        self.__executor__ = ProcessPoolExecutor(max_workers=max(1, resize_workers))
+        self.__loop__ = asyncio.new_event_loop()
+        self.__queue__ = None
+        self.__stopping__ = None
+        self.__started__ = threading.Event()
+        self.__thread__ = threading.Thread(target=self.__run_loop__, args=(queue_size,), daemon=True)
+        self.__thread__.start()
+        self.__started__.wait()
+
+    def __load_index__(self):
+        """
+        Photos stored by previous runs: link -> record, offer id -> records
+        """
+
+        if not os.path.exists(self.__index_path__):
+            return
+
+        with open(self.__index_path__, "r", encoding="utf-8") as index_file:
+            for line in index_file:
+                if line.strip() == "":
+                    continue
+                record = json.loads(line)
+                self.__photos__[record["url"]] = record
+                self.__contents__[record["sha1"]] = record
+                self.__offers__.setdefault(record["offer_id"], []).append(record)
+
+    def __run_loop__(self, queue_size):
+        asyncio.set_event_loop(self.__loop__)
+        self.__queue__ = asyncio.Queue(maxsize=queue_size)
+        self.__stopping__ = asyncio.Event()
+        self.__started__.set()
+        self.__loop__.run_until_complete(self.__consume__())
+        self.__loop__.close()
+
+    async def __consume__(self):
+        connector = self.__aiohttp__.TCPConnector(limit=self.max_concurrent_downloads)
+        timeout = self.__aiohttp__.ClientTimeout(total=self.timeout)
+        async with self.__aiohttp__.ClientSession(connector=connector, timeout=timeout) as session:
+            workers = [asyncio.ensure_future(self.__work__(session)) for _ in range(self.max_concurrent_downloads)]
+            await self.__stopping__.wait()
+            await self.__queue__.join()
+            for _ in workers:
+                await self.__queue__.put(None)
+            await asyncio.gather(*workers)
+
+    async def __work__(self, session):
+        while True:
+            item = await self.__queue__.get()
+            try:
+                if item is None:
+                    return
+                await self.__store_photo__(session, *item)
+            except Exception:
+                with self.__lock__:
+                    self.count_of_failures += 1
+            finally:
+                self.__queue__.task_done()
+
+    async def __load_photo__(self, session, url):
+        async with session.get(url) as res:
+            res.raise_for_status()
+            content = await res.read()
+
+        sha1 = hashlib.sha1(content).hexdigest()
+        file_path = os.path.join(self.storage_path, sha1[:2], f"{sha1}.jpg")
+        with self.__lock__:
+            stored_record = self.__contents__.get(sha1)
+        if stored_record is not None:
+            with self.__lock__:
+                self.count_of_duplicates += 1
+            return {"sha1": sha1, "path": file_path, "preview": stored_record["preview"]}
+
+        photo, preview = await asyncio.get_running_loop().run_in_executor(
+            self.__executor__, resize_photo, content, self.size, self.quality, self.preview_size)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as photo_file:
+            photo_file.write(photo)
+        with self.__lock__:
+            self.count_of_downloads += 1
+
+        return {"sha1": sha1, "path": file_path, "preview": preview}
+
+    async def __store_photo__(self, session, offer_id, position, url):
+        """
+        The same link is loaded once: by its record in index or by the loading which is already in progress
+        """
+
+        with self.__lock__:
+            record = self.__photos__.get(url)
+
+        if record is None:
+            loading = self.__loadings__.get(url)
+            if loading is None:
+                loading = self.__loadings__[url] = asyncio.ensure_future(self.__load_photo__(session, url))
+                try:
+                    record = await loading
+                finally:
+                    del self.__loadings__[url]
+            else:
+                record = await loading
+                with self.__lock__:
+                    self.count_of_duplicates += 1
+        else:
+            with self.__lock__:
+                self.count_of_duplicates += 1
+
+        self.__add_record__(dict(record, offer_id=offer_id, position=position, url=url))
+
+    def __add_record__(self, record):
+        with self.__lock__:
+            self.__photos__.setdefault(record["url"], record)
+            self.__contents__.setdefault(record["sha1"], record)
+            offer_records = self.__offers__.setdefault(record["offer_id"], [])
+            if any(offer_record["url"] == record["url"] for offer_record in offer_records):
+                return
+            offer_records.append(record)
+            with open(self.__index_path__, "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __put__(self, item):
+        try:
+            self.__queue__.put_nowait(item)
+        except asyncio.QueueFull:
+            with self.__lock__:
+                self.count_of_dropped += 1
+
+    def submit(self, offer):
+        """
+        Put first photos of the offer into the queue of pipeline, it never blocks the crawl. Raises RuntimeError after close()
+        """
+
+        offer_id = define_deal_url_id(offer.get("url", ""))
+        with self.__lock__:
+            if self.__closed__:
+                raise RuntimeError("PhotoPipeline is closed, photos can not be submitted")
+            for position, url in enumerate(offer.get("photos", [])[:self.max_photos]):
+                self.__loop__.call_soon_threadsafe(self.__put__, (offer_id, position, url))
+
+    def get_photos(self, url):
+        """
+        Records of stored photos of the offer: url, sha1, path of file, base64 preview and position
+        """
+
+        with self.__lock__:
+            return sorted(self.__offers__.get(define_deal_url_id(url), []), key=lambda record: record["position"])
+
+    def close(self):
+        """
+        Wait until the queue is done, then stop the event loop and process pool
+        """
+
+        with self.__lock__:
+            self.__closed__ = True
+
+        if self.__thread__.is_alive():
+            self.__loop__.call_soon_threadsafe(self.__stopping__.set)
+            self.__thread__.join()
+        self.__executor__.shutdown(wait=True)
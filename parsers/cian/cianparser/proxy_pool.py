@@ -1,61 +1,176 @@
 import time
-import urllib.request
-import urllib.error
-import bs4
-import random
-import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cianparser.html_backend import is_captcha
 
 
 class ProxyPool:
-    def __init__(self, proxies):
-        self.__proxy_pool__ = [] if proxies is None else proxies
+    def __init__(self, proxies, timeout=5, validation_workers=4, base_quarantine=30, max_quarantine=1800, revalidate_interval=300):
+        """
+        Pool of proxies which keeps the current healthy proxy until it fails, failed proxies are quarantined
+        with exponential backoff and come back after it
+        :param proxies: list of proxies (https scheme)
+        :param timeout: timeout in seconds of the request which validates a proxy, default 5
+        :param validation_workers: how many proxies may be validated at the same time, default 4
+        :param base_quarantine: quarantine in seconds after the first failure, it doubles after every next one, default 30
+        :param max_quarantine: maximal quarantine in seconds, default 1800
+        :param revalidate_interval: how often in seconds spare proxies are validated in the background, default 300
+        """
+
+        self.timeout = timeout
+        self.base_quarantine = base_quarantine
+        self.max_quarantine = max_quarantine
+        self.revalidate_interval = revalidate_interval
+
+        self.__proxy_pool__ = [] if proxies is None else list(proxies)
+        self.__stats__ = {proxy: self.__define_empty_stats__() for proxy in self.__proxy_pool__}
         self.__current_proxy__ = None
-        self.__page_html__ = None
+        self.__lock__ = threading.Lock()
+        self.__executor__ = ThreadPoolExecutor(max_workers=max(1, validation_workers)) if len(self.__proxy_pool__) != 0 else None
+        self.__background_validation__ = None
+        self.__last_validation_time__ = 0
+
+    @staticmethod
+    def __define_empty_stats__():
+        return {
+            "count_of_requests": 0,
+            "count_of_successes": 0,
+            "count_of_captchas": 0,
+            "latency": None,
+            "count_of_failures_in_row": 0,
+            "quarantined_until": 0,
+            "validated_at": 0,
+        }
+
+    def is_empty(self):
+        return len(self.__proxy_pool__) == 0
+
+    def get_stats(self):
+        with self.__lock__:
+            return {proxy: dict(stats) for proxy, stats in self.__stats__.items()}
+
+    def report(self, proxy, is_success, latency=None, is_captcha=False):
+        """
+        Outcome of the request through proxy, it is called by parser after every page and by validation
+        """
+
+        if proxy is None or proxy not in self.__stats__:
+            return
+
+        with self.__lock__:
+            stats = self.__stats__[proxy]
+            stats["count_of_requests"] += 1
+
+            if is_success and not is_captcha:
+                stats["count_of_successes"] += 1
+                stats["count_of_failures_in_row"] = 0
+                if latency is not None:
+                    stats["latency"] = latency if stats["latency"] is None else 0.8 * stats["latency"] + 0.2 * latency
+                return
+
+            if is_captcha:
+                stats["count_of_captchas"] += 1
+
+            stats["count_of_failures_in_row"] += 1
+            quarantine = min(self.max_quarantine, self.base_quarantine * 2 ** (stats["count_of_failures_in_row"] - 1))
+            stats["quarantined_until"] = time.monotonic() + quarantine
+            if self.__current_proxy__ == proxy:
+                self.__current_proxy__ = None
 
-    def __is_captcha__(self):
-        page_soup = bs4.BeautifulSoup(self.__page_html__, 'html.parser')
-        return page_soup.text.find("Captcha") > 0
+        print(f"proxy {proxy}: {'there is captcha' if is_captcha else 'unavailable'}.. quarantined for {quarantine} seconds")
+
+    def __is_quarantined__(self, proxy, now):
+        return self.__stats__[proxy]["quarantined_until"] > now
+
+    def __define_score__(self, proxy):
+        stats = self.__stats__[proxy]
+        success_rate = (stats["count_of_successes"] + 1) / (stats["count_of_requests"] + 2)
+        captcha_rate = stats["count_of_captchas"] / (stats["count_of_requests"] + 1)
+        latency = self.timeout if stats["latency"] is None else stats["latency"]
+        return success_rate - captcha_rate, -latency
+
+    def __validate__(self, url, proxy):
+        import urllib.request
 
-    def __is_available_proxy__(self, url, proxy):
         opener = urllib.request.build_opener(urllib.request.ProxyHandler({'https': proxy}))
         opener.addheaders = [('User-agent', 'Mozilla/5.0')]
-        urllib.request.install_opener(opener)
 
+        start_time = time.monotonic()
         try:
-            self.__page_html__ = urllib.request.urlopen(urllib.request.Request(url))
-        except Exception as detail:
-            print(f"atas: {detail}..")
+            with opener.open(urllib.request.Request(url), timeout=self.timeout) as response:
+                html = response.read()
+        except Exception:
+            self.report(proxy, is_success=False)
             return False
 
-        return True
+        is_captcha_page = is_captcha(html)
+        self.report(proxy, is_success=True, latency=time.monotonic() - start_time, is_captcha=is_captcha_page)
+        with self.__lock__:
+            self.__stats__[proxy]["validated_at"] = time.monotonic()
 
-    def is_empty(self):
-        return len(self.__proxy_pool__) == 0
+        return not is_captcha_page
+
+    def __define_candidates__(self):
+        now = time.monotonic()
+        return [proxy for proxy in self.__proxy_pool__ if proxy != self.__current_proxy__ and not self.__is_quarantined__(proxy, now)]
+
+    def __validate_candidates__(self, url, candidates):
+        return [proxy for proxy, is_available in zip(candidates, self.__executor__.map(lambda proxy: self.__validate__(url, proxy), candidates)) if is_available]
+
+    def __validate_in_background__(self, url):
+        """
+        Spare proxies are validated while the current one works, so on its failure a checked replacement is ready
+        """
+
+        with self.__lock__:
+            if self.__background_validation__ is not None and self.__background_validation__.is_alive():
+                return
+            if time.monotonic() - self.__last_validation_time__ < self.revalidate_interval:
+                return
+
+            self.__last_validation_time__ = time.monotonic()
+            candidates = self.__define_candidates__()
+
+        if len(candidates) != 0:
+            self.__background_validation__ = threading.Thread(target=self.__validate_candidates__, args=(url, candidates), daemon=True)
+            self.__background_validation__.start()
 
     def get_available_proxy(self, url):
-        print("The process of checking the proxies... Search an available one among them...")
+        if self.is_empty():
+            return None
 
-        socket.setdefaulttimeout(5)
-        found_proxy = False
-        while len(self.__proxy_pool__) > 0 and found_proxy is False:
-            proxy = random.choice(self.__proxy_pool__)
+        with self.__lock__:
+            current_proxy = self.__current_proxy__
+            if current_proxy is None:
+                now = time.monotonic()
+                validated = [proxy for proxy in self.__define_candidates__()
+                             if now - self.__stats__[proxy]["validated_at"] < self.revalidate_interval and self.__stats__[proxy]["count_of_failures_in_row"] == 0]
+                if len(validated) != 0:
+                    current_proxy = self.__current_proxy__ = max(validated, key=self.__define_score__)
 
-            is_available = self.__is_available_proxy__(url, proxy)
-            is_captcha = self.__is_captcha__() if is_available else None
+        if current_proxy is not None:
+            self.__validate_in_background__(url)
+            return current_proxy
 
-            if not is_available or is_captcha:
-                if is_captcha:
-                    print(f"proxy {proxy}: there is captcha.. trying another")
-                else:
-                    print(f"proxy {proxy}: unavailable.. trying another..")
-                self.__proxy_pool__.remove(proxy)
-                time.sleep(4)
-                continue
+        print("The process of checking the proxies... Search an available one among them...")
+        with self.__lock__:
+            candidates = self.__define_candidates__()
 
-            print(f"proxy {proxy}: available.. stop searching")
-            self.__current_proxy__, found_proxy = proxy, True
+        available = self.__validate_candidates__(url, candidates)
+        with self.__lock__:
+            self.__last_validation_time__ = time.monotonic()
+            if len(available) != 0:
+                self.__current_proxy__ = max(available, key=self.__define_score__)
+            current_proxy = self.__current_proxy__
 
-        if self.__current_proxy__ is None:
+        if current_proxy is None:
             print(f"there are not available proxies..", end="\n\n")
+        else:
+            print(f"proxy {current_proxy}: available.. stop searching")
+
+        return current_proxy
 
-        return self.__current_proxy__
+    def close(self):
+        if self.__executor__ is not None:
+            self.__executor__.shutdown(wait=False)
@@ -0,0 +1,205 @@
+OFFER_FIELD_TYPES = {
+    "author": str,
+    "author_type": str,
+    "url": str,
+    "location": str,
+    "deal_type": str,
+    "accommodation_type": str,
+    "suburban_type": str,
+    "name": str,
+    "full_full_location_address": str,
+    "floor": int,
+    "floors_count": int,
+    "rooms_count": int,
+    "total_meters": float,
+    "price": int,
+    "price_per_month": int,
+    "price_per_day": int,
+    "commissions": int,
+    "year_of_construction": str,
+    "object_type": str,
+    "house_material_type": str,
+    "heating_type": str,
+    "finish_type": str,
+    "living_meters": str,
+    "kitchen_meters": str,
+    "bathroom": str,
+    "balcony": str,
+    "window_view": str,
+    "land_plot": str,
+    "land_plot_status": str,
+    "gas_type": str,
+    "water_supply_type": str,
+    "sewage_system": str,
+    "ceiling_height": str,
+    "class": str,
+    "parking_type": str,
+    "floors_from": int,
+    "floors_to": int,
+    "builder": str,
+    "phone": str,
+    "published_at": str,
+    "photos": list,
+    "district": str,
+    "street": str,
+    "house_number": str,
+    "underground": str,
+    "residential_complex": str,
+}
+
+OFFER_FIELDS = tuple(OFFER_FIELD_TYPES.keys())
+
+
+class OfferRecord:
+    """
+    Offer with fixed set of slots instead of dict per offer. It is read like dict (offer["price"], offer.get("price"), keys),
+    fields which the offer does not have are absent as in dict, fields unknown to OFFER_FIELDS are kept in extra_fields
+    """
+
+    __slots__ = OFFER_FIELDS + ("extra_fields",)
+
+    def __init__(self, offer=None):
+        self.extra_fields = None
+        if offer is not None:
+            for key, value in offer.items():
+                self[key] = value
+
+    def __setitem__(self, key, value):
+        if key in OFFER_FIELD_TYPES:
+            setattr(self, key, value)
+            return
+
+        if self.extra_fields is None:
+            self.extra_fields = dict()
+        self.extra_fields[key] = value
+
+    def __getitem__(self, key):
+        if key in OFFER_FIELD_TYPES:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self.extra_fields is None:
+            raise KeyError(key)
+        return self.extra_fields[key]
+
+    def __delitem__(self, key):
+        if key in OFFER_FIELD_TYPES:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra_fields is not None:
+            del self.extra_fields[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def __len__(self):
+        return sum(1 for _ in self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (OfferRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f"OfferRecord({self.to_dict()!r})"
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        for key in OFFER_FIELDS:
+            value = getattr(self, key, self)
+            if value is not self:
+                yield key, value
+
+        if self.extra_fields is not None:
+            yield from self.extra_fields.items()
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+class OfferColumns:
+    def __init__(self):
+        """
+        Columnar accumulator of offers: one list per field instead of one dict per offer.
+        Fields which the offer does not have are None in their columns
+        Examples:
+            >>> data = moscow_parser.get_flats(deal_type="sale", rooms=1, return_format="columns")
+            >>> prices = data["price"]
+            >>> data_frame = data.to_pandas()
+        """
+
+        self.columns = dict()
+        self.count_of_rows = 0
+
+    def append(self, offer):
+        for key, value in offer.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.count_of_rows
+            column.append(value)
+
+        self.count_of_rows += 1
+        for column in self.columns.values():
+            if len(column) != self.count_of_rows:
+                column.append(None)
+
+    def __len__(self):
+        return self.count_of_rows
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def __contains__(self, key):
+        return key in self.columns
+
+    def __iter__(self):
+        """
+        Offers as dicts (as get_flats returns them by default), fields with None are skipped
+        """
+
+        keys = list(self.columns.keys())
+        for values in zip(*self.columns.values()):
+            yield {key: value for key, value in zip(keys, values) if value is not None}
+
+    def keys(self):
+        return self.columns.keys()
+
+    def to_dict(self):
+        return {key: list(column) for key, column in self.columns.items()}
+
+    def to_records(self):
+        return [OfferRecord(offer) for offer in self]
+
+    def to_pandas(self):
+        """
+        DataFrame with the columns (requires pandas package)
+        """
+
+        import pandas
+        return pandas.DataFrame(self.columns)
+
@@ -0,0 +1,119 @@
+import email.utils
+import random
+import time
+from datetime import datetime, timezone
+
+from cianparser.throttle import HostThrottle
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+THROTTLED_STATUS_CODES = {429, 503}
+
+
+def define_retry_after(res):
+    """
+    Seconds from Retry-After header, it may be a number of seconds or a http date
+    """
+
+    value = (res.headers or dict()).get("Retry-After")
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_time = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_time.tzinfo is None:
+        retry_time = retry_time.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_time - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_captcha_response(res):
+    return res.text.find("Captcha") > 0
+
+
+class RequestScheduler:
+    def __init__(self, session, throttle=None, max_attempts=3, timeout=15, deadline=120, base_backoff=1.0, max_backoff=60.0,
+                 stop_event=None):
+        """
+        The single way of executing requests: pacing by the adaptive throttle, retries with jittered exponential backoff,
+        Retry-After and the deadline of every request. It has get() as session, so it is passed to parsers instead of it
+        :param session: session for executing requests
+        :param throttle: HostThrottle, default HostThrottle(min_interval=1.0)
+        :param int max_attempts: how many times one request is tried, default 3
+        :param float timeout: timeout in seconds of one attempt, default 15
+        :param float deadline: time in seconds of all attempts of one request including waiting, default 120
+        :param float base_backoff: backoff in seconds after the first failed attempt, it doubles after every next one, default 1.0
+        :param float max_backoff: maximal backoff in seconds, default 60.0
+        :param stop_event: threading.Event, once it is set no request is started and waiting of started ones is interrupted
+            (RuntimeError is raised), so threads using the scheduler are stopped quickly, default None
+        """
+
+        self.session = session
+        self.throttle = HostThrottle() if throttle is None else throttle
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.deadline = deadline
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.stop_event = stop_event
+
+    def is_stopped(self):
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def define_backoff(self, attempt_number):
+        """
+        Full jitter: random delay up to the exponential backoff, so concurrent workers do not retry at the same moment
+        """
+
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt_number))
+
+    def get(self, url, **kwargs):
+        """
+        The last response is returned as it is, so callers keep checking it with raise_for_status()
+        """
+
+        kwargs.setdefault("timeout", self.timeout)
+        deadline = time.monotonic() + self.deadline
+
+        for attempt_number in range(self.max_attempts):
+            is_last_attempt = attempt_number == self.max_attempts - 1
+            if self.is_stopped():
+                raise RuntimeError(f"{url}: the request is stopped")
+            self.throttle.wait(url, deadline=deadline, stop_event=self.stop_event)
+
+            try:
+                res = self.session.get(url, **kwargs)
+            except Exception:
+                if is_last_attempt:
+                    raise
+                self.__sleep__(url, self.define_backoff(attempt_number), deadline)
+                continue
+
+            if res.status_code in THROTTLED_STATUS_CODES or (res.status_code < 400 and is_captcha_response(res)):
+                retry_after = define_retry_after(res)
+                self.throttle.on_throttled(url, retry_after=retry_after)
+                if res.status_code not in RETRY_STATUS_CODES or is_last_attempt:
+                    return res
+                if retry_after is None:
+                    self.__sleep__(url, self.define_backoff(attempt_number), deadline)
+                continue
+
+            if res.status_code in RETRY_STATUS_CODES and not is_last_attempt:
+                self.__sleep__(url, self.define_backoff(attempt_number), deadline)
+                continue
+
+            self.throttle.on_success(url)
+            return res
+
+    def __sleep__(self, url, delay, deadline):
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError("the request can not be retried before its deadline")
+        if self.stop_event is None:
+            time.sleep(delay)
+        elif self.stop_event.wait(delay):
+            raise RuntimeError(f"{url}: the request is stopped")
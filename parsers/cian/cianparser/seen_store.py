@@ -0,0 +1,183 @@
+import abc
+import collections
+import hashlib
+import math
+import sqlite3
+import threading
+
+from cianparser.helpers import define_deal_url_id
+
+
+def define_seen_key(url, price_data):
+    """
+    Key of the offer in seen store: id of the deal plus its price, so the offer with changed price is not considered seen
+    """
+
+    price = price_data.get("price", price_data.get("price_per_month", -1))
+    return f"{define_deal_url_id(url)}:{price}"
+
+
+class BloomFilter:
+    def __init__(self, capacity=1000000, error_rate=0.01):
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.count_of_hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.__bits__ = bytearray((self.size + 7) // 8)
+
+    def __positions__(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+        return [(first_hash + index * second_hash) % self.size for index in range(self.count_of_hashes)]
+
+    def add(self, key):
+        for position in self.__positions__(key):
+            self.__bits__[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.__bits__[position >> 3] & (1 << (position & 7)) for position in self.__positions__(key))
+
+
+class SeenOfferStore(abc.ABC):
+    def __init__(self, bloom_capacity=1000000, bloom_error_rate=0.01, lru_size=10000):
+        """
+        Persistent store of already collected offers with an in-process front: Bloom filter answers "not seen"
+        without touching the backend, LRU keeps recently confirmed keys
+        :param int bloom_capacity: expected count of keys in the store
+        :param float bloom_error_rate: probability of false positive of Bloom filter, which falls through to the backend
+        :param int lru_size: how many confirmed keys are kept in memory
+        """
+
+        self.lru_size = lru_size
+        self.__lock__ = threading.Lock()
+        self.__bloom__ = BloomFilter(capacity=bloom_capacity, error_rate=bloom_error_rate)
+        self.__lru__ = collections.OrderedDict()
+        self.__warmed__ = False
+
+    @abc.abstractmethod
+    def load_keys(self):
+        """
+        All keys of the backend, they warm up Bloom filter on first use
+        """
+
+    @abc.abstractmethod
+    def contains(self, key):
+        """
+        Is the key in the backend, asked only when Bloom filter and LRU can not answer
+        """
+
+    @abc.abstractmethod
+    def insert(self, key):
+        """
+        Put the key into the backend, it is called under the lock of the store
+        """
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __warm__(self):
+        if not self.__warmed__:
+            for key in self.load_keys():
+                self.__bloom__.add(key)
+            self.__warmed__ = True
+
+    def __remember__(self, key):
+        self.__lru__[key] = True
+        self.__lru__.move_to_end(key)
+        if len(self.__lru__) > self.lru_size:
+            self.__lru__.popitem(last=False)
+
+    def is_seen(self, key):
+        with self.__lock__:
+            self.__warm__()
+            if key not in self.__bloom__:
+                return False
+
+            if key in self.__lru__:
+                self.__lru__.move_to_end(key)
+                return True
+
+            is_seen = self.contains(key)
+            if is_seen:
+                self.__remember__(key)
+
+            return is_seen
+
+    def add(self, key):
+        with self.__lock__:
+            self.__warm__()
+            self.__bloom__.add(key)
+            self.__remember__(key)
+            self.insert(key)
+
+
+class SQLiteSeenStore(SeenOfferStore):
+    def __init__(self, file_path="cian_seen_offers.sqlite", commit_every=100, **kwargs):
+        """
+        Examples:
+            >>> parser = cianparser.CianParser(location="Краснодар", seen_store=SQLiteSeenStore("seen.sqlite"))
+        :param file_path: path of the sqlite database, default "cian_seen_offers.sqlite"
+        :param int commit_every: how many inserts are committed at once, default 100
+        """
+
+        super().__init__(**kwargs)
+        self.commit_every = commit_every
+        self.__count_of_uncommitted__ = 0
+        self.__connection__ = sqlite3.connect(str(file_path), check_same_thread=False)
+        self.__connection__.execute("CREATE TABLE IF NOT EXISTS seen_offers ("
+                                    "key TEXT PRIMARY KEY, seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+        self.__connection__.commit()
+
+    def load_keys(self):
+        for (key,) in self.__connection__.execute("SELECT key FROM seen_offers"):
+            yield key
+
+    def contains(self, key):
+        return self.__connection__.execute("SELECT 1 FROM seen_offers WHERE key = ?", (key,)).fetchone() is not None
+
+    def insert(self, key):
+        self.__connection__.execute("INSERT OR IGNORE INTO seen_offers (key) VALUES (?)", (key,))
+        self.__count_of_uncommitted__ += 1
+        if self.__count_of_uncommitted__ >= self.commit_every:
+            self.__connection__.commit()
+            self.__count_of_uncommitted__ = 0
+
+    def flush(self):
+        with self.__lock__:
+            self.__connection__.commit()
+            self.__count_of_uncommitted__ = 0
+
+    def close(self):
+        self.flush()
+        self.__connection__.close()
+
+
+class RedisSeenStore(SeenOfferStore):
+    def __init__(self, client=None, url="redis://localhost:6379/0", set_name="cianparser:seen_offers", **kwargs):
+        """
+        Examples:
+            >>> parser = cianparser.CianParser(location="Краснодар", seen_store=RedisSeenStore(url="redis://redis:6379/0"))
+        :param client: redis.Redis client, if None it is created from url (requires redis package)
+        :param str url: url of redis, default "redis://localhost:6379/0"
+        :param str set_name: name of the redis set with keys of seen offers
+        """
+
+        super().__init__(**kwargs)
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.set_name = set_name
+
+    def load_keys(self):
+        for key in self.client.sscan_iter(self.set_name, count=1000):
+            yield key.decode("utf-8") if isinstance(key, bytes) else key
+
+    def contains(self, key):
+        return bool(self.client.sismember(self.set_name, key))
+
+    def insert(self, key):
+        self.client.sadd(self.set_name, key)
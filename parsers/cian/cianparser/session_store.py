@@ -0,0 +1,201 @@
+import json
+import os
+import threading
+import time
+
+from cianparser.scheduler import is_captcha_response
+
+
+class FileSessionStore:
+    def __init__(self, path="cian_session.json"):
+        """
+        State of session in json file, it is replaced atomically, so processes may share it
+        :param str path: path of the file, default "cian_session.json"
+        """
+
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as session_file:
+                state = json.load(session_file)
+        except (OSError, ValueError):
+            return None
+
+        return state if state.get("expires_at", 0) > time.time() else None
+
+    def save(self, state, ttl):
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as session_file:
+            json.dump(dict(state, expires_at=time.time() + ttl), session_file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RedisSessionStore:
+    def __init__(self, client=None, url="redis://localhost:6379/0", key="cianparser:session"):
+        """
+        State of session in redis key which expires with it
+        Examples:
+            >>> session_manager = SessionManager(store=RedisSessionStore(url="redis://redis:6379/0"))
+        :param client: redis.Redis client, if None it is created from url (requires redis package). Processes of
+        crawl by price bands connect by url
+        :param str url: url of redis, default "redis://localhost:6379/0"
+        :param str key: name of the redis key with state of session
+        """
+
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.url = url
+        self.key = key
+
+    def __getstate__(self):
+        return {"url": self.url, "key": self.key}
+
+    def __setstate__(self, state):
+        self.__init__(url=state["url"], key=state["key"])
+
+    def load(self):
+        state = self.client.get(self.key)
+        return json.loads(state) if state is not None else None
+
+    def save(self, state, ttl):
+        self.client.set(self.key, json.dumps(state, ensure_ascii=False), ex=max(1, int(ttl)))
+
+    def delete(self):
+        self.client.delete(self.key)
+
+
+class SessionManager:
+    def __init__(self, store=None, ttl=3600, pool_connections=10, pool_maxsize=10, headers=None):
+        """
+        One cloudscraper session shared by parsers: cookies of the solved challenge and headers are saved to store
+        and restored by the next run or other process until they expire, connections are kept alive in the pool
+        Examples:
+            >>> session_manager = SessionManager(store=FileSessionStore("cian_session.json"), ttl=3600)
+            >>> moscow_parser = cianparser.CianParser(location="Москва", session_manager=session_manager)
+            >>> krasnodar_parser = cianparser.CianParser(location="Краснодар", session_manager=session_manager)
+        :param store: FileSessionStore or RedisSessionStore, if None state of session is not persisted, default None
+        :param ttl: how long in seconds the saved state is reused, default 3600
+        :param int pool_connections: how many hosts keep own pool of connections, default 10
+        :param int pool_maxsize: how many connections to one host are kept alive, default 10
+        :param headers: headers of session, default {'Accept-Language': 'en'}
+        """
+
+        self.store = store
+        self.ttl = ttl
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.headers = {'Accept-Language': 'en'} if headers is None else dict(headers)
+
+        self.__session__ = None
+        self.__fingerprint__ = None
+        self.__lock__ = threading.Lock()
+
+    def __getstate__(self):
+        """
+        Processes get the same store and settings, every process builds own session restored from the store
+        """
+
+        return {"store": self.store, "ttl": self.ttl, "pool_connections": self.pool_connections,
+                "pool_maxsize": self.pool_maxsize, "headers": self.headers}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get_session(self):
+        """
+        Session of the manager, it is created (and restored from store) on first call
+        """
+
+        with self.__lock__:
+            if self.__session__ is None:
+                self.__session__ = self.__create_session__()
+
+        return self.__session__
+
+    def __create_session__(self):
+        import cloudscraper
+
+        session = cloudscraper.create_scraper()
+        session.headers = dict(self.headers)
+        for adapter in session.adapters.values():
+            adapter.init_poolmanager(self.pool_connections, self.pool_maxsize)
+
+        state = self.store.load() if self.store is not None else None
+        if state is not None:
+            session.headers.update(state.get("headers", dict()))
+            for cookie in state.get("cookies", []):
+                session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"],
+                                    expires=cookie["expires"], secure=cookie["secure"])
+            print(f"session is restored with {len(state.get('cookies', []))} cookies")
+
+        self.__fingerprint__ = self.__define_fingerprint__(session)
+        session.hooks["response"].append(self.__on_response__)
+        return session
+
+    @staticmethod
+    def __define_fingerprint__(session):
+        return tuple(sorted((cookie.domain, cookie.path, cookie.name, cookie.value) for cookie in session.cookies))
+
+    def __on_response__(self, res, *args, **kwargs):
+        """
+        State is saved when the site has changed cookies, a session which has got captcha is not shared.
+        Hooks are called before requests puts cookies of response into the session, so they are put here
+        """
+
+        if self.store is None:
+            return
+
+        if is_captcha_response(res):
+            self.invalidate()
+            return
+
+        if len(res.cookies) == 0:
+            return
+
+        with self.__lock__:
+            self.__session__.cookies.update(res.cookies)
+            fingerprint = self.__define_fingerprint__(self.__session__)
+            if fingerprint == self.__fingerprint__:
+                return
+            self.__fingerprint__ = fingerprint
+
+        self.save()
+
+    def save(self):
+        if self.store is None or self.__session__ is None:
+            return
+
+        with self.__lock__:
+            state = {
+                "headers": dict(self.__session__.headers),
+                "cookies": [{"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path,
+                             "expires": cookie.expires, "secure": cookie.secure} for cookie in self.__session__.cookies],
+            }
+        try:
+            self.store.save(state, self.ttl)
+        except Exception as e:
+            print(f"state of session is not saved: {e}")
+
+    def invalidate(self):
+        """
+        Forget saved state, so the next run solves the challenge again
+        """
+
+        if self.store is None:
+            return
+
+        try:
+            self.store.delete()
+        except Exception as e:
+            print(f"state of session is not deleted: {e}")
@@ -1,20 +1,23 @@
-import time
-
-import bs4
+from cianparser.html_backend import make_soup
+from cianparser.scheduler import is_captcha_response
+from cianparser.page_fields import SUBURBAN_PAGE_FIELDS
+from cianparser.json_state import define_offer_card_state, define_json_extra_data
+from cianparser.contacts import define_phone
 
 
 class SuburbanPageParser:
-    def __init__(self, session, url):
+    def __init__(self, session, url, with_json_state=False):
         self.session = session
         self.url = url
+        self.with_json_state = with_json_state
 
     def __load_page__(self):
         res = self.session.get(self.url)
-        if res.status_code == 429:
-            time.sleep(10)
         res.raise_for_status()
+        if is_captcha_response(res):
+            raise ValueError(f"there is CAPTCHA on {self.url}")
         self.offer_page_html = res.text
-        self.offer_page_soup = bs4.BeautifulSoup(self.offer_page_html, 'html.parser')
+        self.offer_page_soup = make_soup(self.offer_page_html)
 
     def parse_page(self):
         self.__load_page__()
@@ -34,50 +37,13 @@ class SuburbanPageParser:
             "phone": "",
         }
 
-        spans = self.offer_page_soup.select("span")
-        for index, span in enumerate(spans):
-            if "Материал дома" == span.text:
-                page_data["house_material_type"] = spans[index + 1].text
-
-            if "Участок" == span.text:
-                page_data["land_plot"] = spans[index + 1].text
-
-            if "Статус участка" == span.text:
-                page_data["land_plot_status"] = spans[index + 1].text
-
-            if "Отопление" == span.text:
-                page_data["heating_type"] = spans[index + 1].text
-
-            if "Газ" == span.text:
-                page_data["gas_type"] = spans[index + 1].text
-
-            if "Водоснабжение" == span.text:
-                page_data["water_supply_type"] = spans[index + 1].text
-
-            if "Канализация" == span.text:
-                page_data["sewage_system"] = spans[index + 1].text
-
-            if "Санузел" == span.text:
-                page_data["bathroom"] = spans[index + 1].text
-
-            if "Площадь кухни" == span.text:
-                page_data["kitchen_meters"] = spans[index + 1].text
-
-            if "Общая площадь" == span.text:
-                page_data["living_meters"] = spans[index + 1].text
-
-            if "Год постройки" in span.text:
-                page_data["year_of_construction"] = spans[index + 1].text
-
-            if "Год сдачи" in span.text:
-                page_data["year_of_construction"] = spans[index + 1].text
+        SUBURBAN_PAGE_FIELDS.parse(self.offer_page_soup, page_data)
 
-            if "Этажей в доме" == span.text:
-                page_data["floors_count"] = spans[index + 1].text
+        page_data["phone"] = define_phone(self.offer_page_html)
 
-        if "+7" in self.offer_page_html:
-            page_data["phone"] = self.offer_page_html[self.offer_page_html.find("+7"): self.offer_page_html.find("+7") + 16].split('"')[0]. \
-                replace(" ", ""). \
-                replace("-", "")
+        if self.with_json_state:
+            offer = define_offer_card_state(self.offer_page_html)
+            if offer is not None:
+                page_data.update(define_json_extra_data(offer))
 
         return page_data
@@ -0,0 +1,76 @@
+import threading
+import time
+import urllib.parse
+
+
+class HostThrottle:
+    def __init__(self, min_interval=1.0, fastest_interval=None, slowest_interval=60.0, burst=1):
+        """
+        Politeness budget: token bucket per host, its interval adapts to the answers of the site.
+        The interval shrinks slowly while requests succeed and doubles on 429 or captcha
+        :param float min_interval: initial interval between two requests to the same host, in seconds
+        :param float fastest_interval: the interval never gets shorter, default half of min_interval
+        :param float slowest_interval: the interval never gets longer, default 60.0
+        :param int burst: how many requests may be started at once after idle time, default 1
+        """
+
+        self.min_interval = min_interval
+        self.fastest_interval = min_interval / 2 if fastest_interval is None else fastest_interval
+        self.slowest_interval = max(slowest_interval, min_interval)
+        self.burst = max(1, burst)
+        self.__lock__ = threading.Lock()
+        self.__hosts__ = dict()
+
+    def __define_host_state__(self, url):
+        host = urllib.parse.urlparse(url).netloc
+        if host not in self.__hosts__:
+            self.__hosts__[host] = {"interval": self.min_interval, "tokens": self.burst, "updated_at": time.monotonic(), "blocked_until": 0}
+
+        return self.__hosts__[host]
+
+    def get_interval(self, url):
+        with self.__lock__:
+            return self.__define_host_state__(url)["interval"]
+
+    def wait(self, url, deadline=None, stop_event=None):
+        """
+        Take a token of the host, sleeping until it is available
+        :param deadline: time.monotonic() after which waiting is pointless, TimeoutError is raised instead, default None
+        :param stop_event: threading.Event which interrupts sleeping, RuntimeError is raised then, default None
+        """
+
+        with self.__lock__:
+            state = self.__define_host_state__(url)
+            now = time.monotonic()
+            if state["interval"] > 0:
+                state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated_at"]) / state["interval"])
+            else:
+                state["tokens"] = self.burst
+            state["updated_at"] = now
+
+            start_time = max(now, state["blocked_until"])
+            if state["tokens"] < 1:
+                start_time = max(start_time, now + (1 - state["tokens"]) * state["interval"])
+            state["tokens"] -= 1
+
+            if deadline is not None and start_time > deadline:
+                state["tokens"] += 1
+                raise TimeoutError(f"{url}: the request can not be started before its deadline")
+
+        if start_time > now:
+            if stop_event is None:
+                time.sleep(start_time - now)
+            elif stop_event.wait(start_time - now):
+                raise RuntimeError(f"{url}: the request is stopped")
+
+    def on_success(self, url):
+        with self.__lock__:
+            state = self.__define_host_state__(url)
+            state["interval"] = max(self.fastest_interval, state["interval"] * 0.95)
+
+    def on_throttled(self, url, retry_after=None):
+        with self.__lock__:
+            state = self.__define_host_state__(url)
+            state["interval"] = min(self.slowest_interval, max(state["interval"], self.fastest_interval, 0.1) * 2)
+            if retry_after is not None:
+                state["blocked_until"] = max(state["blocked_until"], time.monotonic() + retry_after)
@@ -1,4 +1,5 @@
 from cianparser.constants import *
+from cianparser.lookup import define_metro_id
 
 
 class URLBuilder:
@@ -88,10 +89,9 @@ class URLBuilder:
 
         if "metro" in additional_settings.keys():
             if "metro_station" in additional_settings.keys():
-                if additional_settings["metro"] in METRO_STATIONS.keys():
-                    for metro_station, metro_id in METRO_STATIONS[additional_settings["metro"]]:
-                        if additional_settings["metro_station"] == metro_station:
-                            self.url += METRO_ID_PATH.format(metro_id)
+                metro_id = define_metro_id(additional_settings["metro"], additional_settings["metro_station"])
+                if metro_id is not None:
+                    self.url += METRO_ID_PATH.format(metro_id)
 
         if "metro_foot_minute" in additional_settings.keys():
             self.url += METRO_FOOT_MINUTE_PATH.format(additional_settings["metro_foot_minute"])
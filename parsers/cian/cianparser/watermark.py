@@ -0,0 +1,45 @@
+import json
+import os
+import pathlib
+import threading
+from datetime import datetime
+
+
+class WatermarkStore:
+    def __init__(self, file_path="cian_watermarks.json"):
+        """
+        Persisted watermarks of incremental crawls: the newest offer id (and publication time) seen per query
+        :param file_path: path of the json file with watermarks, default "cian_watermarks.json"
+        """
+
+        self.file_path = pathlib.Path(file_path)
+        self.__lock__ = threading.Lock()
+        self.__watermarks__ = None
+
+    def __load__(self):
+        if self.__watermarks__ is None:
+            self.__watermarks__ = dict()
+            if self.file_path.exists():
+                with open(self.file_path, "r", encoding="utf-8") as input_file:
+                    self.__watermarks__ = json.load(input_file)
+
+        return self.__watermarks__
+
+    def get(self, query_key):
+        with self.__lock__:
+            watermark = self.__load__().get(query_key)
+            return None if watermark is None else dict(watermark)
+
+    def set(self, query_key, watermark):
+        with self.__lock__:
+            watermarks = self.__load__()
+            watermarks[query_key] = dict(watermark, updated_at=datetime.now().isoformat(timespec="seconds"))
+
+            tmp_path = f"{self.file_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as output_file:
+                json.dump(watermarks, output_file, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.file_path)
+
+
+def define_query_key(url_list_format):
+    return url_list_format.replace("p={}&", "")
@@ -0,0 +1,187 @@
+import csv
+import os
+import uuid
+from datetime import datetime, timezone
+
+from cianparser.records import OFFER_FIELD_TYPES
+
+
+class CsvResultWriter:
+    def __init__(self, file_path, delimiter=";", batch_size=50):
+        """
+        Append-only writer of offers: every row is written once, rows are flushed in batches.
+        Lists (e.g. photos) are written as their values joined by "|"
+        :param file_path: path of the csv file, it is created on the first flush
+        :param str delimiter: delimiter of csv, default ";"
+        :param int batch_size: how many rows are kept in memory before flush, default 50
+        """
+
+        self.file_path = file_path
+        self.delimiter = delimiter
+        self.batch_size = batch_size
+        self.fieldnames = []
+        self.count_of_rows = 0
+
+        self.__fieldnames_set__ = set()
+        self.__buffer__ = []
+        self.__file__ = None
+        self.__writer__ = None
+
+    def write(self, row):
+        self.__buffer__.append({key: "|".join(map(str, value)) if isinstance(value, (list, tuple)) else value
+                                for key, value in row.items()})
+        if len(self.__buffer__) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.__buffer__) == 0:
+            return
+
+        new_fieldnames = []
+        for row in self.__buffer__:
+            for key in row.keys():
+                if key not in self.__fieldnames_set__:
+                    self.__fieldnames_set__.add(key)
+                    new_fieldnames.append(key)
+
+        if len(new_fieldnames) != 0:
+            self.fieldnames.extend(new_fieldnames)
+            self.__open__(rewrite_header=self.count_of_rows > 0)
+
+        self.__writer__.writerows(self.__buffer__)
+        self.__file__.flush()
+        self.count_of_rows += len(self.__buffer__)
+        self.__buffer__ = []
+
+    def __open__(self, rewrite_header):
+        """
+        Columns may appear later than the first rows, then already written rows are rewritten once with the new header.
+        It happens only when the set of columns grows, so the cost per offer stays constant
+        """
+
+        if self.__file__ is not None:
+            self.__file__.close()
+
+        if rewrite_header:
+            tmp_path = f"{self.file_path}.tmp"
+            with open(self.file_path, "r", newline="", encoding="utf-8") as input_file, \
+                    open(tmp_path, "w", newline="", encoding="utf-8") as output_file:
+                dict_writer = csv.DictWriter(output_file, self.fieldnames, delimiter=self.delimiter)
+                dict_writer.writeheader()
+                dict_writer.writerows(csv.DictReader(input_file, delimiter=self.delimiter))
+            os.replace(tmp_path, self.file_path)
+
+        self.__file__ = open(self.file_path, "a" if rewrite_header else "w", newline="", encoding="utf-8")
+        self.__writer__ = csv.DictWriter(self.__file__, self.fieldnames, delimiter=self.delimiter)
+        if not rewrite_header:
+            self.__writer__.writeheader()
+
+    def close(self):
+        self.flush()
+        if self.__file__ is not None:
+            self.__file__.close()
+            self.__file__ = None
+
+
+def define_column_value(value, field_type):
+    """
+    Value of the typed column: sentinels of absent data (-1 and empty string) become null
+    """
+
+    if value is None or value == -1 or value == "":
+        return None
+
+    if field_type is list:
+        return [str(item) for item in value]
+
+    try:
+        return field_type(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ArrowResultWriter:
+    def __init__(self, base_path, file_format="parquet", partition_by=("date", "location"), exclude_fields=(), compression="zstd"):
+        """
+        Append-only writer of offers to typed columnar dataset (requires pyarrow package), every flush appends
+        one row group (record batch for arrow) to the file of every partition. Partitions are directories in hive style,
+        e.g. base_path/date=2024-05-01/location=Москва/part-....parquet, columns of partitions are not kept in files
+        :param base_path: path of the directory of dataset
+        :param str file_format: "parquet" or "arrow" (Arrow IPC file), default "parquet"
+        :param partition_by: "date" (date of collection) and fields of offer, default ("date", "location")
+        :param exclude_fields: fields of offer which are not written, e.g. specific fields of other deal types
+        :param str compression: compression of parquet, default "zstd"
+        """
+
+        import pyarrow
+
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError(f'You entered file_format={file_format}, which is not valid value. '
+                             f'Try entering one of these values: "parquet", "arrow".')
+
+        self.base_path = base_path
+        self.file_format = file_format
+        self.partition_by = tuple(partition_by)
+        self.compression = compression
+        self.count_of_rows = 0
+
+        arrow_types = {str: pyarrow.string(), int: pyarrow.int64(), float: pyarrow.float64(), list: pyarrow.list_(pyarrow.string())}
+        self.field_types = {field: field_type for field, field_type in OFFER_FIELD_TYPES.items()
+                            if field not in self.partition_by and field not in exclude_fields}
+        self.schema = pyarrow.schema([(field, arrow_types[field_type]) for field, field_type in self.field_types.items()] +
+                                     [("collected_at", pyarrow.timestamp("s", tz="UTC"))])
+
+        self.__pyarrow__ = pyarrow
+        self.__buffer__ = []
+        self.__writers__ = dict()
+
+    def write(self, row):
+        self.__buffer__.append((datetime.now(timezone.utc), row))
+
+    def __define_partition__(self, collected_at, row):
+        partition = []
+        for field in self.partition_by:
+            value = collected_at.date().isoformat() if field == "date" else row.get(field, "")
+            partition.append(f"{field}={str(value).replace('/', '_')}")
+        return tuple(partition)
+
+    def __open__(self, partition):
+        directory_path = os.path.join(self.base_path, *partition)
+        os.makedirs(directory_path, exist_ok=True)
+        file_path = os.path.join(directory_path, f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.{self.file_format}")
+
+        if self.file_format == "parquet":
+            import pyarrow.parquet
+            return pyarrow.parquet.ParquetWriter(file_path, self.schema, compression=self.compression)
+
+        return self.__pyarrow__.ipc.new_file(file_path, self.schema)
+
+    def flush(self):
+        if len(self.__buffer__) == 0:
+            return
+
+        partitions = dict()
+        for collected_at, row in self.__buffer__:
+            partition = self.__define_partition__(collected_at, row)
+            columns = partitions.get(partition)
+            if columns is None:
+                columns = partitions[partition] = {field: [] for field in self.schema.names}
+
+            for field, field_type in self.field_types.items():
+                columns[field].append(define_column_value(row.get(field), field_type))
+            columns["collected_at"].append(collected_at)
+
+        for partition, columns in partitions.items():
+            writer = self.__writers__.get(partition)
+            if writer is None:
+                writer = self.__writers__[partition] = self.__open__(partition)
+            writer.write_table(self.__pyarrow__.Table.from_pydict(columns, schema=self.schema))
+
+        self.count_of_rows += len(self.__buffer__)
+        self.__buffer__ = []
+
+    def close(self):
+        self.flush()
+        for writer in self.__writers__.values():
+            writer.close()
+        self.__writers__ = dict()
@@ -0,0 +1,54 @@
+import time
+
+from cianparser.contacts import define_phone, extract_phones, normalize_phone
+
+
+def test_russian_numbers_are_normalized_to_e164():
+    assert normalize_phone("8 (918) 123-45-67") == "+79181234567"
+    assert normalize_phone("+7 918 123 45 67") == "+79181234567"
+    assert normalize_phone("9181234567") == "+79181234567"
+    assert normalize_phone("4951234567") == "+74951234567"
+
+
+def test_other_numbers_are_not_phones():
+    assert normalize_phone("+1 415 555 2671") is None
+    assert normalize_phone("1234567890") is None
+    assert normalize_phone("12345") is None
+
+
+def test_obfuscated_phones_are_found_in_text():
+    text = ("Звоните: 8-9О1-234-56-78, или ⑧⑨①⑧①②③④⑤⑥⑦, "
+            "или 8️⃣9️⃣1️⃣8️⃣7️⃣6️⃣5️⃣4️⃣3️⃣2️⃣1️⃣, или +7 (918) 000.11.22")
+
+    assert extract_phones(text) == ["+79012345678", "+79181234567", "+79187654321", "+79180001122"]
+
+
+def test_phones_are_deduplicated_and_limited():
+    text = "8 918 123-45-67, +7 (918) 123 45 67, 8 918 765-43-21, 8 918 000-11-22"
+
+    assert extract_phones(text) == ["+79181234567", "+79187654321", "+79180001122"]
+    assert extract_phones(text, limit=2) == ["+79181234567", "+79187654321"]
+
+
+def test_prices_areas_and_ids_are_not_phones():
+    text = "Цена 12 500 000 ₽, площадь 45.6 м², объявление 300123456, кадастровый номер 77:01:0001001:1234"
+
+    assert extract_phones(text) == []
+
+
+def test_phone_of_page_state_is_preferred():
+    html = ('<p>Агентство 8 800 555-35-35</p><a href="tel:+79181112233">позвонить</a>'
+            '"phones":[{"countryCode": "7", "number": "9184445566"}]')
+
+    assert define_phone(html) == "+79184445566"
+    assert define_phone(html.split('"phones"')[0]) == "+79181112233"
+    assert define_phone("<p>Агентство 8 800 555-35-35</p>") == "+78005553535"
+    assert define_phone("<p>без телефона</p>") == ""
+
+
+def test_long_text_is_scanned_in_linear_time():
+    text = "Светлая квартира, 2 комнаты, 5 этаж. " * 20000 + "8 918 123-45-67"
+
+    started_at = time.monotonic()
+    assert extract_phones(text) == ["+79181234567"]
+    assert time.monotonic() - started_at < 5
@@ -0,0 +1,114 @@
+import random
+
+from cianparser.flat.list import FlatListPageParser
+from cianparser.market_stats import MarketStats, QuantileSketch
+
+
+def define_exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def define_offer(price, district="Пресненский", rooms_count=1, total_meters=-1):
+    return {"deal_type": "rent", "price_per_month": price, "district": district, "rooms_count": rooms_count,
+            "total_meters": total_meters}
+
+
+def test_sketch_quantiles_are_within_relative_accuracy():
+    generator = random.Random(1)
+    values = [generator.lognormvariate(16, 0.5) for _ in range(10000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]:
+        exact = define_exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+    assert sketch.count == len(values)
+    assert abs(sketch.mean() - sum(values) / len(values)) <= 1e-6 * sketch.mean()
+
+
+def test_merged_sketches_match_one_sketch_of_all_values():
+    generator = random.Random(2)
+    values = [generator.uniform(1e6, 5e7) for _ in range(2000)]
+    whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in values:
+        whole.add(value)
+    for value in values[:700]:
+        first.add(value)
+    for value in values[700:]:
+        second.add(value)
+
+    first.merge(second)
+
+    assert first.count == whole.count
+    assert first.min == whole.min and first.max == whole.max
+    for q in [0.05, 0.5, 0.95]:
+        assert first.quantile(q) == whole.quantile(q)
+
+
+def test_sketch_memory_is_bounded_by_max_bins():
+    sketch = QuantileSketch(relative_accuracy=0.01, max_bins=64)
+    for power in range(1, 2000):
+        sketch.add(1.01 ** power)
+
+    assert len(sketch.__bins__) <= 64
+    for q in [0.99, 1.0]:
+        exact = define_exact_quantile([1.01 ** power for power in range(1, 2000)], q)
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_sketch_counts_zeros_and_empty_sketch_has_no_quantiles():
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.mean() is None
+
+    for value in [0, 0, 0, 100]:
+        sketch.add(value)
+
+    assert sketch.quantile(0.5) == 0
+    assert abs(sketch.quantile(1.0) - 100) <= 1
+
+
+def test_stats_keep_long_and_short_rent_apart():
+    market_stats = MarketStats()
+    market_stats.add(define_offer(50000), deal_type="rent_long")
+    market_stats.add(define_offer(4000), deal_type="rent_short")
+    market_stats.add({"deal_type": "rent", "price_per_month": -1})
+
+    assert sorted(market_stats.list_groups()) == [("rent_long", "Пресненский", 1), ("rent_short", "Пресненский", 1)]
+    assert market_stats.get_summary("rent_long")["price"]["count"] == 1
+    assert market_stats.get_summary("rent_short")["price"]["q50"] == 4000
+    assert market_stats.get_summary("rent")["price"]["count"] == 2
+    assert market_stats.get_summary()["price"]["count"] == 2
+
+
+def test_parser_adds_offers_under_deal_type_of_query():
+    market_stats = MarketStats()
+    for rent_period_type in [4, 2]:
+        parser = FlatListPageParser(session=None, accommodation_type="flat", deal_type="rent",
+                                    rent_period_type=rent_period_type, location_name="Москва", market_stats=market_stats)
+        parser.__append_offer__(define_offer(30000))
+
+    assert sorted(market_stats.list_groups()) == [("rent_long", "Пресненский", 1), ("rent_short", "Пресненский", 1)]
+
+
+def test_bait_price_is_judged_only_in_large_groups():
+    market_stats = MarketStats()
+    for price in range(40000, 60000, 1000):
+        market_stats.add(define_offer(price), deal_type="rent_long")
+    market_stats.add(define_offer(3000), deal_type="rent_short")
+
+    assert market_stats.is_bait_price(define_offer(20000), deal_type="rent_long")
+    assert not market_stats.is_bait_price(define_offer(45000), deal_type="rent_long")
+    assert not market_stats.is_bait_price(define_offer(1000), deal_type="rent_short")
+    assert not market_stats.is_bait_price(define_offer(20000), deal_type="rent_long", min_count=21)
+    assert not market_stats.is_bait_price(define_offer(-1), deal_type="rent_long")
+
+
+def test_bait_price_uses_price_per_meter_when_area_is_known():
+    market_stats = MarketStats()
+    for index in range(20):
+        market_stats.add(define_offer(50000 + index * 100, total_meters=40), deal_type="rent_long")
+
+    assert not market_stats.is_bait_price(define_offer(30000, total_meters=20), deal_type="rent_long")
+    assert market_stats.is_bait_price(define_offer(30000, total_meters=40), deal_type="rent_long")
@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+
+from cianparser import scheduler as scheduler_module
+from cianparser import throttle as throttle_module
+from cianparser.scheduler import RequestScheduler, define_retry_after
+from cianparser.throttle import HostThrottle
+
+URL = "https://www.cian.ru/cat.php?p=1"
+
+
+class FakeClock:
+    """
+    time.monotonic() and time.sleep() which do not wait, sleeping only moves the clock
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class Response:
+    def __init__(self, status_code=200, text="<html></html>", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = dict() if headers is None else headers
+
+
+class Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(throttle_module, "time", clock)
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    return clock
+
+
+def test_throttle_spaces_requests_to_the_same_host(clock):
+    throttle = HostThrottle(min_interval=2.0)
+
+    throttle.wait(URL)
+    throttle.wait(URL)
+    throttle.wait(URL)
+
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_throttle_keeps_hosts_apart(clock):
+    throttle = HostThrottle(min_interval=2.0)
+
+    throttle.wait(URL)
+    throttle.wait("https://api.cian.ru/search-offers/")
+
+    assert clock.sleeps == []
+
+
+def test_throttle_lets_burst_through_after_idle_time(clock):
+    throttle = HostThrottle(min_interval=2.0, burst=3)
+
+    for _ in range(3):
+        throttle.wait(URL)
+    assert clock.sleeps == []
+
+    throttle.wait(URL)
+    assert clock.sleeps == [2.0]
+
+
+def test_throttle_interval_adapts_to_answers(clock):
+    throttle = HostThrottle(min_interval=2.0, fastest_interval=1.0, slowest_interval=5.0)
+
+    throttle.on_throttled(URL)
+    assert throttle.get_interval(URL) == 4.0
+    throttle.on_throttled(URL)
+    assert throttle.get_interval(URL) == 5.0
+
+    for _ in range(100):
+        throttle.on_success(URL)
+    assert throttle.get_interval(URL) == 1.0
+
+
+def test_throttle_waits_for_retry_after(clock):
+    throttle = HostThrottle(min_interval=0)
+
+    throttle.on_throttled(URL, retry_after=30)
+    throttle.wait(URL)
+
+    assert clock.sleeps == [30.0]
+
+
+def test_throttle_raises_instead_of_waiting_past_deadline(clock):
+    throttle = HostThrottle(min_interval=10.0)
+    throttle.wait(URL)
+
+    with pytest.raises(TimeoutError):
+        throttle.wait(URL, deadline=clock.now + 5)
+
+    throttle.wait(URL, deadline=clock.now + 10)
+    assert clock.sleeps == [10.0]
+
+
+def test_throttle_wait_is_interrupted_by_stop_event():
+    throttle = HostThrottle(min_interval=60.0)
+    throttle.wait(URL)
+    stop_event = threading.Event()
+    stop_event.set()
+
+    with pytest.raises(RuntimeError):
+        throttle.wait(URL, stop_event=stop_event)
+
+
+def test_retry_after_is_read_as_seconds_or_date():
+    assert define_retry_after(Response(headers={"Retry-After": "120"})) == 120.0
+    assert define_retry_after(Response(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert define_retry_after(Response(headers={"Retry-After": "soon"})) is None
+    assert define_retry_after(Response()) is None
+
+
+def test_scheduler_retries_throttled_and_failed_requests(clock):
+    session = Session([Response(status_code=429), ConnectionError("reset"), Response(status_code=200, text="ok")])
+    request_scheduler = RequestScheduler(session=session, throttle=HostThrottle(min_interval=0), base_backoff=0)
+
+    response = request_scheduler.get(URL)
+
+    assert response.text == "ok"
+    assert len(session.calls) == 3
+
+
+def test_scheduler_returns_last_response_after_max_attempts(clock):
+    session = Session([Response(status_code=503), Response(status_code=503)])
+    request_scheduler = RequestScheduler(session=session, throttle=HostThrottle(min_interval=0), max_attempts=2, base_backoff=0)
+
+    assert request_scheduler.get(URL).status_code == 503
+    assert len(session.calls) == 2
+
+
+def test_scheduler_slows_host_down_on_captcha(clock):
+    throttle = HostThrottle(min_interval=1.0)
+    session = Session([Response(text="<html>Captcha</html>")])
+    request_scheduler = RequestScheduler(session=session, throttle=throttle, base_backoff=0)
+
+    response = request_scheduler.get(URL)
+
+    assert response.text == "<html>Captcha</html>"
+    assert len(session.calls) == 1
+    assert throttle.get_interval(URL) == 2.0
+
+
+def test_stopped_scheduler_does_not_start_requests(clock):
+    stop_event = threading.Event()
+    session = Session([Response()])
+    request_scheduler = RequestScheduler(session=session, throttle=HostThrottle(min_interval=0), stop_event=stop_event)
+
+    stop_event.set()
+    with pytest.raises(RuntimeError):
+        request_scheduler.get(URL)
+    assert session.calls == []
@@ -0,0 +1,83 @@
+from cianparser.flat.list import FlatListPageParser
+from cianparser.watermark import WatermarkStore, define_query_key
+
+# ids of cian offers have 9 digits, define_deal_url_id does not take short ones as ids
+BASE_OFFER_ID = 300000000
+
+
+def define_parser(watermark=None):
+    return FlatListPageParser(session=None, accommodation_type="flat", deal_type="sale", rent_period_type=None,
+                              location_name="Москва", watermark=watermark)
+
+
+def define_url(offer_id):
+    return f"https://www.cian.ru/sale/flat/{offer_id}/"
+
+
+
+def test_watermark_store_keeps_watermarks_between_instances(tmp_path):
+    file_path = tmp_path / "watermarks.json"
+    WatermarkStore(file_path).set("query", {"offer_id": 300, "published_at": "2026-01-01T00:00:00+00:00"})
+
+    watermark = WatermarkStore(file_path).get("query")
+    assert watermark["offer_id"] == 300
+    assert watermark["published_at"] == "2026-01-01T00:00:00+00:00"
+    assert WatermarkStore(file_path).get("other query") is None
+
+
+def test_query_key_does_not_depend_on_page():
+    url_list_format = "https://cian.ru/cat.php?engine_version=2&p={}&with_neighbors=0&region=1&deal_type=sale"
+
+    assert define_query_key(url_list_format) == "https://cian.ru/cat.php?engine_version=2&with_neighbors=0&region=1&deal_type=sale"
+
+
+def test_every_offer_is_fresh_without_watermark():
+    parser = define_parser()
+
+    assert parser.check_freshness(define_url(BASE_OFFER_ID + 100))
+    assert parser.check_freshness(define_url(BASE_OFFER_ID + 50))
+    assert not parser.is_watermark_reached(count_of_offers=2)
+    assert parser.define_watermark() == {"offer_id": BASE_OFFER_ID + 100}
+
+
+def test_offers_at_or_below_watermark_are_not_fresh():
+    parser = define_parser(watermark={"offer_id": BASE_OFFER_ID + 100})
+
+    assert parser.check_freshness(define_url(BASE_OFFER_ID + 101))
+    assert not parser.check_freshness(define_url(BASE_OFFER_ID + 100))
+    assert not parser.check_freshness(define_url(BASE_OFFER_ID + 99))
+
+
+def test_newer_publication_makes_old_id_fresh():
+    parser = define_parser(watermark={"offer_id": BASE_OFFER_ID + 100, "published_at": "2026-01-01T00:00:00+00:00"})
+
+    assert parser.check_freshness(define_url(BASE_OFFER_ID + 90), published_at="2026-01-02T00:00:00+00:00")
+    assert not parser.check_freshness(define_url(BASE_OFFER_ID + 91), published_at="2025-12-31T00:00:00+00:00")
+
+
+def test_page_without_fresh_offers_reaches_watermark():
+    parser = define_parser(watermark={"offer_id": BASE_OFFER_ID + 100})
+
+    parser.check_freshness(define_url(BASE_OFFER_ID + 101))
+    parser.check_freshness(define_url(BASE_OFFER_ID + 99))
+    assert not parser.is_watermark_reached(count_of_offers=2)
+
+    parser.check_freshness(define_url(BASE_OFFER_ID + 98))
+    parser.check_freshness(define_url(BASE_OFFER_ID + 97))
+    assert parser.is_watermark_reached(count_of_offers=2)
+
+
+def test_watermark_moves_only_forward():
+    parser = define_parser(watermark={"offer_id": BASE_OFFER_ID + 100, "published_at": "2026-01-02T00:00:00+00:00"})
+
+    parser.check_freshness(define_url(BASE_OFFER_ID + 99), published_at="2026-01-01T00:00:00+00:00")
+    assert parser.define_watermark() == {"offer_id": BASE_OFFER_ID + 100, "published_at": "2026-01-02T00:00:00+00:00"}
+
+    parser.check_freshness(define_url(BASE_OFFER_ID + 120), published_at="2026-01-03T00:00:00+00:00")
+    assert parser.define_watermark() == {"offer_id": BASE_OFFER_ID + 120, "published_at": "2026-01-03T00:00:00+00:00"}
+
+
+def test_url_without_id_is_fresh():
+    parser = define_parser(watermark={"offer_id": BASE_OFFER_ID + 100})
+
+    assert parser.check_freshness("")
@@ -0,0 +1,64 @@
+import csv
+
+from cianparser.flat.list import FlatListPageParser
+from cianparser.writers import CsvResultWriter
+
+
+def read_rows(file_path):
+    with open(file_path, "r", newline="", encoding="utf-8") as input_file:
+        return list(csv.DictReader(input_file, delimiter=";"))
+
+
+def test_csv_writer_flushes_rows_in_batches(tmp_path):
+    file_path = tmp_path / "offers.csv"
+    writer = CsvResultWriter(file_path, batch_size=2)
+
+    writer.write({"url": "https://www.cian.ru/sale/flat/1/", "price": 100})
+    assert not file_path.exists()
+
+    writer.write({"url": "https://www.cian.ru/sale/flat/2/", "price": 200})
+    assert [row["price"] for row in read_rows(file_path)] == ["100", "200"]
+
+    writer.write({"url": "https://www.cian.ru/sale/flat/3/", "price": 300})
+    writer.close()
+    assert writer.count_of_rows == 3
+    assert [row["price"] for row in read_rows(file_path)] == ["100", "200", "300"]
+
+
+def test_csv_writer_rewrites_header_when_columns_appear(tmp_path):
+    file_path = tmp_path / "offers.csv"
+    writer = CsvResultWriter(file_path, batch_size=1)
+
+    writer.write({"url": "https://www.cian.ru/sale/flat/1/", "price": 100})
+    writer.write({"url": "https://www.cian.ru/sale/flat/2/", "price": 200, "phone": "+79181234567"})
+    writer.close()
+
+    rows = read_rows(file_path)
+    assert writer.fieldnames == ["url", "price", "phone"]
+    assert rows[0]["phone"] == ""
+    assert rows[1]["phone"] == "+79181234567"
+
+
+def test_csv_writer_joins_lists_and_keeps_row(tmp_path):
+    file_path = tmp_path / "offers.csv"
+    row = {"url": "https://www.cian.ru/sale/flat/1/", "photos": ["https://cdn/1.jpg", "https://cdn/2.jpg"]}
+    writer = CsvResultWriter(file_path)
+
+    writer.write(row)
+    writer.close()
+
+    assert read_rows(file_path)[0]["photos"] == "https://cdn/1.jpg|https://cdn/2.jpg"
+    assert row["photos"] == ["https://cdn/1.jpg", "https://cdn/2.jpg"]
+
+
+def test_saving_csv_does_not_change_emitted_offers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    offer = {"url": "https://www.cian.ru/sale/flat/1/", "price": 100, "price_per_month": -1, "commissions": 0}
+
+    parser = FlatListPageParser(session=None, accommodation_type="flat", deal_type="sale", rent_period_type=None,
+                                location_name="Москва", with_saving_csv=True)
+    parser.__append_offer__(dict(offer))
+    parser.close()
+
+    assert parser.result == [offer]
+    assert list(read_rows(parser.file_path)[0].keys()) == ["url", "price"]